@@ -0,0 +1,343 @@
+"""
+arsip.py - ARSIP PARQUET DATA CUACA TAHUN LALU
+Observasi tahun yang sudah lewat tidak berubah lagi, jadi diekspor sekali ke
+Parquet berpartisi tahun=/id_stasiun= (dengan statistik row group) dan dibaca
+dashboard dengan pushdown kolom dan filter. MySQL cukup melayani tahun yang
+masih berjalan. pyarrow opsional: tanpa pyarrow arsip dianggap tidak ada.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+from datetime import date, datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+except ImportError:  # pyarrow tidak terpasang: semua data dibaca dari MySQL
+    pa = ds = pafs = None
+
+import skema
+
+DIREKTORI_ARSIP = os.environ.get(
+    'IKLIM_DIREKTORI_ARSIP',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'arsip'))
+FILE_MANIFEST = 'manifest.json'
+
+# Satu file per stasiun per tahun (±365 baris) = satu row group, jadi
+# statistik min/max tanggal per file cukup untuk melewati file di luar rentang
+UKURAN_ROW_GROUP = 64 * 1024
+
+# Kolom observasi_cuaca yang diarsipkan (id_stasiun dan tahun menjadi
+# partisi, tidak disimpan di dalam file)
+KOLOM_ARSIP = ['id_observasi', 'id_stasiun', 'tanggal', 'suhu_minimum', 'suhu_maksimum',
+               'suhu_rata_rata', 'kelembaban_rata_rata', 'curah_hujan', 'durasi_sinar_matahari',
+               'kecepatan_angin_maksimum', 'arah_angin_maksimum', 'kecepatan_angin_rata_rata',
+               'kode_arah_angin']
+
+def skema_arsip():
+    """Skema Arrow isi arsip (float64 supaya nilainya sama persis dengan hasil query MySQL)"""
+    return pa.schema([
+        ('id_observasi', pa.int64()),
+        ('id_stasiun', pa.int32()),
+        ('tanggal', pa.date32()),
+        ('suhu_minimum', pa.float64()),
+        ('suhu_maksimum', pa.float64()),
+        ('suhu_rata_rata', pa.float64()),
+        ('kelembaban_rata_rata', pa.float64()),
+        ('curah_hujan', pa.float64()),
+        ('durasi_sinar_matahari', pa.float64()),
+        ('kecepatan_angin_maksimum', pa.float64()),
+        ('arah_angin_maksimum', pa.int16()),
+        ('kecepatan_angin_rata_rata', pa.float64()),
+        ('kode_arah_angin', pa.string()),
+        ('tahun', pa.int16()),
+    ])
+
+def partisi_arsip():
+    """Partisi hive tahun=YYYY/id_stasiun=N"""
+    return ds.partitioning(pa.schema([('tahun', pa.int16()), ('id_stasiun', pa.int32())]),
+                           flavor='hive')
+
+# ===== EKSPOR =====
+
+def sumber_mysql(database=skema.NAMA_DATABASE):
+    """
+    Identitas database sumber arsip, dicatat di manifest dan dicocokkan
+    ambil_arsip: arsip hanya berlaku untuk server dan database asalnya
+    (versi_import database lain, atau file DuckDB, bisa kebetulan sama).
+    """
+    return f"mysql://{skema.KONFIG_DB['host']}:{skema.KONFIG_DB['port']}/{database}"
+
+def baca_manifest(direktori=DIREKTORI_ARSIP):
+    """Isi manifest.json arsip, atau None jika belum ada / rusak"""
+    try:
+        with open(os.path.join(direktori, FILE_MANIFEST), encoding='utf-8') as berkas:
+            return json.load(berkas)
+    except (OSError, ValueError):
+        return None
+
+def tulis_manifest(manifest, direktori=DIREKTORI_ARSIP):
+    """Tulis manifest lewat file sementara + rename supaya pembaca tidak melihat file setengah jadi"""
+    sementara = os.path.join(direktori, f".{FILE_MANIFEST}.tmp")
+    with open(sementara, 'w', encoding='utf-8') as berkas:
+        json.dump(manifest, berkas, indent=2, default=str)
+    os.replace(sementara, os.path.join(direktori, FILE_MANIFEST))
+
+def versi_import(kursor):
+    """versi_import dari katalog_data (None jika belum ada)"""
+    kursor.execute("SELECT nilai_angka FROM katalog_data WHERE kunci = 'versi_import'")
+    baris = kursor.fetchone()
+    return int(baris[0]) if baris and baris[0] is not None else None
+
+def sidik_tahun(kursor):
+    """
+    Sidik isi setiap tahun dari ringkasan tahunan: jumlah baris dan jumlah
+    nilai setiap variabel. Berubah jika ada baris tahun itu yang ditambah,
+    dihapus, atau nilainya diganti, tanpa perlu memindai observasi_cuaca.
+    
+    Returns:
+        dict: tahun -> list angka sidik.
+    """
+    jumlah = ", ".join(f"SUM({v}_jumlah)" for v in skema.VARIABEL_RINGKASAN)
+    kursor.execute(f"SELECT tahun, SUM(jumlah_observasi), {jumlah} "
+                   "FROM ringkasan_tahunan_stasiun GROUP BY tahun")
+    return {int(baris[0]): [int(baris[1])] + [None if n is None else round(float(n), 3) for n in baris[2:]]
+            for baris in kursor.fetchall()}
+
+def ekspor_tahun(koneksi, tahun, direktori=DIREKTORI_ARSIP):
+    """
+    Tulis ulang arsip satu tahun. File ditulis ke direktori sementara lalu
+    menggantikan tahun=YYYY lama, sehingga stasiun yang sudah tidak ada ikut hilang.
+    
+    Returns:
+        int: Jumlah baris yang diekspor.
+    """
+    kursor = koneksi.cursor()
+    kursor.execute(f"SELECT {', '.join(KOLOM_ARSIP)} FROM observasi_cuaca "
+                   "WHERE tanggal BETWEEN %s AND %s ORDER BY id_stasiun, tanggal",
+                   (f"{tahun}-01-01", f"{tahun}-12-31"))
+    baris = kursor.fetchall()
+    kursor.close()
+    
+    skema_tabel = skema_arsip()
+    kolom = list(zip(*baris)) if baris else [()] * len(KOLOM_ARSIP)
+    data = [pa.array(nilai, type=skema_tabel.field(nama).type) for nama, nilai in zip(KOLOM_ARSIP, kolom)]
+    data.append(pa.array([tahun] * len(baris), type=pa.int16()))
+    tabel = pa.Table.from_arrays(data, schema=skema_tabel)
+    
+    sementara = os.path.join(direktori, f".ekspor-{tahun}")
+    shutil.rmtree(sementara, ignore_errors=True)
+    if len(tabel):
+        ds.write_dataset(
+            tabel, sementara, format='parquet', partitioning=partisi_arsip(),
+            basename_template='bagian-{i}.parquet', preserve_order=True,
+            max_rows_per_group=UKURAN_ROW_GROUP,
+            file_options=ds.ParquetFileFormat().make_write_options(compression='zstd',
+                                                                   write_statistics=True))
+    
+    tujuan = os.path.join(direktori, f"tahun={tahun}")
+    shutil.rmtree(tujuan, ignore_errors=True)
+    if os.path.isdir(os.path.join(sementara, f"tahun={tahun}")):
+        os.replace(os.path.join(sementara, f"tahun={tahun}"), tujuan)
+    shutil.rmtree(sementara, ignore_errors=True)
+    return len(tabel)
+
+def ekspor_arsip(koneksi, sampai_tahun=None, paksa=False, direktori=DIREKTORI_ARSIP):
+    """
+    Perbarui arsip sampai `sampai_tahun` (default tahun lalu). Hanya tahun
+    yang sidiknya berubah sejak ekspor sebelumnya yang ditulis ulang; manifest
+    dicap dengan versi_import supaya dashboard tidak memakai arsip yang
+    tertinggal dari isi database, dan dengan sumber_mysql supaya database
+    lain tidak memakainya.
+    
+    Args:
+        koneksi: Koneksi mysql.connector ke database sumber.
+        sampai_tahun (int): Tahun terakhir yang diarsipkan (harus sudah lewat).
+        paksa (bool): Tulis ulang semua tahun.
+    
+    Returns:
+        dict: Manifest baru.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow belum terpasang (pip install pyarrow)")
+    if sampai_tahun is None:
+        sampai_tahun = date.today().year - 1
+    sampai_tahun = min(int(sampai_tahun), date.today().year - 1)
+    os.makedirs(direktori, exist_ok=True)
+    
+    kursor = koneksi.cursor()
+    # versi dibaca sebelum sidik: jika ada import di tengah ekspor, manifest
+    # memuat versi lama dan dashboard tetap membaca MySQL sampai ekspor berikutnya
+    versi = versi_import(kursor)
+    sidik = {tahun: s for tahun, s in sidik_tahun(kursor).items() if tahun <= sampai_tahun}
+    kursor.close()
+    if versi is None:
+        raise RuntimeError("katalog_data belum berisi versi_import; jalankan skema.py dan import dulu")
+    
+    sumber = sumber_mysql(koneksi.database)
+    lama = baca_manifest(direktori) or {}
+    tahun_lama = lama.get('tahun', {}) if lama.get('sumber') == sumber else {}
+    manifest = {'sumber': sumber, 'database': koneksi.database, 'versi_import': versi,
+                'sampai_tahun': sampai_tahun,
+                'diperbarui': datetime.now().isoformat(timespec='seconds'), 'tahun': {}}
+    
+    for tahun in sorted(sidik):
+        catatan = tahun_lama.get(str(tahun))
+        if not paksa and catatan and catatan['sidik'] == sidik[tahun] and os.path.isdir(
+                os.path.join(direktori, f"tahun={tahun}")):
+            manifest['tahun'][str(tahun)] = catatan
+            continue
+        jumlah = ekspor_tahun(koneksi, tahun, direktori)
+        manifest['tahun'][str(tahun)] = {'sidik': sidik[tahun], 'baris': jumlah}
+        print(f"✅ Arsip {tahun}: {jumlah:,} baris")
+    
+    # Tahun yang sudah tidak ada (atau di luar sampai_tahun) dihapus dari arsip
+    for nama in os.listdir(direktori):
+        if nama.startswith('tahun=') and nama[len('tahun='):] not in manifest['tahun']:
+            shutil.rmtree(os.path.join(direktori, nama), ignore_errors=True)
+    
+    tulis_manifest(manifest, direktori)
+    return manifest
+
+# ===== BACA =====
+
+_cache_arsip = {'kunci': None, 'manifest': None, 'dataset': None}
+_kunci_cache_arsip = threading.Lock()
+
+def ambil_arsip(versi, sumber, direktori=DIREKTORI_ARSIP):
+    """
+    Dataset arsip yang berlaku untuk database `sumber` (sumber_mysql) pada
+    versi_import `versi`. Dataset (daftar file) dibuat ulang hanya jika
+    manifest berubah.
+    
+    Returns:
+        dict: dataset (pyarrow Dataset), sampai_tahun, tahun (tahun yang ada
+              datanya); None jika pyarrow tidak ada, sumber None (mis. backend
+              DuckDB), arsip belum dibuat, milik database lain, atau usang.
+    """
+    if ds is None or versi is None or sumber is None:
+        return None
+    try:
+        kunci = (direktori, os.stat(os.path.join(direktori, FILE_MANIFEST)).st_mtime_ns)
+    except OSError:
+        return None
+    
+    with _kunci_cache_arsip:
+        if _cache_arsip['kunci'] != kunci:
+            manifest = baca_manifest(direktori)
+            dataset = None
+            if manifest and manifest.get('tahun'):
+                # File dipetakan ke memori: halaman yang sudah di cache OS tidak disalin ulang
+                dataset = ds.dataset(direktori, format='parquet', partitioning=partisi_arsip(),
+                                     filesystem=pafs.LocalFileSystem(use_mmap=True),
+                                     ignore_prefixes=['.', '_', FILE_MANIFEST])
+            _cache_arsip.update(kunci=kunci, manifest=manifest, dataset=dataset)
+        manifest, dataset = _cache_arsip['manifest'], _cache_arsip['dataset']
+    
+    if dataset is None or manifest.get('sumber') != sumber or manifest.get('versi_import') != versi:
+        return None
+    return {'dataset': dataset, 'sampai_tahun': int(manifest['sampai_tahun']),
+            'tahun': sorted((int(t) for t in manifest['tahun']), reverse=True)}
+
+def bagi_rentang_arsip(tanggal_mulai, tanggal_selesai, sampai_tahun):
+    """
+    Bagi rentang tanggal (date atau None = tidak dibatasi) menjadi bagian
+    MySQL (setelah sampai_tahun) dan bagian arsip (sampai akhir sampai_tahun).
+    
+    Returns:
+        tuple: ((mulai, selesai) MySQL atau None, (mulai, selesai) arsip atau None)
+    """
+    akhir_arsip = date(sampai_tahun, 12, 31)
+    awal_mysql = date(sampai_tahun + 1, 1, 1)
+    
+    rentang_mysql = None
+    if tanggal_selesai is None or tanggal_selesai > akhir_arsip:
+        rentang_mysql = (max(tanggal_mulai, awal_mysql) if tanggal_mulai else awal_mysql, tanggal_selesai)
+    rentang_arsip = None
+    if tanggal_mulai is None or tanggal_mulai <= akhir_arsip:
+        rentang_arsip = (tanggal_mulai, min(tanggal_selesai, akhir_arsip) if tanggal_selesai else akhir_arsip)
+    if rentang_arsip and rentang_arsip[0] and rentang_arsip[0] > rentang_arsip[1]:
+        rentang_arsip = None
+    return rentang_mysql, rentang_arsip
+
+def baca_arsip(arsip, tanggal_mulai, tanggal_selesai, kolom, id_stasiun=None, batas=None):
+    """
+    Baca observasi dari arsip, terbaru dulu (seperti ORDER BY tanggal DESC).
+    Kolom dan filter didorong ke pembaca Parquet: partisi tahun/stasiun di
+    luar filter tidak dibuka dan file di luar rentang dilewati lewat
+    statistik tanggal. Dibaca per tahun dari yang terbaru, berhenti begitu
+    `batas` baris terpenuhi.
+    
+    Args:
+        arsip (dict): Hasil ambil_arsip.
+        tanggal_mulai, tanggal_selesai (date): Rentang (None = tidak dibatasi).
+        kolom (list): Kolom dari KOLOM_ARSIP yang diambil.
+        id_stasiun (list): Stasiun yang diambil (None = semua).
+        batas (int): Jumlah baris maksimum (None = semua).
+    
+    Returns:
+        DataFrame: Kolom `kolom`, tanggal sebagai date (sama seperti pd.read_sql).
+    """
+    filter_dasar = None
+    if id_stasiun is not None:
+        filter_dasar = ds.field('id_stasiun').isin([int(i) for i in id_stasiun])
+    if tanggal_mulai is not None:
+        syarat = ds.field('tanggal') >= pa.scalar(tanggal_mulai, pa.date32())
+        filter_dasar = syarat if filter_dasar is None else filter_dasar & syarat
+    if tanggal_selesai is not None:
+        syarat = ds.field('tanggal') <= pa.scalar(tanggal_selesai, pa.date32())
+        filter_dasar = syarat if filter_dasar is None else filter_dasar & syarat
+    
+    daftar_tahun = arsip['tahun']
+    if tanggal_mulai is not None:
+        daftar_tahun = [t for t in daftar_tahun if t >= tanggal_mulai.year]
+    if tanggal_selesai is not None:
+        daftar_tahun = [t for t in daftar_tahun if t <= tanggal_selesai.year]
+    
+    bagian = []
+    terkumpul = 0
+    for tahun in daftar_tahun:
+        syarat = ds.field('tahun') == tahun
+        tabel = arsip['dataset'].to_table(columns=list(kolom),
+                                 filter=syarat if filter_dasar is None else syarat & filter_dasar)
+        if not len(tabel):
+            continue
+        if 'tanggal' in kolom:
+            tabel = tabel.sort_by([('tanggal', 'descending')])
+        bagian.append(tabel)
+        terkumpul += len(tabel)
+        if batas is not None and terkumpul >= batas:
+            break
+    
+    if not bagian:
+        return skema_arsip().empty_table().select(list(kolom)).to_pandas()
+    tabel = pa.concat_tables(bagian)
+    if batas is not None:
+        tabel = tabel.slice(0, batas)
+    return tabel.to_pandas()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ekspor observasi tahun lalu ke arsip Parquet")
+    parser.add_argument('--database', default=skema.NAMA_DATABASE, help="Database sumber")
+    parser.add_argument('--direktori', default=DIREKTORI_ARSIP, help="Direktori arsip")
+    parser.add_argument('--sampai-tahun', type=int, default=None,
+                        help="Tahun terakhir yang diarsipkan (default: tahun lalu)")
+    parser.add_argument('--paksa', action='store_true', help="Tulis ulang semua tahun")
+    args = parser.parse_args()
+    
+    if pa is None:
+        print("❌ pyarrow belum terpasang (pip install pyarrow)")
+        sys.exit(1)
+    koneksi = skema.buat_koneksi(args.database)
+    try:
+        manifest = ekspor_arsip(koneksi, args.sampai_tahun, args.paksa, args.direktori)
+    finally:
+        koneksi.close()
+    total = sum(t['baris'] for t in manifest['tahun'].values())
+    print(f"✅ Arsip sampai {manifest['sampai_tahun']}: {len(manifest['tahun'])} tahun, "
+          f"{total:,} baris (versi import {manifest['versi_import']})")
@@ -0,0 +1,161 @@
+"""
+backend.py - BACKEND PENYIMPANAN DATA IKLIM
+Fungsi ambil_* di config.py memakai koneksi dari KonektorDatabase. Backend
+dipilih lewat IKLIM_BACKEND:
+- 'mysql' (default): pool mysql.connector ke server MySQL
+- 'duckdb': file DuckDB tertanam (kolumnar, tanpa server), diisi oleh
+  data/import.py --mode duckdb
+Koneksi DuckDB dibungkus supaya antarmukanya sama dengan mysql.connector
+(parameter %s, cursor(dictionary=True), ping, close), sehingga query dan
+penanganan error di config.py tidak perlu tahu backend mana yang dipakai.
+"""
+
+import os
+import re
+
+import mysql.connector
+
+try:
+    import duckdb
+except ImportError:  # duckdb opsional: hanya backend MySQL yang tersedia
+    duckdb = None
+
+BACKEND = os.environ.get('IKLIM_BACKEND', 'mysql').lower()
+BACKEND_TERSEDIA = ['mysql', 'duckdb']
+
+FILE_DUCKDB = os.environ.get(
+    'IKLIM_FILE_DUCKDB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'iklim_indonesia.duckdb'))
+
+# Ditangkap config.py sebagai "error database" untuk kedua backend
+Error = (mysql.connector.Error,) + ((duckdb.Error,) if duckdb is not None else ())
+# Tabel belum ada / SQL tidak valid
+ProgrammingError = ((mysql.connector.errors.ProgrammingError,)
+                    + ((duckdb.ProgrammingError,) if duckdb is not None else ()))
+
+NAMA_BACKEND = {'mysql': 'MySQL', 'duckdb': 'DuckDB'}
+
+def pastikan_backend(nama):
+    """Validasi nama backend dan ketersediaan modulnya"""
+    if nama not in BACKEND_TERSEDIA:
+        raise ValueError(f"Backend tidak dikenal: {nama} (pilih {', '.join(BACKEND_TERSEDIA)})")
+    if nama == 'duckdb' and duckdb is None:
+        raise ImportError("duckdb belum terpasang (pip install duckdb)")
+    return nama
+
+# %s -> ? (placeholder DuckDB); %% -> % seperti pemformatan mysql.connector
+_POLA_PARAMETER = re.compile(r'%([s%])')
+
+def ubah_parameter(query):
+    """Ubah placeholder gaya mysql.connector (%s) menjadi gaya DuckDB (?)"""
+    return _POLA_PARAMETER.sub(lambda m: '?' if m.group(1) == 's' else '%', query)
+
+class KursorDuckDB:
+    """Kursor DuckDB dengan antarmuka kursor mysql.connector yang dipakai config.py"""
+    
+    def __init__(self, koneksi, dictionary=False):
+        self._kursor = koneksi.cursor()
+        self._dictionary = dictionary
+    
+    @property
+    def description(self):
+        return self._kursor.description
+    
+    @property
+    def rowcount(self):
+        return self._kursor.rowcount
+    
+    def execute(self, query, parameter=None):
+        if parameter:
+            self._kursor.execute(ubah_parameter(query), list(parameter))
+        else:
+            self._kursor.execute(query)
+    
+    def executemany(self, query, daftar_parameter):
+        self._kursor.executemany(ubah_parameter(query), [list(p) for p in daftar_parameter])
+    
+    def _bentuk(self, baris):
+        if not self._dictionary:
+            return baris
+        kolom = [d[0] for d in self._kursor.description]
+        return [dict(zip(kolom, b)) for b in baris]
+    
+    def fetchone(self):
+        baris = self._kursor.fetchone()
+        return self._bentuk([baris])[0] if baris is not None else None
+    
+    def fetchall(self):
+        return self._bentuk(self._kursor.fetchall())
+    
+    def fetchmany(self, ukuran=1):
+        return self._bentuk(self._kursor.fetchmany(ukuran))
+    
+    def fetch_df(self):
+        """Hasil langsung sebagai DataFrame (kolumnar, tanpa tuple per baris)"""
+        return self._kursor.fetch_df()
+    
+    def close(self):
+        self._kursor.close()
+
+class KoneksiDuckDB:
+    """
+    Koneksi pinjaman ke file DuckDB. Setiap pinjaman membuka koneksi baca
+    sendiri dan close() menutupnya, jadi kunci file dilepas di antara
+    query (importer bisa menulis) dan pinjaman berikutnya selalu melihat
+    isi file terbaru.
+    """
+    
+    def __init__(self, koneksi, database):
+        self._koneksi = koneksi
+        self.database = database
+    
+    def cursor(self, buffered=None, dictionary=False):
+        # buffered diabaikan: fetchmany DuckDB sudah membaca hasil bertahap
+        return KursorDuckDB(self._koneksi, dictionary)
+    
+    def baca_dataframe(self, query, parameter=None):
+        """
+        Jalankan query dan kembalikan DataFrame lewat jalur kolumnar DuckDB.
+        Kolom DATE dikembalikan sebagai objek date dan FLOAT sebagai float64,
+        sama seperti pd.read_sql dengan mysql.connector.
+        """
+        kursor = self.cursor()
+        try:
+            kursor.execute(query, parameter)
+            tanggal = [d[0] for d in kursor.description if str(d[1]) == 'DATE']
+            df = kursor.fetch_df()
+        finally:
+            kursor.close()
+        for kolom in tanggal:
+            df[kolom] = df[kolom].dt.date
+        float32 = df.select_dtypes('float32').columns
+        if len(float32):
+            df[float32] = df[float32].astype('float64')
+        return df
+    
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        pass  # file lokal: tidak ada koneksi jaringan yang bisa putus
+    
+    def commit(self):
+        self._koneksi.commit()
+    
+    def disconnect(self):
+        pass
+    
+    def close(self):
+        self._koneksi.close()
+
+def buka_duckdb(nama_file=FILE_DUCKDB, tulis=False):
+    """
+    Buka koneksi baru ke file DuckDB: read_only untuk dashboard, atau
+    baca-tulis untuk import. Koneksi baca tidak disimpan lintas pinjaman;
+    koneksi yang tetap terbuka akan menahan kunci file (import gagal
+    mendapat kunci tulis) dan tidak melihat file yang ditulis ulang.
+    """
+    pastikan_backend('duckdb')
+    return duckdb.connect(nama_file, read_only=not tulis)
+
+def pinjam_duckdb(nama_file=FILE_DUCKDB):
+    """Pinjam koneksi baca ke file DuckDB (ditutup oleh close())"""
+    nama_database = os.path.splitext(os.path.basename(nama_file))[0]
+    return KoneksiDuckDB(buka_duckdb(nama_file), nama_database)
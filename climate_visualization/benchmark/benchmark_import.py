@@ -0,0 +1,176 @@
+"""
+BENCHMARK IMPORT DATA CUACA
+Menjalankan data/import.py dengan beberapa mode terhadap data sintetis
+dan mencatat baris/detik, waktu, dan memori puncak ke file JSON.
+Mode duckdb memuat ke file DuckDB sementara (tidak butuh server MySQL).
+"""
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import mysql.connector
+
+from generator_data import DIREKTORI_DATA, buat_data_sintetis
+
+sys.path.insert(0, os.path.join(DIREKTORI_DATA, '..'))
+import skema
+
+DIREKTORI_HASIL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hasil')
+
+# Database terpisah supaya benchmark tidak menyentuh data asli
+DATABASE_BENCHMARK = 'iklim_benchmark'
+TABEL_BENCHMARK = ['provinsi', 'wilayah', 'stasiun', 'observasi_cuaca']
+
+def siapkan_database_benchmark():
+    """
+    Buat database benchmark dengan skema dari skema.py (index sama seperti
+    database asli), lalu kosongkan isinya.
+    """
+    conn = skema.buat_koneksi(DATABASE_BENCHMARK)
+    skema.migrasi(conn)
+    cur = conn.cursor()
+    for tabel in TABEL_BENCHMARK + list(skema.TABEL_RINGKASAN) + ['katalog_data', 'checkpoint_import']:
+        try:
+            cur.execute(f"TRUNCATE TABLE {tabel}")
+        except mysql.connector.Error:
+            pass  # checkpoint_import belum ada pada run pertama
+    conn.commit()
+    cur.close()
+    conn.close()
+
+def jalankan_satu(direktori_kerja, konfigurasi):
+    """
+    Jalankan satu import di proses tersendiri (dipanggil lewat process pool)
+    supaya memori puncak tiap mode terukur terpisah.
+    """
+    os.environ['IKLIM_DB_NAMA'] = DATABASE_BENCHMARK
+    os.chdir(direktori_kerja)
+
+    # import.py dimuat dengan nama modul aslinya agar fungsi worker import
+    # paralel tetap bisa di-pickle dan ditemukan oleh proses cucu
+    sys.path.insert(0, DIREKTORI_DATA)
+    importer = importlib.import_module('import')
+
+    mulai = time.perf_counter()
+    ringkasan = importer.import_csv_sederhana(ulang=True, **konfigurasi)
+    ringkasan['detik_wall'] = time.perf_counter() - mulai
+
+    try:
+        import resource
+        # Memori puncak worker import paralel (anak proses ini)
+        anak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        ringkasan['memori_puncak_worker_mb'] = anak / 1024 if anak else None
+    except ImportError:
+        ringkasan['memori_puncak_worker_mb'] = None
+    return ringkasan
+
+def versi_git():
+    """Commit git saat ini (untuk melacak performa antar perubahan)"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=DIREKTORI_DATA, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def jalankan_benchmark(jumlah_baris, daftar_mode, daftar_pekerja, ukuran_batch, ukuran_chunk,
+                       persen_tanggal_rusak=0.01, file_output=None):
+    """
+    Buat data sintetis sekali, lalu jalankan setiap kombinasi mode x pekerja
+    terhadap database benchmark yang dikosongkan sebelum setiap run.
+
+    Returns:
+        dict: Hasil benchmark (juga ditulis ke file JSON).
+    """
+    direktori_kerja = tempfile.mkdtemp(prefix='benchmark_iklim_')
+    try:
+        for nama in ['province_detail.csv', 'station_detail.csv']:
+            shutil.copy(os.path.join(DIREKTORI_DATA, nama), direktori_kerja)
+
+        print(f"Membuat {jumlah_baris:,} baris data sintetis...")
+        jumlah_baris = buat_data_sintetis(os.path.join(direktori_kerja, 'climate_data.csv'),
+                                          jumlah_baris, persen_tanggal_rusak=persen_tanggal_rusak)
+
+        hasil_run = []
+        konteks = multiprocessing.get_context('spawn')
+        for mode in daftar_mode:
+            for pekerja in daftar_pekerja:
+                print(f"\n▶️ mode={mode} pekerja={pekerja}")
+                konfigurasi = {'mode': mode, 'pekerja': pekerja,
+                               'ukuran_batch': ukuran_batch, 'ukuran_chunk': ukuran_chunk}
+                if mode == 'duckdb':
+                    # File baru setiap run, setara database yang dikosongkan
+                    file_duckdb = os.path.join(direktori_kerja, 'benchmark.duckdb')
+                    if os.path.exists(file_duckdb):
+                        os.remove(file_duckdb)
+                    konfigurasi['file_duckdb'] = file_duckdb
+                else:
+                    siapkan_database_benchmark()
+                with ProcessPoolExecutor(max_workers=1, mp_context=konteks) as pool:
+                    try:
+                        ringkasan = pool.submit(jalankan_satu, direktori_kerja, konfigurasi).result()
+                    except Exception as e:
+                        print(f"❌ Gagal: {e}")
+                        ringkasan = {'error': str(e)}
+                hasil_run.append({'konfigurasi': konfigurasi, 'hasil': ringkasan})
+    finally:
+        shutil.rmtree(direktori_kerja, ignore_errors=True)
+
+    hasil = {
+        'waktu': datetime.now().isoformat(timespec='seconds'),
+        'git': versi_git(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'jumlah_baris_sintetis': jumlah_baris,
+        'persen_tanggal_rusak': persen_tanggal_rusak,
+        'run': hasil_run,
+    }
+
+    if file_output is None:
+        os.makedirs(DIREKTORI_HASIL, exist_ok=True)
+        file_output = os.path.join(DIREKTORI_HASIL,
+                                   f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(file_output, 'w', encoding='utf-8') as berkas:
+        json.dump(hasil, berkas, indent=2, default=str)
+
+    # Ringkasan singkat di konsol
+    print("\n" + "=" * 70)
+    print(f"{'MODE':10} {'WORKER':>6} {'BARIS/DETIK':>12} {'WAKTU (s)':>10} {'MEMORI (MB)':>12}")
+    print("=" * 70)
+    for run in hasil_run:
+        r = run['hasil']
+        if 'error' in r:
+            print(f"{run['konfigurasi']['mode']:10} {run['konfigurasi']['pekerja']:>6} GAGAL")
+            continue
+        memori = r.get('memori_puncak_mb') or 0
+        print(f"{r['mode']:10} {r['pekerja']:>6} {r['baris_per_detik']:>12,.0f} "
+              f"{r['detik_wall']:>10,.1f} {memori:>12,.1f}")
+    print("=" * 70)
+    print(f"Hasil disimpan ke {file_output}")
+    return hasil
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark kecepatan import data cuaca")
+    parser.add_argument('--baris', type=int, default=1000000, help="Jumlah baris sintetis")
+    parser.add_argument('--mode', nargs='+', default=['insert', 'infile'],
+                        help="Mode import yang dibandingkan (insert, infile, duckdb)")
+    parser.add_argument('--pekerja', nargs='+', type=int, default=[1],
+                        help="Jumlah worker yang dibandingkan, mis. 1 4")
+    parser.add_argument('--ukuran-batch', type=int, default=5000)
+    parser.add_argument('--ukuran-chunk', type=int, default=100000)
+    parser.add_argument('--persen-tanggal-rusak', type=float, default=0.01)
+    parser.add_argument('--output', help="File JSON hasil (default: benchmark/hasil/...)")
+    args = parser.parse_args()
+
+    jalankan_benchmark(args.baris, args.mode, args.pekerja, args.ukuran_batch,
+                       args.ukuran_chunk, args.persen_tanggal_rusak, args.output)
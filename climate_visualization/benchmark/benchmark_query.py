@@ -0,0 +1,127 @@
+"""
+BENCHMARK QUERY DASHBOARD PER BACKEND
+Menjalankan fungsi ambil_* dari config.py terhadap setiap backend
+(IKLIM_BACKEND=mysql / duckdb) dan mencatat waktu median ke file JSON.
+Setiap backend dijalankan di proses tersendiri karena backend dipilih
+saat config.py dimuat.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from benchmark_import import DIREKTORI_HASIL, versi_git
+
+DIREKTORI_APLIKASI = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# (nama, fungsi config.py, argumen): beban khas halaman dashboard
+SKENARIO = [
+    ('data_cuaca_10rb', 'ambil_data_cuaca', {'batas': 10000}),
+    ('data_cuaca_wilayah', 'ambil_data_cuaca', {'id_wilayah': 1, 'batas': 10000}),
+    ('agregat_bulanan', 'ambil_agregat_cuaca', {'dimensi': ('tahun', 'bulan')}),
+    ('agregat_provinsi', 'ambil_agregat_cuaca',
+     {'dimensi': ('provinsi',), 'metrik': {'suhu_rata_rata': ['mean', 'min', 'max'],
+                                           'curah_hujan': 'sum'}}),
+    ('ringkasan_tahunan', 'ambil_ringkasan_cuaca', {'dimensi': ('tahun', 'stasiun')}),
+    ('halaman_grid', 'ambil_halaman_cuaca', {'ukuran_halaman': 100}),
+    ('hitung_baris', 'hitung_baris_cuaca', {}),
+    ('statistik_database', 'ambil_statistik_database', {}),
+]
+
+def jalankan_backend(nama_backend, ulang):
+    """
+    Jalankan semua skenario untuk satu backend (dipanggil lewat process pool).
+
+    Returns:
+        dict: {skenario: {'median_ms', 'min_ms', 'baris'}} atau {'error': ...}.
+    """
+    os.environ['IKLIM_BACKEND'] = nama_backend
+    os.environ['IKLIM_CACHE_HASIL'] = '0'  # ukur query, bukan cache hasil di disk
+    sys.path.insert(0, DIREKTORI_APLIKASI)
+    import config
+
+    # ambil_* mengembalikan DataFrame kosong jika database tidak terjangkau;
+    # tanpa cek ini backend yang mati tampak "cepat"
+    if not config.KonektorDatabase().uji_koneksi():
+        return {'error': f"Tidak bisa terhubung ke backend {nama_backend}"}
+
+    hasil = {}
+    for nama, fungsi, argumen in SKENARIO:
+        waktu = []
+        for _ in range(ulang):
+            mulai = time.perf_counter()
+            keluaran = getattr(config, fungsi)(**argumen)
+            waktu.append((time.perf_counter() - mulai) * 1000)
+        if isinstance(keluaran, dict) and 'data' in keluaran:
+            keluaran = keluaran['data']
+        hasil[nama] = {
+            'median_ms': statistics.median(waktu),
+            'min_ms': min(waktu),
+            'baris': len(keluaran) if hasattr(keluaran, '__len__') else None,
+        }
+    return hasil
+
+def jalankan_benchmark(daftar_backend, ulang=5, file_output=None):
+    """
+    Bandingkan backend pada skenario yang sama.
+
+    Returns:
+        dict: Hasil benchmark (juga ditulis ke file JSON).
+    """
+    hasil_backend = {}
+    konteks = multiprocessing.get_context('spawn')
+    for nama_backend in daftar_backend:
+        print(f"▶️ backend={nama_backend}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=konteks) as pool:
+            try:
+                hasil_backend[nama_backend] = pool.submit(jalankan_backend, nama_backend, ulang).result()
+            except Exception as e:
+                print(f"❌ Gagal: {e}")
+                hasil_backend[nama_backend] = {'error': str(e)}
+
+    hasil = {
+        'waktu': datetime.now().isoformat(timespec='seconds'),
+        'git': versi_git(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'ulang': ulang,
+        'backend': hasil_backend,
+    }
+
+    if file_output is None:
+        os.makedirs(DIREKTORI_HASIL, exist_ok=True)
+        file_output = os.path.join(DIREKTORI_HASIL,
+                                   f"benchmark_query_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(file_output, 'w', encoding='utf-8') as berkas:
+        json.dump(hasil, berkas, indent=2, default=str)
+
+    # Tabel median (ms) per skenario x backend
+    print("\n" + "=" * 70)
+    print(f"{'SKENARIO':22}" + "".join(f"{b.upper():>14}" for b in daftar_backend))
+    print("=" * 70)
+    for nama, _, _ in SKENARIO:
+        kolom = []
+        for b in daftar_backend:
+            r = hasil_backend[b].get(nama)
+            kolom.append(f"{r['median_ms']:>11,.1f} ms" if r else f"{'GAGAL':>14}")
+        print(f"{nama:22}" + "".join(kolom))
+    print("=" * 70)
+    print(f"Hasil disimpan ke {file_output}")
+    return hasil
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark query dashboard per backend penyimpanan")
+    parser.add_argument('--backend', nargs='+', default=['mysql', 'duckdb'],
+                        help="Backend yang dibandingkan (data harus sudah diimport ke masing-masing)")
+    parser.add_argument('--ulang', type=int, default=5, help="Jumlah pengulangan per skenario")
+    parser.add_argument('--output', help="File JSON hasil (default: benchmark/hasil/...)")
+    args = parser.parse_args()
+
+    jalankan_benchmark(args.backend, args.ulang, args.output)
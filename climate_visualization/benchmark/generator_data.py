@@ -0,0 +1,103 @@
+"""
+GENERATOR DATA CUACA SINTETIS
+Membuat file berbentuk climate_data.csv (data harian BMKG) untuk benchmark import
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+DIREKTORI_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+FILE_STASIUN = os.path.join(DIREKTORI_DATA, 'station_detail.csv')
+
+# Urutan kolom sama dengan climate_data.csv dari Kaggle
+KOLOM_CUACA = ['date', 'Tn', 'Tx', 'Tavg', 'RH_avg', 'RR', 'ss',
+               'ff_x', 'ddd_x', 'ff_avg', 'ddd_car', 'station_id']
+
+ARAH_ANGIN = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW', 'C']
+
+# Contoh tanggal rusak yang sering muncul di ekspor manual
+TANGGAL_RUSAK = ['32/13/10', '', '2010/01', '00/00/00', 'N/A', '29/02/21']
+
+def ambil_id_stasiun(file_stasiun=FILE_STASIUN):
+    """Ambil station_id asli dari station_detail.csv"""
+    return pd.read_csv(file_stasiun, usecols=['station_id'])['station_id'].dropna().astype(int).to_numpy()
+
+def buat_blok(rng, tanggal, id_stasiun, persen_tanggal_rusak, persen_sentinel):
+    """Buat satu blok baris (semua stasiun x rentang tanggal) secara tervektorisasi"""
+    jumlah = len(tanggal) * len(id_stasiun)
+    tgl = np.repeat(tanggal, len(id_stasiun))
+    stasiun = np.tile(id_stasiun, len(tanggal))
+
+    tn = rng.normal(23.0, 2.0, jumlah).round(1)
+    tx = (tn + rng.uniform(5.0, 10.0, jumlah)).round(1)
+    tavg = (tn + (tx - tn) * rng.uniform(0.4, 0.6, jumlah)).round(1)
+    rh = rng.uniform(60.0, 100.0, jumlah).round(0)
+    rr = np.where(rng.random(jumlah) < 0.6, 0.0, rng.exponential(10.0, jumlah)).round(1)
+    ss = rng.uniform(0.0, 12.0, jumlah).round(1)
+    ff_x = rng.uniform(1.0, 15.0, jumlah).round(0)
+    ddd_x = rng.integers(0, 361, jumlah)
+    ff_avg = (ff_x * rng.uniform(0.2, 0.6, jumlah)).round(0)
+    ddd_car = rng.choice(ARAH_ANGIN, jumlah)
+
+    df = pd.DataFrame({
+        # Format asli BMKG: d/m/yy
+        'date': (pd.Series(tgl.day).astype(str) + '/' + pd.Series(tgl.month).astype(str)
+                 + '/' + pd.Series(tgl.year % 100).astype(str).str.zfill(2)),
+        'Tn': tn, 'Tx': tx, 'Tavg': tavg, 'RH_avg': rh, 'RR': rr, 'ss': ss,
+        'ff_x': ff_x, 'ddd_x': ddd_x, 'ff_avg': ff_avg, 'ddd_car': ddd_car,
+        'station_id': stasiun,
+    })
+
+    # Nilai sentinel BMKG: 8888 = tidak terukur, 9999 = tidak ada data
+    if persen_sentinel > 0:
+        for kolom in ['Tn', 'Tx', 'Tavg', 'RH_avg', 'RR', 'ss']:
+            kena = rng.random(jumlah) < persen_sentinel
+            df.loc[kena, kolom] = rng.choice([8888.0, 9999.0], int(kena.sum()))
+
+    if persen_tanggal_rusak > 0:
+        rusak = rng.random(jumlah) < persen_tanggal_rusak
+        df.loc[rusak, 'date'] = rng.choice(TANGGAL_RUSAK, int(rusak.sum()))
+
+    return df[KOLOM_CUACA]
+
+def buat_data_sintetis(nama_file, jumlah_baris, tanggal_mulai='2010-01-01',
+                       persen_tanggal_rusak=0.01, persen_sentinel=0.02,
+                       seed=42, hari_per_blok=30, file_stasiun=FILE_STASIUN):
+    """
+    Tulis CSV cuaca sintetis kira-kira `jumlah_baris` baris (stasiun x hari)
+    memakai station_id asli. Ditulis per blok hari sehingga memori tetap kecil.
+
+    Returns:
+        int: Jumlah baris yang ditulis.
+    """
+    rng = np.random.default_rng(seed)
+    id_stasiun = ambil_id_stasiun(file_stasiun)
+    jumlah_hari = max(1, -(-jumlah_baris // len(id_stasiun)))
+    semua_tanggal = pd.date_range(tanggal_mulai, periods=jumlah_hari, freq='D')
+
+    tertulis = 0
+    with open(nama_file, 'w', encoding='utf-8', newline='') as berkas:
+        for awal in range(0, jumlah_hari, hari_per_blok):
+            blok = buat_blok(rng, semua_tanggal[awal:awal + hari_per_blok], id_stasiun,
+                             persen_tanggal_rusak, persen_sentinel)
+            blok.to_csv(berkas, index=False, header=(awal == 0), lineterminator='\n')
+            tertulis += len(blok)
+
+    return tertulis
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Buat CSV cuaca sintetis berbentuk climate_data.csv")
+    parser.add_argument('output', help="Path file CSV output")
+    parser.add_argument('--baris', type=int, default=1000000, help="Perkiraan jumlah baris")
+    parser.add_argument('--tanggal-mulai', default='2010-01-01')
+    parser.add_argument('--persen-tanggal-rusak', type=float, default=0.01)
+    parser.add_argument('--persen-sentinel', type=float, default=0.02)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    jumlah = buat_data_sintetis(args.output, args.baris, args.tanggal_mulai,
+                                args.persen_tanggal_rusak, args.persen_sentinel, args.seed)
+    print(f"✅ {jumlah:,} baris ditulis ke {args.output}")
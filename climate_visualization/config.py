@@ -5,63 +5,1408 @@ VERSI DIPERBAIKI: Mendukung filter rentang tanggal dengan benar
 """
 
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import errors, pooling
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import contextmanager
+import functools
+import hashlib
+import inspect
+import pickle
+import shutil
+import threading
+import time
+import os
+import zlib
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:  # Streamlit lama
+    add_script_run_ctx = get_script_run_ctx = None
+
+from skema import VARIABEL_RINGKASAN, STATISTIK_RINGKASAN, KONFIG_DB, NAMA_DATABASE, jelaskan_query
+import arsip
+import backend
+from backend import Error
+
+# Ukuran pool dan batas tunggu bisa diatur lewat environment tanpa mengubah kode
+UKURAN_POOL = int(os.environ.get('IKLIM_UKURAN_POOL', 8))
+BATAS_TUNGGU_POOL = float(os.environ.get('IKLIM_TUNGGU_POOL', 10))
 
 class KonektorDatabase:
-    """Class untuk mengelola koneksi database"""
+    """
+    Class untuk mengelola koneksi database. Semua instance berbagi satu
+    pool koneksi per proses, jadi setiap rerun Streamlit meminjam koneksi
+    yang sudah terbuka alih-alih membuka koneksi TCP baru.
+    Dengan IKLIM_BACKEND=duckdb koneksi dipinjam dari file DuckDB
+    (backend.py) dengan antarmuka yang sama.
+    """
+    
+    _pool = None
+    _kunci_pool = threading.Lock()
+    _kunci_statistik = threading.Lock()
+    _statistik = {
+        'pinjam': 0,          # jumlah koneksi berhasil dipinjam
+        'langsung': 0,        # dipinjam tanpa menunggu (pool tidak penuh)
+        'menunggu': 0,        # harus menunggu koneksi dikembalikan
+        'gagal': 0,           # tidak dapat koneksi sampai batas tunggu
+        'sambung_ulang': 0,   # koneksi mati yang disambung ulang saat dipinjam
+        'total_detik_tunggu': 0.0,
+        'maks_detik_tunggu': 0.0,
+    }
+    
+    def __init__(self, ukuran_pool=UKURAN_POOL, batas_tunggu=BATAS_TUNGGU_POOL, nama_backend=None):
+        # Parameter koneksi dari skema.py (bisa diganti lewat IKLIM_DB_*)
+        self.host = KONFIG_DB['host']
+        self.port = KONFIG_DB['port']
+        self.user = KONFIG_DB['user']
+        self.password = KONFIG_DB['password']  # Kosong untuk Laragon
+        self.database = NAMA_DATABASE
+        self.backend = backend.pastikan_backend(nama_backend or backend.BACKEND)
+        # mysql.connector membatasi pool maksimal 32 koneksi
+        self.ukuran_pool = max(1, min(int(ukuran_pool), 32))
+        self.batas_tunggu = batas_tunggu
+    
+    def ambil_pool(self):
+        """Pool koneksi bersama; dibuat sekali saat pertama kali dibutuhkan"""
+        if KonektorDatabase._pool is None:
+            with KonektorDatabase._kunci_pool:
+                if KonektorDatabase._pool is None:
+                    KonektorDatabase._pool = pooling.MySQLConnectionPool(
+                        pool_name="iklim_indonesia",
+                        pool_size=self.ukuran_pool,
+                        pool_reset_session=True,
+                        host=self.host,
+                        port=self.port,
+                        user=self.user,
+                        password=self.password,
+                        database=self.database
+                    )
+        return KonektorDatabase._pool
+    
+    @classmethod
+    def _catat(cls, **tambahan):
+        with cls._kunci_statistik:
+            for kunci, nilai in tambahan.items():
+                if kunci == 'maks_detik_tunggu':
+                    cls._statistik[kunci] = max(cls._statistik[kunci], nilai)
+                else:
+                    cls._statistik[kunci] += nilai
+    
+    def pinjam_koneksi(self):
+        """
+        Pinjam koneksi dari pool. Jika pool sedang habis, tunggu (dengan
+        jeda yang makin panjang) sampai batas_tunggu detik. Koneksi dicek
+        dengan ping dan disambung ulang jika sudah diputus server.
+        
+        Returns:
+            PooledMySQLConnection: Koneksi pinjaman (close() = kembalikan ke pool),
+            atau backend.KoneksiDuckDB untuk backend duckdb.
+        """
+        mulai = time.perf_counter()
+        if self.backend == 'duckdb':
+            koneksi = backend.pinjam_duckdb()
+            self._catat(pinjam=1, langsung=1)
+            _tambah_tunggu(time.perf_counter() - mulai)
+            return koneksi
+        
+        pool = self.ambil_pool()
+        jeda = 0.01
+        menunggu = False
+        while True:
+            try:
+                koneksi = pool.get_connection()
+                break
+            except errors.PoolError:
+                if time.perf_counter() - mulai >= self.batas_tunggu:
+                    self._catat(gagal=1)
+                    raise
+                menunggu = True
+                time.sleep(jeda)
+                jeda = min(jeda * 2, 0.5)
+        
+        detik_tunggu = time.perf_counter() - mulai
+        if menunggu:
+            self._catat(menunggu=1, total_detik_tunggu=detik_tunggu, maks_detik_tunggu=detik_tunggu)
+        else:
+            self._catat(langsung=1)
+        
+        try:
+            koneksi.ping(reconnect=False)
+        except Error:
+            # Koneksi diputus server (mis. wait_timeout); sambung ulang sekali
+            koneksi.ping(reconnect=True, attempts=2, delay=0)
+            self._catat(sambung_ulang=1)
+        self._catat(pinjam=1)
+        # Termasuk ping/sambung ulang: waktu sampai koneksi siap dipakai
+        _tambah_tunggu(time.perf_counter() - mulai)
+        return koneksi
+    
+    def buat_koneksi(self):
+        """Meminjam koneksi dari pool bersama (tetap ditutup dengan close())"""
+        try:
+            return self.pinjam_koneksi()
+        except Error as e:
+            laporkan_error(f"❌ Error menghubungkan ke {backend.NAMA_BACKEND[self.backend]}", e, batas=None)
+            return None
+    
+    @staticmethod
+    def tutup_koneksi(koneksi):
+        """Kembalikan koneksi ke pool, juga jika koneksinya sudah terputus"""
+        if koneksi is None:
+            return
+        try:
+            koneksi.close()
+        except Error:
+            pass  # koneksi tetap dikembalikan ke pool oleh PooledMySQLConnection
+    
+    def uji_koneksi(self):
+        """Testing koneksi database"""
+        try:
+            koneksi = self.buat_koneksi()
+            if koneksi:
+                self.tutup_koneksi(koneksi)
+                return True
+            return False
+        except:
+            return False
+    
+    @classmethod
+    def statistik_pool(cls):
+        """
+        Angka pemakaian pool sejak proses dimulai.
+        
+        Returns:
+            dict: pinjam, langsung, menunggu, gagal, sambung_ulang,
+                  rasio_langsung, rata_rata_tunggu_ms, maks_tunggu_ms, ukuran_pool.
+        """
+        with cls._kunci_statistik:
+            statistik = dict(cls._statistik)
+        percobaan = statistik['pinjam'] + statistik['gagal']
+        statistik['rasio_langsung'] = statistik['langsung'] / percobaan if percobaan else 0.0
+        statistik['rata_rata_tunggu_ms'] = (statistik['total_detik_tunggu'] / statistik['menunggu'] * 1000
+                                            if statistik['menunggu'] else 0.0)
+        statistik['maks_tunggu_ms'] = statistik['maks_detik_tunggu'] * 1000
+        statistik['ukuran_pool'] = cls._pool.pool_size if cls._pool is not None else 0
+        return statistik
+
+# ===== EKSEKUSI QUERY BERSAMAAN =====
+# Thread pool bersama sebesar pool koneksi: setiap tugas meminjam koneksinya
+# sendiri sehingga query yang tidak saling bergantung berjalan paralel dan
+# waktu halaman mengikuti query paling lambat, bukan jumlah semuanya.
+
+_pelaksana = None
+_kunci_pelaksana = threading.Lock()
+
+def ambil_pelaksana():
+    """Thread pool bersama untuk jalankan_bersamaan (dibuat sekali per proses)"""
+    global _pelaksana
+    if _pelaksana is None:
+        with _kunci_pelaksana:
+            if _pelaksana is None:
+                _pelaksana = ThreadPoolExecutor(max_workers=UKURAN_POOL, thread_name_prefix='iklim_query')
+    return _pelaksana
+
+def _jalankan_dengan_konteks(konteks, fungsi, args):
+    # Konteks script Streamlit dipasang di thread worker supaya st.cache_data
+    # dan st.error di dalam fungsi ambil_* berlaku untuk sesi pemanggil
+    if konteks is not None:
+        add_script_run_ctx(threading.current_thread(), konteks)
+    return fungsi(*args)
+
+def jalankan_bersamaan(tugas):
+    """
+    Jalankan beberapa pemanggilan ambil_* yang tidak saling bergantung
+    secara bersamaan dan tunggu semuanya selesai.
+    
+    Args:
+        tugas (dict): nama -> fungsi tanpa argumen, atau tuple (fungsi, arg1, arg2, ...).
+    
+    Returns:
+        dict: nama -> hasil fungsi. Jika ada tugas yang melempar exception,
+              exception pertama dilempar ulang setelah semua tugas selesai.
+    """
+    daftar = {nama: ((isi[0], isi[1:]) if isinstance(isi, tuple) else (isi, ()))
+              for nama, isi in tugas.items()}
+    
+    # Dipanggil dari dalam tugas lain (mis. fallback ambil_statistik_database):
+    # jalankan berurutan supaya worker tidak menunggu worker lain dari pool yang sama
+    if threading.current_thread().name.startswith('iklim_query'):
+        return {nama: fungsi(*args) for nama, (fungsi, args) in daftar.items()}
+    
+    konteks = get_script_run_ctx() if get_script_run_ctx is not None else None
+    pelaksana = ambil_pelaksana()
+    futures = {nama: pelaksana.submit(_jalankan_dengan_konteks, konteks, fungsi, args)
+               for nama, (fungsi, args) in daftar.items()}
+    
+    hasil = {}
+    kesalahan = None
+    for nama, future in futures.items():
+        try:
+            hasil[nama] = future.result()
+        except Exception as e:
+            kesalahan = kesalahan or e
+    if kesalahan is not None:
+        raise kesalahan
+    return hasil
+
+# ===== INSTRUMENTASI QUERY =====
+# Setiap pemanggilan ambil_* dicatat ke ring buffer per proses: waktu,
+# jumlah baris, perkiraan memori hasil, waktu tunggu koneksi, dan SQL yang
+# dijalankan beserta parameternya. Pemanggilan yang lebih lama dari
+# BATAS_QUERY_LAMBAT_MS bisa diberi rencana EXPLAIN (IKLIM_EXPLAIN_LAMBAT=1
+# atau atur_explain_lambat) yang dijalankan di thread pool, jadi tidak
+# menambah waktu halaman.
+
+BATAS_RIWAYAT_QUERY = int(os.environ.get('IKLIM_RIWAYAT_QUERY', 1000))
+BATAS_QUERY_LAMBAT_MS = float(os.environ.get('IKLIM_QUERY_LAMBAT_MS', 500))
+# SQL yang disimpan per pemanggilan (sisanya hanya dihitung)
+BATAS_SQL_PER_REKAMAN = 20
+
+_pengaturan_instrumentasi = {'explain_lambat': os.environ.get('IKLIM_EXPLAIN_LAMBAT', '0') == '1'}
+_riwayat_query = deque(maxlen=BATAS_RIWAYAT_QUERY)
+_kunci_riwayat = threading.Lock()
+# Tumpukan rekaman per thread: SQL dan waktu tunggu masuk ke pemanggilan terdalam
+_rekaman_aktif = threading.local()
+
+def _rekaman_sekarang():
+    tumpukan = getattr(_rekaman_aktif, 'tumpukan', None)
+    return tumpukan[-1] if tumpukan else None
+
+def _tambah_tunggu(detik):
+    rekaman = _rekaman_sekarang()
+    if rekaman is not None:
+        rekaman['tunggu_ms'] += detik * 1000
+
+def _catat_sql(query, parameter, detik):
+    rekaman = _rekaman_sekarang()
+    if rekaman is None:
+        return
+    rekaman['jumlah_sql'] += 1
+    if len(rekaman['sql']) < BATAS_SQL_PER_REKAMAN:
+        rekaman['sql'].append({'sql': query, 'parameter': list(parameter) if parameter else [],
+                               'ms': detik * 1000})
+
+def jalankan_sql(kursor, query, parameter=None):
+    """kursor.execute yang juga dicatat ke rekaman ambil_* yang sedang berjalan"""
+    mulai = time.perf_counter()
+    try:
+        if parameter is None:
+            kursor.execute(query)
+        else:
+            kursor.execute(query, parameter)
+    finally:
+        _catat_sql(query, parameter, time.perf_counter() - mulai)
+
+def laporkan_error(pesan, e, batas=200):
+    """Tampilkan error ke pengguna (dipotong) dan simpan teks lengkapnya di rekaman query"""
+    rekaman = _rekaman_sekarang()
+    if rekaman is not None:
+        rekaman['error'] = f"{type(e).__name__}: {e}"
+    st.error(f"{pesan}: {str(e)[:batas] if batas else e}")
+
+def _ukuran_memori_hasil(hasil):
+    """
+    Jumlah baris dan perkiraan memori hasil sebagai DataFrame pandas (byte;
+    None jika bukan DataFrame). Ini bukan byte yang dikirim server: protokol
+    MySQL dan DuckDB mengirim bentuk lain, dan hasil dari cache tidak
+    melewati jaringan sama sekali.
+    """
+    if isinstance(hasil, dict) and isinstance(hasil.get('data'), pd.DataFrame):
+        hasil = hasil['data']
+    if isinstance(hasil, pd.DataFrame):
+        ukuran = int(hasil.memory_usage(index=False).sum())
+        # Isi kolom object (mis. tanggal) diperkirakan dari 1000 baris pertama:
+        # deep=True untuk seluruh hasil bisa lebih lama dari query yang dicatat
+        objek = hasil.select_dtypes('object')
+        if len(objek.columns) and len(objek):
+            contoh = objek.iloc[:1000]
+            isi = contoh.memory_usage(index=False, deep=True).sum() - contoh.memory_usage(index=False).sum()
+            ukuran += int(isi * len(objek) / len(contoh))
+        return len(hasil), ukuran
+    if isinstance(hasil, list):
+        return len(hasil), None
+    return (0 if hasil is None else 1), None
+
+def jelaskan_sql(query, parameter=None):
+    """
+    Rencana eksekusi satu query untuk backend yang aktif.
+    
+    Returns:
+        list: Baris EXPLAIN sebagai dict.
+    """
+    db = KonektorDatabase()
+    koneksi = db.pinjam_koneksi()
+    try:
+        kursor = koneksi.cursor()
+        if db.backend == 'mysql':
+            hasil = jelaskan_query(kursor, query, parameter or ())
+        else:
+            kursor.execute("EXPLAIN " + query, parameter)
+            kolom = [d[0] for d in kursor.description]
+            hasil = [dict(zip(kolom, baris)) for baris in kursor.fetchall()]
+        kursor.close()
+        return hasil
+    finally:
+        db.tutup_koneksi(koneksi)
+
+def _isi_explain(rekaman):
+    """EXPLAIN untuk SELECT paling lambat dalam rekaman (dijalankan di thread pool)"""
+    daftar = [q for q in rekaman['sql'] if q['sql'].lstrip()[:6].upper() in ('SELECT', 'WITH')]
+    if not daftar:
+        return
+    terlama = max(daftar, key=lambda q: q['ms'])
+    try:
+        rencana = jelaskan_sql(terlama['sql'], terlama['parameter'])
+        rekaman['explain'] = {'sql': terlama['sql'], 'rencana': rencana}
+    except Error as e:
+        rekaman['explain'] = {'sql': terlama['sql'], 'error': str(e)}
+
+def _simpan_rekaman(rekaman):
+    with _kunci_riwayat:
+        _riwayat_query.append(rekaman)
+    if (rekaman['ms'] >= BATAS_QUERY_LAMBAT_MS and not rekaman['cache'] and rekaman['sql']
+            and _pengaturan_instrumentasi['explain_lambat']):
+        ambil_pelaksana().submit(_isi_explain, rekaman)
+
+def _rekaman_baru(fungsi):
+    return {'fungsi': fungsi.__name__, 'waktu': datetime.now(), 'ms': 0.0, 'tunggu_ms': 0.0,
+            'baris': None, 'memori_byte': None, 'cache': False, 'jumlah_sql': 0, 'sql': [],
+            'error': None, 'explain': None}
+
+@contextmanager
+def _rekam(rekaman):
+    """Jadikan rekaman aktif di thread ini dan tambahkan waktu yang dihabiskan di dalamnya"""
+    tumpukan = _rekaman_aktif.__dict__.setdefault('tumpukan', [])
+    tumpukan.append(rekaman)
+    mulai = time.perf_counter()
+    try:
+        yield rekaman
+    except Exception as e:
+        rekaman['error'] = rekaman['error'] or f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        rekaman['ms'] += (time.perf_counter() - mulai) * 1000
+        tumpukan.pop()
+
+def instrumentasi(fungsi):
+    """
+    Dekorator pencatat pemanggilan ambil_* ke riwayat query. Untuk fungsi
+    generator, waktu yang dicatat hanya waktu di dalam generator (bukan
+    waktu pemakai memproses setiap chunk) dan baris/memori dijumlahkan.
+    """
+    if inspect.isgeneratorfunction(fungsi):
+        @functools.wraps(fungsi)
+        def pembungkus_generator(*args, **kwargs):
+            rekaman = _rekaman_baru(fungsi)
+            rekaman['baris'] = rekaman['memori_byte'] = 0
+            generator = None
+            try:
+                with _rekam(rekaman):
+                    generator = fungsi(*args, **kwargs)
+                while True:
+                    with _rekam(rekaman):
+                        chunk = next(generator, None)
+                    if chunk is None:
+                        return
+                    baris, ukuran = _ukuran_memori_hasil(chunk)
+                    rekaman['baris'] += baris
+                    rekaman['memori_byte'] += ukuran or 0
+                    yield chunk
+            finally:
+                # Pemakai berhenti lebih awal: tutup generator supaya koneksinya kembali ke pool
+                if generator is not None:
+                    generator.close()
+                _simpan_rekaman(rekaman)
+        return pembungkus_generator
+    
+    @functools.wraps(fungsi)
+    def pembungkus(*args, **kwargs):
+        rekaman = _rekaman_baru(fungsi)
+        try:
+            with _rekam(rekaman):
+                hasil = fungsi(*args, **kwargs)
+        finally:
+            _simpan_rekaman(rekaman)
+        rekaman['baris'], rekaman['memori_byte'] = _ukuran_memori_hasil(hasil)
+        return hasil
+    return pembungkus
+
+def atur_explain_lambat(aktif=None):
+    """
+    Nyalakan/matikan EXPLAIN otomatis untuk pemanggilan lambat (berlaku
+    untuk seluruh proses). aktif=None hanya membaca pengaturan.
+    
+    Returns:
+        bool: Pengaturan yang berlaku.
+    """
+    if aktif is not None:
+        _pengaturan_instrumentasi['explain_lambat'] = bool(aktif)
+    return _pengaturan_instrumentasi['explain_lambat']
+
+def ambil_riwayat_query(hanya_lambat=False, batas=None):
+    """
+    Rekaman pemanggilan ambil_* terbaru (terbaru dulu).
+    
+    Args:
+        hanya_lambat (bool): Hanya pemanggilan >= BATAS_QUERY_LAMBAT_MS.
+        batas (int): Jumlah rekaman maksimal (None = semua di ring buffer).
+    
+    Returns:
+        list: Dict fungsi, waktu, ms, tunggu_ms, baris, memori_byte, cache,
+              jumlah_sql, sql (list dict sql/parameter/ms), error, explain.
+    """
+    with _kunci_riwayat:
+        riwayat = list(_riwayat_query)
+    riwayat.reverse()
+    if hanya_lambat:
+        riwayat = [r for r in riwayat if r['ms'] >= BATAS_QUERY_LAMBAT_MS]
+    return riwayat[:batas] if batas else riwayat
+
+def ringkasan_latensi():
+    """
+    Persentil latensi per fungsi dari riwayat query.
+    
+    Returns:
+        DataFrame: fungsi, panggilan, p50_ms, p95_ms, p99_ms, maks_ms,
+                   rata_tunggu_ms, rata_baris, memori_mb (perkiraan memori
+                   pandas, bukan byte jaringan), rasio_cache, error
+                   (terlambat dulu menurut p95).
+    """
+    riwayat = ambil_riwayat_query()
+    if not riwayat:
+        return pd.DataFrame()
+    df = pd.DataFrame.from_records(riwayat, columns=['fungsi', 'ms', 'tunggu_ms', 'baris',
+                                                     'memori_byte', 'cache', 'error'])
+    df['error'] = df['error'].notna()
+    df[['baris', 'memori_byte']] = df[['baris', 'memori_byte']].astype('float64')
+    kelompok = df.groupby('fungsi')
+    hasil = pd.DataFrame({
+        'panggilan': kelompok.size(),
+        'p50_ms': kelompok['ms'].quantile(0.50),
+        'p95_ms': kelompok['ms'].quantile(0.95),
+        'p99_ms': kelompok['ms'].quantile(0.99),
+        'maks_ms': kelompok['ms'].max(),
+        'rata_tunggu_ms': kelompok['tunggu_ms'].mean(),
+        'rata_baris': kelompok['baris'].mean(),
+        'memori_mb': kelompok['memori_byte'].sum() / (1024 * 1024),
+        'rasio_cache': kelompok['cache'].mean(),
+        'error': kelompok['error'].sum(),
+    })
+    return hasil.sort_values('p95_ms', ascending=False).reset_index()
+
+def baca_sql(query, koneksi, parameter=None):
+    """pd.read_sql untuk kedua backend (DuckDB membaca hasil langsung sebagai kolom)"""
+    mulai = time.perf_counter()
+    try:
+        if isinstance(koneksi, backend.KoneksiDuckDB):
+            return koneksi.baca_dataframe(query, parameter)
+        return pd.read_sql(query, koneksi, params=parameter)
+    finally:
+        _catat_sql(query, parameter, time.perf_counter() - mulai)
+
+@instrumentasi
+def ambil_satu_baris(query, parameter=()):
+    """Jalankan satu query dengan koneksi pinjaman sendiri dan kembalikan baris pertama"""
+    db = KonektorDatabase()
+    koneksi = db.pinjam_koneksi()
+    try:
+        kursor = koneksi.cursor()
+        jalankan_sql(kursor, query, parameter)
+        baris = kursor.fetchone()
+        kursor.close()
+        return baris
+    finally:
+        db.tutup_koneksi(koneksi)
+
+# ===== QUERY OBSERVASI_CUACA =====
+# Disimpan sebagai konstanta supaya rencana eksekusinya bisa diperiksa
+# dengan EXPLAIN (lihat daftar_query_periksa dan skema.py)
+
+QUERY_TOTAL_OBSERVASI = "SELECT COUNT(*) FROM observasi_cuaca"
+
+QUERY_RENTANG_TANGGAL = "SELECT MIN(tanggal), MAX(tanggal) FROM observasi_cuaca"
+
+# Batas tanggal dikirim sebagai parameter (bukan DATE_SUB(NOW(), ...)) supaya
+# MySQL bisa memangkas partisi tahunan saat query dioptimasi
+QUERY_TERBARU_30_HARI = "SELECT COUNT(*) FROM observasi_cuaca WHERE tanggal >= %s"
+
+# Katalog metadata (skema.segarkan_katalog) plus jumlah 30 hari terakhir
+# (bergantung tanggal hari ini) dalam satu round trip
+QUERY_KATALOG = """
+SELECT kunci, nilai_angka, nilai_tanggal FROM katalog_data
+UNION ALL
+SELECT 'terbaru_30_hari', COUNT(*), NULL FROM observasi_cuaca WHERE tanggal >= %s
+"""
+
+QUERY_DATA_CONTOH = """
+SELECT * FROM observasi_cuaca 
+ORDER BY tanggal DESC 
+LIMIT %s
+"""
+
+def query_tahun_tersedia(tahun_awal, tahun_akhir):
+    """
+    Satu subquery LIMIT 1 per tahun yang digabung dengan UNION ALL. Setiap
+    subquery hanya menyentuh partisi tahunnya dan berhenti di baris pertama,
+    jadi tidak perlu memindai seluruh tabel seperti SELECT DISTINCT YEAR(...).
+    
+    Returns:
+        tuple: (query SQL, list parameter)
+    """
+    bagian = []
+    parameter = []
+    for tahun in range(tahun_akhir, tahun_awal - 1, -1):
+        bagian.append(f"(SELECT {int(tahun)} AS tahun FROM observasi_cuaca "
+                      f"WHERE tanggal BETWEEN %s AND %s LIMIT 1)")
+        parameter += [f"{tahun}-01-01", f"{tahun}-12-31"]
+    query = f"SELECT tahun FROM ({' UNION ALL '.join(bagian)}) t ORDER BY tahun DESC"
+    return query, parameter
+
+QUERY_STATISTIK_STASIUN = """
+SELECT 
+    COUNT(*) as total_hari,
+    AVG(suhu_rata_rata) as suhu_rata,
+    MIN(suhu_rata_rata) as suhu_minimum,
+    MAX(suhu_rata_rata) as suhu_maksimum,
+    SUM(curah_hujan) as total_hujan,
+    AVG(kelembaban_rata_rata) as kelembaban_rata,
+    AVG(kecepatan_angin_rata_rata) as angin_rata
+FROM observasi_cuaca 
+WHERE id_stasiun = %s
+"""
+
+# ===== FUNGSI UTAMA BAHASA INDONESIA =====
+
+# Kolom observasi_cuaca yang bisa diminta dari ambil_data_cuaca: ekspresi SELECT
+KOLOM_CUACA = {
+    'id_observasi': 'oc.id_observasi',
+    'id_stasiun': 'oc.id_stasiun',
+    'tanggal': 'oc.tanggal',
+    'suhu_minimum': 'oc.suhu_minimum',
+    'suhu_maksimum': 'oc.suhu_maksimum',
+    'suhu_rata_rata': 'oc.suhu_rata_rata',
+    'kelembaban_rata_rata': 'oc.kelembaban_rata_rata',
+    'curah_hujan': 'oc.curah_hujan',
+    'durasi_sinar_matahari': 'oc.durasi_sinar_matahari',
+    'kecepatan_angin_maksimum': 'oc.kecepatan_angin_maksimum',
+    'arah_angin_maksimum': 'oc.arah_angin_maksimum',
+    'kecepatan_angin_rata_rata': 'oc.kecepatan_angin_rata_rata',
+    'kode_arah_angin': 'oc.kode_arah_angin',
+}
+
+# Kolom dimensi: tidak di-JOIN di SQL, tetapi ditempel dari cache dimensi
+# (ambil_dimensi) lewat kunci fakta. Urutan default = KOLOM_CUACA lalu ini.
+KOLOM_DIMENSI = {
+    'nama_stasiun': 'id_stasiun',
+    'lintang': 'id_stasiun',
+    'bujur': 'id_stasiun',
+    'nama_wilayah': 'id_stasiun',
+    'nama_provinsi': 'id_stasiun',
+    'nama_arah_angin': 'kode_arah_angin',
+}
+
+def pisahkan_kolom(kolom=None):
+    """
+    Pisahkan kolom yang diminta menjadi kolom fakta (di-SELECT dari
+    observasi_cuaca, termasuk kunci untuk kolom dimensi) dan kolom dimensi.
+    
+    Returns:
+        tuple: (list kolom fakta, list kolom dimensi, list kolom yang diminta)
+    """
+    if kolom is None:
+        kolom = list(KOLOM_CUACA) + list(KOLOM_DIMENSI)
+    kolom = list(kolom)
+    tidak_dikenal = [k for k in kolom if k not in KOLOM_CUACA and k not in KOLOM_DIMENSI]
+    if tidak_dikenal:
+        raise ValueError(f"Kolom tidak dikenal: {', '.join(tidak_dikenal)}")
+    
+    fakta = [k for k in kolom if k in KOLOM_CUACA]
+    dimensi = [k for k in kolom if k in KOLOM_DIMENSI]
+    for k in dimensi:
+        if KOLOM_DIMENSI[k] not in fakta:
+            fakta.append(KOLOM_DIMENSI[k])
+    return fakta, dimensi, kolom
+
+# ===== CACHE DIMENSI =====
+# stasiun/wilayah/provinsi/arah_angin hanya ratusan baris dan jarang berubah,
+# jadi dimuat sekali per proses dan ditempel ke data fakta di memori
+# (lookup tervektorisasi berkunci integer) alih-alih di-JOIN di setiap query.
+# Cache dimuat ulang jika versi_import di katalog_data berubah; versi itu
+# dicek paling sering sekali per BATAS_CEK_DIMENSI detik.
+
+BATAS_CEK_DIMENSI = float(os.environ.get('IKLIM_CEK_DIMENSI', 60))
+
+QUERY_VERSI_IMPORT = "SELECT nilai_angka FROM katalog_data WHERE kunci = 'versi_import'"
+
+QUERY_DIMENSI_STASIUN = """
+SELECT s.id_stasiun, s.nama_stasiun, s.lintang, s.bujur, s.id_wilayah,
+       w.nama_wilayah, w.id_provinsi, p.nama_provinsi
+FROM stasiun s
+LEFT JOIN wilayah w ON s.id_wilayah = w.id_wilayah
+LEFT JOIN provinsi p ON w.id_provinsi = p.id_provinsi
+"""
+
+QUERY_DIMENSI_ARAH = "SELECT kode_arah, nama_arah FROM arah_angin"
+
+_dimensi = {'versi': None, 'dicek': 0.0, 'stasiun': None, 'arah': None}
+_kunci_dimensi = threading.Lock()
+# Dimensi pengganti per thread (lihat dimensi_dari): query builder memakai
+# dimensi database lain tanpa mengubah cache bersama
+_dimensi_aktif = threading.local()
+
+def _cache_dimensi_segar():
+    return (_dimensi['stasiun'] is not None
+            and time.monotonic() - _dimensi['dicek'] < BATAS_CEK_DIMENSI)
+
+def baca_versi_import(kursor):
+    """versi_import di katalog_data, atau None jika belum ada"""
+    try:
+        jalankan_sql(kursor, QUERY_VERSI_IMPORT)
+        baris = kursor.fetchone()
+        return int(baris[0]) if baris and baris[0] is not None else None
+    except backend.ProgrammingError:
+        return None  # katalog_data belum dibuat (migrasi lama)
+
+def muat_dimensi(kursor):
+    """
+    Muat tabel dimensi lewat kursor yang diberikan.
+    
+    Returns:
+        dict: 'stasiun' dan 'arah' dengan bentuk yang sama seperti ambil_dimensi().
+    """
+    jalankan_sql(kursor, QUERY_DIMENSI_STASIUN)
+    stasiun = pd.DataFrame.from_records(kursor.fetchall(),
+                                        columns=[d[0] for d in kursor.description])
+    jalankan_sql(kursor, QUERY_DIMENSI_ARAH)
+    arah = kursor.fetchall()
+    
+    stasiun = stasiun.astype({
+        'id_stasiun': 'int64', 'lintang': 'float64', 'bujur': 'float64',
+        'id_wilayah': 'Int64', 'id_provinsi': 'Int64',
+        'nama_stasiun': 'category', 'nama_wilayah': 'category',
+        'nama_provinsi': 'category',
+    }).set_index('id_stasiun')
+    return {'stasiun': stasiun,
+            'arah': pd.Series([nama for _, nama in arah],
+                              index=pd.Index([kode for kode, _ in arah], dtype='string'),
+                              dtype='category', name='nama_arah_angin')}
+
+def ambil_dimensi(paksa=False):
+    """
+    Cache dimensi bersama. Dimuat saat pertama kali dibutuhkan dan dimuat
+    ulang jika versi_import berubah (atau paksa=True). Di dalam
+    dimensi_dari(koneksi), dimensi database itu yang dikembalikan.
+    
+    Returns:
+        dict: 'stasiun' (DataFrame ber-index id_stasiun; kolom nama bertipe
+              category), 'arah' (Series nama_arah ber-index kode_arah),
+              'versi' (versi_import saat dimuat).
+    """
+    aktif = getattr(_dimensi_aktif, 'dimensi', None)
+    if aktif is not None:
+        return aktif
+    
+    if not paksa and _cache_dimensi_segar():
+        return _dimensi
+    
+    with _kunci_dimensi:
+        if not paksa and _cache_dimensi_segar():
+            return _dimensi
+        
+        db = KonektorDatabase()
+        koneksi = db.pinjam_koneksi()
+        try:
+            kursor = koneksi.cursor()
+            versi = baca_versi_import(kursor)
+            if paksa or _dimensi['stasiun'] is None or versi != _dimensi['versi']:
+                _dimensi.update(muat_dimensi(kursor))
+                _dimensi['versi'] = versi
+            kursor.close()
+        finally:
+            db.tutup_koneksi(koneksi)
+        
+        _dimensi['dicek'] = time.monotonic()
+        return _dimensi
+
+@contextmanager
+def dimensi_dari(koneksi=None):
+    """
+    Pakai dimensi dari koneksi lain (mis. database tujuan skema.py --periksa)
+    di thread ini, sehingga filter_wilayah dan query builder lain tidak
+    membaca cache database default. koneksi=None = cache bersama biasa.
+    
+    Yields:
+        dict: Dimensi yang sedang aktif (bentuk sama seperti ambil_dimensi()).
+    """
+    if koneksi is None:
+        yield ambil_dimensi()
+        return
+    
+    kursor = koneksi.cursor()
+    try:
+        dimensi = {'versi': baca_versi_import(kursor), **muat_dimensi(kursor)}
+    finally:
+        kursor.close()
+    sebelumnya = getattr(_dimensi_aktif, 'dimensi', None)
+    _dimensi_aktif.dimensi = dimensi
+    try:
+        yield dimensi
+    finally:
+        _dimensi_aktif.dimensi = sebelumnya
+
+def stasiun_di_wilayah(id_wilayah):
+    """Daftar id_stasiun dalam satu wilayah, dari cache dimensi"""
+    stasiun = ambil_dimensi()['stasiun']
+    return [int(i) for i in stasiun.index[stasiun['id_wilayah'] == int(id_wilayah)]]
+
+def filter_wilayah(id_wilayah, fakta='oc'):
+    """
+    Filter wilayah sebagai IN (...) atas id_stasiun tabel fakta, sehingga
+    query tidak perlu JOIN stasiun hanya untuk menyaring.
+    
+    Returns:
+        tuple: (string kondisi diawali ' AND ...', list parameter)
+    """
+    daftar = stasiun_di_wilayah(id_wilayah)
+    if not daftar:
+        return " AND 1=0", []
+    penanda = ", ".join(["%s"] * len(daftar))
+    return f" AND {fakta}.id_stasiun IN ({penanda})", daftar
+
+def lampirkan_dimensi(df, kolom=None, dimensi=None):
+    """
+    Tempelkan kolom dimensi (KOLOM_DIMENSI) ke hasil query fakta.
+    Baris dengan id_stasiun yang tidak ada di tabel stasiun dibuang (sama
+    seperti JOIN stasiun sebelumnya); arah angin yang tidak dikenal menjadi
+    kosong (sama seperti LEFT JOIN arah_angin).
+    
+    Args:
+        df (DataFrame): Hasil query dari pisahkan_kolom(kolom).
+        kolom (list): Kolom yang diminta (None = semua kolom).
+        dimensi (dict): Hasil ambil_dimensi()/siapkan_dimensi(); None = ambil
+            dari cache (jangan sambil memegang koneksi pool).
+    
+    Returns:
+        DataFrame: Hanya kolom yang diminta, dalam urutan permintaan.
+    """
+    _, kolom_dimensi, kolom = pisahkan_kolom(kolom)
+    if not kolom_dimensi or df.empty:
+        for k in kolom_dimensi:
+            df[k] = pd.Series(dtype='object')
+        return df[kolom]
+    
+    dimensi = dimensi or ambil_dimensi()
+    
+    # Posisi kunci di index dimensi (-1 = tidak ada) lalu take tervektorisasi;
+    # kolom category tetap category (hanya kode integernya yang disalin)
+    kolom_stasiun = [k for k in kolom_dimensi if KOLOM_DIMENSI[k] == 'id_stasiun']
+    if kolom_stasiun:
+        stasiun = dimensi['stasiun']
+        posisi = stasiun.index.get_indexer(df['id_stasiun'].to_numpy(dtype='int64', na_value=-1))
+        ada = posisi >= 0
+        if not ada.all():
+            df = df[ada].reset_index(drop=True)
+            posisi = posisi[ada]
+        for k in kolom_stasiun:
+            df[k] = stasiun[k].array.take(posisi)
+    
+    if 'nama_arah_angin' in kolom_dimensi:
+        arah = dimensi['arah']
+        posisi = arah.index.get_indexer(df['kode_arah_angin'].astype('string'))
+        df['nama_arah_angin'] = arah.array.take(posisi, allow_fill=True)
+    
+    return df[kolom]
+
+def siapkan_dimensi(kolom=None):
+    """
+    Cache dimensi untuk lampirkan_dimensi, diambil SEBELUM meminjam koneksi.
+    ambil_dimensi meminjam koneksi sendiri saat cache kedaluwarsa; jika itu
+    terjadi sambil memegang koneksi, semua thread jalankan_bersamaan bisa
+    saling menunggu pool yang sudah habis. Query builder (filter_wilayah)
+    juga memakai cache ini, jadi susun query sebelum meminjam koneksi.
+    
+    Returns:
+        dict: Hasil ambil_dimensi(), atau None jika kolom dimensi tidak diminta.
+    """
+    return ambil_dimensi() if pisahkan_kolom(kolom)[1] else None
+
+# ===== CACHE HASIL =====
+# Hasil fungsi ambil_* disimpan di disk sebagai pickle terkompresi zlib,
+# berkunci nama fungsi + parameter yang dinormalisasi. Data hanya berubah
+# saat importer menaikkan versi_import, jadi versi itu (bukan TTL) yang
+# membatalkan cache: hasil tetap berlaku lintas restart, dan folder versi
+# lama dihapus begitu versi baru terlihat (paling lambat BATAS_CEK_DIMENSI
+# detik setelah import selesai).
+
+DIREKTORI_CACHE = os.environ.get(
+    'IKLIM_DIREKTORI_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cache'))
+CACHE_HASIL_AKTIF = os.environ.get('IKLIM_CACHE_HASIL', '1') != '0'
+BATAS_CACHE_MB = float(os.environ.get('IKLIM_BATAS_CACHE_MB', 1024))
+
+# Naikkan jika bentuk hasil ambil_* berubah, supaya cache lama tidak dipakai
+FORMAT_CACHE = 1
+
+_statistik_cache = {'kena': 0, 'luput': 0, 'lewati': 0, 'tulis': 0, 'gagal': 0}
+_kunci_cache = threading.Lock()
+_folder_versi = set()
+
+def versi_data():
+    """
+    versi_import saat ini dari cache dimensi (dicek paling sering sekali
+    per BATAS_CEK_DIMENSI detik).
+    
+    Returns:
+        int: versi_import, atau None jika database/katalog tidak terjangkau.
+    """
+    try:
+        return ambil_dimensi()['versi']
+    except Error:
+        return None
+
+def _normalkan(nilai):
+    """Bentuk kanonik parameter: '2020-01-01', date(2020, 1, 1), dan datetime tengah malam sama"""
+    if isinstance(nilai, datetime):
+        return nilai.date().isoformat() if nilai.time() == datetime.min.time() else nilai.isoformat()
+    if isinstance(nilai, date):
+        return nilai.isoformat()
+    if isinstance(nilai, dict):
+        return tuple(sorted((str(k), _normalkan(v)) for k, v in nilai.items()))
+    if isinstance(nilai, (set, frozenset)):
+        return tuple(sorted(_normalkan(v) for v in nilai))
+    if isinstance(nilai, (list, tuple)):
+        return tuple(_normalkan(v) for v in nilai)
+    if hasattr(nilai, 'item'):  # skalar numpy
+        return nilai.item()
+    return nilai
+
+def _direktori_versi(versi):
+    """Folder cache untuk backend/database dan versi ini; folder versi lain dihapus"""
+    if backend.BACKEND == 'duckdb':
+        sumber = os.path.splitext(os.path.basename(backend.FILE_DUCKDB))[0]
+    else:
+        sumber = f"{KONFIG_DB['host']}_{NAMA_DATABASE}"
+    induk = os.path.join(DIREKTORI_CACHE, f"{backend.BACKEND}_{sumber}")
+    direktori = os.path.join(induk, f"v{versi}")
+    if direktori not in _folder_versi:
+        os.makedirs(direktori, exist_ok=True)
+        for nama in os.listdir(induk):
+            if nama != f"v{versi}":
+                shutil.rmtree(os.path.join(induk, nama), ignore_errors=True)
+        _folder_versi.add(direktori)
+    return direktori
+
+def _hasil_kosong(hasil):
+    # ambil_* mengembalikan hasil kosong (atau 0) saat query gagal; tidak disimpan
+    if isinstance(hasil, pd.DataFrame):
+        return hasil.empty
+    if isinstance(hasil, dict) and isinstance(hasil.get('data'), pd.DataFrame):
+        return hasil['data'].empty
+    return not hasil
+
+def _catat_cache(kejadian):
+    with _kunci_cache:
+        _statistik_cache[kejadian] += 1
+
+def _pangkas_cache(direktori):
+    """Hapus file yang paling lama tidak dipakai jika folder melebihi BATAS_CACHE_MB"""
+    file = []
+    for entri in os.scandir(direktori):
+        if entri.is_file():
+            info = entri.stat()
+            file.append((info.st_mtime, info.st_size, entri.path))
+    total = sum(ukuran for _, ukuran, _ in file)
+    batas = BATAS_CACHE_MB * 1024 * 1024
+    for _, ukuran, path in sorted(file):
+        if total <= batas:
+            break
+        try:
+            os.remove(path)
+            total -= ukuran
+        except OSError:
+            pass
+
+def cache_hasil(fungsi=None, per_hari=False):
+    """
+    Dekorator cache hasil di disk untuk fungsi ambil_*.
+    
+    Args:
+        per_hari (bool): Hasil juga bergantung pada tanggal hari ini
+            (mis. jumlah data 30 hari terakhir), jadi tanggal ikut jadi kunci.
+    
+    Fungsi asli tetap bisa dipanggil lewat atribut tanpa_cache.
+    """
+    if fungsi is None:
+        return functools.partial(cache_hasil, per_hari=per_hari)
+    tanda = inspect.signature(fungsi)
+    
+    @functools.wraps(fungsi)
+    def pembungkus(*args, **kwargs):
+        versi = versi_data() if CACHE_HASIL_AKTIF else None
+        if versi is None:
+            _catat_cache('lewati')
+            return fungsi(*args, **kwargs)
+        
+        argumen = tanda.bind(*args, **kwargs)
+        argumen.apply_defaults()
+        kunci = (FORMAT_CACHE, fungsi.__name__, _normalkan(argumen.arguments),
+                 date.today().isoformat() if per_hari else None)
+        sidik = hashlib.sha1(repr(kunci).encode('utf-8')).hexdigest()
+        
+        try:
+            path = os.path.join(_direktori_versi(versi), f"{fungsi.__name__}_{sidik}.pkl.z")
+        except OSError:
+            # Folder cache tidak bisa dibuat (mis. tidak ada izin tulis): tanpa cache
+            _catat_cache('gagal')
+            return fungsi(*args, **kwargs)
+        
+        try:
+            with open(path, 'rb') as berkas:
+                hasil = pickle.loads(zlib.decompress(berkas.read()))
+            os.utime(path)  # tanda baru dipakai untuk _pangkas_cache
+            _catat_cache('kena')
+            rekaman = _rekaman_sekarang()
+            if rekaman is not None:
+                rekaman['cache'] = True
+            return hasil
+        except FileNotFoundError:
+            _catat_cache('luput')
+        except (OSError, EOFError, ValueError, zlib.error, pickle.UnpicklingError):
+            _catat_cache('gagal')  # file rusak/tidak terbaca: hitung ulang dan timpa
+        
+        hasil = fungsi(*args, **kwargs)
+        if _hasil_kosong(hasil):
+            return hasil
+        try:
+            # Tulis ke file sementara lalu ganti, supaya pembaca lain tidak
+            # pernah melihat file setengah jadi
+            sementara = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(sementara, 'wb') as berkas:
+                berkas.write(zlib.compress(pickle.dumps(hasil, protocol=pickle.HIGHEST_PROTOCOL)))
+            os.replace(sementara, path)
+            _catat_cache('tulis')
+            _pangkas_cache(os.path.dirname(path))
+        except (OSError, pickle.PicklingError):
+            _catat_cache('gagal')
+        return hasil
+    
+    pembungkus.tanpa_cache = fungsi
+    return pembungkus
+
+def ambil_statistik_cache():
+    """Statistik cache hasil: kena/luput per proses, jumlah dan ukuran file versi aktif"""
+    with _kunci_cache:
+        statistik = dict(_statistik_cache)
+    dicari = statistik['kena'] + statistik['luput']
+    statistik['rasio_kena'] = statistik['kena'] / dicari if dicari else 0.0
+    statistik['aktif'] = CACHE_HASIL_AKTIF
+    statistik['versi'] = versi_data() if CACHE_HASIL_AKTIF else None
+    statistik['file'] = 0
+    statistik['ukuran_mb'] = 0.0
+    if statistik['versi'] is not None:
+        try:
+            for entri in os.scandir(_direktori_versi(statistik['versi'])):
+                if entri.is_file():
+                    statistik['file'] += 1
+                    statistik['ukuran_mb'] += entri.stat().st_size / (1024 * 1024)
+        except OSError:
+            pass
+    return statistik
+
+def filter_cuaca(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None, id_stasiun=None):
+    """
+    Kondisi WHERE bersama untuk query observasi_cuaca (alias oc).
+    Filter wilayah menjadi daftar id_stasiun dari cache dimensi, jadi
+    tidak perlu JOIN stasiun.
+    
+    Returns:
+        tuple: (string kondisi diawali ' AND ...', list parameter)
+    """
+    kondisi = ""
+    parameter = []
+    
+    # ===== FILTER TANGGAL YANG SUDAH DIPERBAIKI =====
+    if tanggal_mulai and tanggal_selesai:
+        # Jika kedua tanggal diberikan, gunakan BETWEEN
+        kondisi += " AND oc.tanggal BETWEEN %s AND %s"
+        parameter.append(tanggal_mulai)
+        parameter.append(tanggal_selesai)
+    elif tanggal_mulai:
+        # Jika hanya tanggal mulai, gunakan >=
+        kondisi += " AND oc.tanggal >= %s"
+        parameter.append(tanggal_mulai)
+    elif tanggal_selesai:
+        # Jika hanya tanggal selesai, gunakan <=
+        kondisi += " AND oc.tanggal <= %s"
+        parameter.append(tanggal_selesai)
+    # Jika tidak ada tanggal, ambil semua data
+    # ============================================
+    
+    if id_wilayah:
+        kondisi_wilayah, parameter_wilayah = filter_wilayah(id_wilayah)
+        kondisi += kondisi_wilayah
+        parameter += parameter_wilayah
+    
+    if id_stasiun:
+        kondisi += " AND oc.id_stasiun = %s"
+        parameter.append(id_stasiun)
+    
+    return kondisi, parameter
+
+# Semi-join ke stasiun: hanya baris yang stasiunnya ada di tabel stasiun
+SEMI_JOIN_STASIUN = " AND EXISTS (SELECT 1 FROM stasiun s WHERE s.id_stasiun = {fakta}.id_stasiun)"
+
+def filter_stasiun_dikenal(kolom=None):
+    """
+    Semi-join ke tabel stasiun jika kolom dimensi stasiun diminta.
+    lampirkan_dimensi membuang baris yang stasiunnya tidak dikenal; dengan
+    kondisi ini baris itu sudah dibuang di SQL, jadi LIMIT hanya menghitung
+    baris yang benar-benar dikembalikan.
+    
+    Returns:
+        str: Kondisi diawali ' AND ...', atau '' jika tidak perlu.
+    """
+    _, kolom_dimensi, _ = pisahkan_kolom(kolom)
+    if any(KOLOM_DIMENSI[k] == 'id_stasiun' for k in kolom_dimensi):
+        return SEMI_JOIN_STASIUN.format(fakta='oc')
+    return ""
+
+# JOIN untuk dimensi bernama di GROUP BY agregat/ringkasan. Setiap JOIN butuh
+# JOIN sebelumnya (wilayah lewat stasiun, provinsi lewat wilayah), jadi
+# dimensi cukup menyebut berapa JOIN pertama yang dipakai.
+JOIN_DIMENSI = (
+    "JOIN stasiun s ON {fakta}.id_stasiun = s.id_stasiun",
+    "LEFT JOIN wilayah w ON s.id_wilayah = w.id_wilayah",
+    "LEFT JOIN provinsi p ON w.id_provinsi = p.id_provinsi",
+)
+
+def klausa_join_dimensi(jumlah, fakta='oc'):
+    """Teks jumlah JOIN pertama dari JOIN_DIMENSI (fakta = alias tabel utama)"""
+    return "".join(f"\n    {j.format(fakta=fakta)}" for j in JOIN_DIMENSI[:jumlah])
+
+def query_data_cuaca(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None, id_stasiun=None,
+                     batas=10000, kolom=None):
+    """
+    Susun query ambil_data_cuaca beserta parameternya (dipakai juga oleh
+    pemeriksaan EXPLAIN di skema.py). Hanya kolom observasi_cuaca yang
+    dibutuhkan yang di-SELECT; kolom dimensi ditempel kemudian oleh
+    lampirkan_dimensi, jadi query tidak memakai JOIN.
+    
+    Args:
+        kolom (list): Nama kolom dari KOLOM_CUACA/KOLOM_DIMENSI (None = semua kolom).
+    
+    Returns:
+        tuple: (query SQL, list parameter)
+    """
+    kolom_fakta, _, _ = pisahkan_kolom(kolom)
+    kondisi, parameter = filter_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun)
+    kondisi += filter_stasiun_dikenal(kolom)
+    
+    # Query dengan nama tabel dan kolom Bahasa Indonesia
+    daftar_select = ",\n        ".join(KOLOM_CUACA[k] for k in kolom_fakta)
+    query = f"""
+    SELECT 
+        {daftar_select}
+    FROM observasi_cuaca oc
+    WHERE 1=1{kondisi}
+    """
+    
+    query += " ORDER BY oc.tanggal DESC"
+    # batas=None: tanpa LIMIT (dipakai ambil_data_cuaca_bertahap)
+    if batas is not None:
+        query += " LIMIT %s"
+        parameter.append(batas)
+    
+    return query, parameter
+
+@instrumentasi
+@cache_hasil
+def ambil_data_cuaca(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None, id_stasiun=None, batas=10000,
+                     kolom=None, pakai_arsip=False):
+    """
+    Ambil data observasi_cuaca dengan struktur BAHASA INDONESIA
+    SUDAH DIPERBAIKI: Mendukung filter rentang tanggal lengkap
+    
+    Args:
+        tanggal_mulai (str): Format 'YYYY-MM-DD'. Jika None, ambil semua.
+        tanggal_selesai (str): Format 'YYYY-MM-DD'. Jika None, ambil dari tanggal_mulai hingga data terbaru.
+        id_wilayah (int): Filter berdasarkan wilayah.
+        id_stasiun (int): Filter berdasarkan stasiun.
+        batas (int): Batas jumlah baris.
+        kolom (list): Kolom yang diambil (lihat KOLOM_CUACA dan KOLOM_DIMENSI);
+            None = semua kolom. Sedikit kolom berarti lebih sedikit byte.
+        pakai_arsip (bool): Baca tahun yang sudah lewat dari arsip Parquet
+            (arsip.py) jika arsipnya ada, berasal dari database ini, dan sesuai
+            versi_import; MySQL hanya ditanya untuk periode sesudahnya.
+            Backend DuckDB tidak memakai arsip.
+    
+    Returns:
+        DataFrame: Data cuaca yang telah difilter.
+    """
+    try:
+        sumber = arsip.sumber_mysql(NAMA_DATABASE) if backend.BACKEND == 'mysql' else None
+        data_arsip = arsip.ambil_arsip(ambil_dimensi()['versi'], sumber) if pakai_arsip else None
+    except Error:
+        data_arsip = None
+    if data_arsip is not None:
+        return _ambil_data_cuaca_berarsip(data_arsip, tanggal_mulai, tanggal_selesai, id_wilayah,
+                                          id_stasiun, batas, kolom)
+    
+    try:
+        query, parameter = query_data_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun,
+                                            batas, kolom)
+        dimensi = siapkan_dimensi(kolom)
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return pd.DataFrame()
+    
+    db = KonektorDatabase()
+    koneksi = db.buat_koneksi()
+    
+    if koneksi is None:
+        return pd.DataFrame()
+    
+    try:
+        # Eksekusi query
+        df = baca_sql(query, koneksi, parameter)
+        
+        return lampirkan_dimensi(df, kolom, dimensi)
+    
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return pd.DataFrame()
+    
+    finally:
+        db.tutup_koneksi(koneksi)
+
+def _ambil_data_cuaca_berarsip(data_arsip, tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun,
+                               batas, kolom):
+    """
+    ambil_data_cuaca dengan arsip Parquet: bagian terbaru dari MySQL, lalu
+    sisa batas diisi dari arsip (tetap urut tanggal terbaru dulu).
+    """
+    mulai = ke_tanggal(tanggal_mulai) if tanggal_mulai else None
+    selesai = ke_tanggal(tanggal_selesai) if tanggal_selesai else None
+    rentang_mysql, rentang_arsip = arsip.bagi_rentang_arsip(mulai, selesai, data_arsip['sampai_tahun'])
+    
+    bagian = []
+    try:
+        dimensi = siapkan_dimensi(kolom)
+        if rentang_mysql is not None:
+            query, parameter = query_data_cuaca(*rentang_mysql, id_wilayah, id_stasiun, batas,
+                                                kolom)
+            db = KonektorDatabase()
+            koneksi = db.buat_koneksi()
+            if koneksi is None:
+                return pd.DataFrame()
+            try:
+                bagian.append(baca_sql(query, koneksi, parameter))
+            finally:
+                db.tutup_koneksi(koneksi)
+        
+        sisa = None if batas is None else batas - sum(len(b) for b in bagian)
+        if rentang_arsip is not None and (sisa is None or sisa > 0):
+            kolom_fakta, _, _ = pisahkan_kolom(kolom)
+            daftar_stasiun = None
+            if id_stasiun:
+                daftar_stasiun = [id_stasiun]
+            elif id_wilayah:
+                daftar_stasiun = stasiun_di_wilayah(id_wilayah)
+            df_arsip = arsip.baca_arsip(data_arsip, *rentang_arsip, kolom_fakta,
+                                        id_stasiun=daftar_stasiun, batas=sisa)
+            if 'id_stasiun' in df_arsip.columns:
+                df_arsip['id_stasiun'] = df_arsip['id_stasiun'].astype('int64')
+            bagian.append(df_arsip)
+        
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return pd.DataFrame()
+    
+    except (OSError, ValueError):
+        # File arsip sedang ditulis ulang / rusak: baca semuanya dari MySQL
+        return ambil_data_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun, batas, kolom)
+    
+    if not bagian:
+        return pd.DataFrame()
+    bagian = [b for b in bagian if not b.empty] or bagian[:1]
+    df = pd.concat(bagian, ignore_index=True) if len(bagian) > 1 else bagian[0]
+    return lampirkan_dimensi(df, kolom, dimensi)
+
+# Tipe kolom hasil query cuaca; chunk streaming langsung bertipe benar
+# tanpa pandas menebak tipe (dan menyimpan object) di setiap chunk
+TIPE_KOLOM_CUACA = {
+    'id_observasi': 'Int64',
+    'id_stasiun': 'Int64',
+    'tanggal': 'datetime64[ns]',
+    'suhu_minimum': 'float64',
+    'suhu_maksimum': 'float64',
+    'suhu_rata_rata': 'float64',
+    'kelembaban_rata_rata': 'float64',
+    'curah_hujan': 'float64',
+    'durasi_sinar_matahari': 'float64',
+    'kecepatan_angin_maksimum': 'float64',
+    'arah_angin_maksimum': 'float64',
+    'kecepatan_angin_rata_rata': 'float64',
+    'kode_arah_angin': 'string',
+}
+
+def ke_dataframe_cuaca(baris, kolom):
+    """Ubah baris hasil fetchmany menjadi DataFrame dengan TIPE_KOLOM_CUACA"""
+    df = pd.DataFrame.from_records(baris, columns=kolom)
+    return df.astype({k: t for k, t in TIPE_KOLOM_CUACA.items() if k in df.columns})
+
+@instrumentasi
+def ambil_data_cuaca_bertahap(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None,
+                              id_stasiun=None, ukuran_chunk=50000, batas=None, kolom=None):
+    """
+    Versi streaming ambil_data_cuaca: hasil dibaca dengan cursor unbuffered
+    (baris dikirim server sedikit demi sedikit) dan di-yield per chunk,
+    sehingga agregat/ekspor bertahun-tahun data berjalan dengan memori tetap.
     
-    def __init__(self):
-        self.host = "localhost"
-        self.port = 3306
-        self.user = "root"
-        self.password = ""  # Kosong untuk Laragon
-        self.database = "iklim_indonesia"  # Database baru
+    Args:
+        tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun, kolom: Sama seperti ambil_data_cuaca.
+        ukuran_chunk (int): Jumlah baris per DataFrame yang di-yield.
+        batas (int): Batas jumlah baris total (None = tanpa LIMIT).
     
-    def buat_koneksi(self):
-        """Membuat koneksi ke database"""
-        try:
-            koneksi = mysql.connector.connect(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                password=self.password,
-                database=self.database
-            )
-            return koneksi
-        except Error as e:
-            st.error(f"❌ Error menghubungkan ke MySQL: {e}")
-            return None
+    Yields:
+        DataFrame: Chunk data cuaca bertipe (lihat TIPE_KOLOM_CUACA).
+    """
+    try:
+        query, parameter = query_data_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun,
+                                            batas, kolom)
+        dimensi = siapkan_dimensi(kolom)
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return
     
-    def uji_koneksi(self):
-        """Testing koneksi database"""
-        try:
-            koneksi = self.buat_koneksi()
-            if koneksi:
-                koneksi.close()
-                return True
-        except:
-            return False
+    db = KonektorDatabase()
+    koneksi = db.buat_koneksi()
+    
+    if koneksi is None:
+        return
+    
+    habis = False
+    try:
+        kursor = koneksi.cursor(buffered=False)
+        jalankan_sql(kursor, query, parameter)
+        kolom_hasil = [d[0] for d in kursor.description]
+        
+        while True:
+            baris = kursor.fetchmany(ukuran_chunk)
+            if not baris:
+                break
+            yield lampirkan_dimensi(ke_dataframe_cuaca(baris, kolom_hasil), kolom, dimensi)
+        habis = True
+        kursor.close()
+    
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+    
+    finally:
+        if not habis:
+            # Pemanggil berhenti sebelum hasil habis: sisa baris unbuffered
+            # tidak dibaca, jadi koneksinya diputus (server ikut menghentikan
+            # query) dan pool menyambung ulang saat koneksi dipinjam lagi
+            try:
+                koneksi.disconnect()
+            except Error:
+                pass
+        db.tutup_koneksi(koneksi)
 
-# ===== FUNGSI UTAMA BAHASA INDONESIA =====
+# Dimensi GROUP BY: (kolom SELECT beserta alias hasil, ekspresi GROUP BY, jumlah JOIN_DIMENSI)
+# hari memakai WEEKDAY (0 = Senin) agar sama dengan pandas dt.dayofweek
+DIMENSI_AGREGAT = {
+    'tahun': (['YEAR(oc.tanggal) AS tahun'], ['YEAR(oc.tanggal)'], 0),
+    'bulan': (['MONTH(oc.tanggal) AS bulan'], ['MONTH(oc.tanggal)'], 0),
+    'hari': (['WEEKDAY(oc.tanggal) AS hari'], ['WEEKDAY(oc.tanggal)'], 0),
+    'stasiun': (['oc.id_stasiun', 's.nama_stasiun'], ['oc.id_stasiun', 's.nama_stasiun'], 1),
+    'wilayah': (['s.id_wilayah', 'w.nama_wilayah'], ['s.id_wilayah', 'w.nama_wilayah'], 2),
+    'provinsi': (['w.id_provinsi', 'p.nama_provinsi'], ['w.id_provinsi', 'p.nama_provinsi'], 3),
+}
+
+# Fungsi agregat yang didukung (nama pandas -> fungsi SQL)
+FUNGSI_AGREGAT = {'sum': 'SUM', 'mean': 'AVG', 'min': 'MIN', 'max': 'MAX', 'count': 'COUNT'}
 
-def ambil_data_cuaca(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None, id_stasiun=None, batas=10000):
+# Kolom observasi_cuaca yang boleh diagregasi
+KOLOM_NUMERIK_CUACA = ['suhu_minimum', 'suhu_maksimum', 'suhu_rata_rata', 'kelembaban_rata_rata',
+                       'curah_hujan', 'durasi_sinar_matahari', 'kecepatan_angin_maksimum',
+                       'arah_angin_maksimum', 'kecepatan_angin_rata_rata']
+
+def query_agregat_cuaca(dimensi, metrik, tanggal_mulai=None, tanggal_selesai=None,
+                        id_wilayah=None, id_stasiun=None):
     """
-    Ambil data observasi_cuaca dengan struktur BAHASA INDONESIA
-    SUDAH DIPERBAIKI: Mendukung filter rentang tanggal lengkap
+    Susun satu query GROUP BY untuk ambil_agregat_cuaca.
+    
+    Returns:
+        tuple: (query SQL, list parameter)
+    """
+    tidak_dikenal = [d for d in dimensi if d not in DIMENSI_AGREGAT]
+    if tidak_dikenal:
+        raise ValueError(f"Dimensi tidak dikenal: {', '.join(tidak_dikenal)}")
+    
+    kondisi, parameter = filter_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun)
+    daftar_select = []
+    daftar_group = []
+    jumlah_join = 0
+    for d in dimensi:
+        kolom_select, kolom_group, join = DIMENSI_AGREGAT[d]
+        daftar_select += kolom_select
+        daftar_group += kolom_group
+        jumlah_join = max(jumlah_join, join)
+    
+    for kolom, daftar_fungsi in metrik.items():
+        if kolom not in KOLOM_NUMERIK_CUACA:
+            raise ValueError(f"Kolom tidak bisa diagregasi: {kolom}")
+        if isinstance(daftar_fungsi, str):
+            daftar_fungsi = [daftar_fungsi]
+        for fungsi in daftar_fungsi:
+            if fungsi not in FUNGSI_AGREGAT:
+                raise ValueError(f"Fungsi agregat tidak dikenal: {fungsi}")
+            daftar_select.append(f"{FUNGSI_AGREGAT[fungsi]}(oc.{kolom}) AS {kolom}_{fungsi}")
+    daftar_select.append("COUNT(*) AS jumlah_observasi")
+    
+    query = f"""
+    SELECT 
+        {", ".join(daftar_select)}
+    FROM observasi_cuaca oc{klausa_join_dimensi(jumlah_join)}
+    WHERE 1=1{kondisi}
+    """
+    if daftar_group:
+        query += f" GROUP BY {', '.join(daftar_group)} ORDER BY {', '.join(daftar_group)}"
+    return query, parameter
+
+@instrumentasi
+@cache_hasil
+def ambil_agregat_cuaca(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None, id_stasiun=None,
+                        dimensi=('bulan',), metrik=None):
+    """
+    Agregat data cuaca dihitung di MySQL dengan satu GROUP BY, sehingga
+    ringkasan mencakup seluruh periode (bukan sampel `batas` baris terbaru)
+    dan yang dikirim hanya baris hasil agregasi.
     
     Args:
-        tanggal_mulai (str): Format 'YYYY-MM-DD'. Jika None, ambil semua.
-        tanggal_selesai (str): Format 'YYYY-MM-DD'. Jika None, ambil dari tanggal_mulai hingga data terbaru.
-        id_wilayah (int): Filter berdasarkan wilayah.
-        id_stasiun (int): Filter berdasarkan stasiun.
-        batas (int): Batas jumlah baris.
+        tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun: Filter seperti ambil_data_cuaca.
+        dimensi (list): Kombinasi 'tahun', 'bulan', 'hari', 'stasiun', 'wilayah', 'provinsi'.
+        metrik (dict): {kolom: fungsi atau list fungsi}, fungsi = 'sum', 'mean',
+            'min', 'max', 'count'. Contoh: {'curah_hujan': ['sum', 'mean']}.
     
     Returns:
-        DataFrame: Data cuaca yang telah difilter.
+        DataFrame: Satu baris per grup; kolom dimensi, '<kolom>_<fungsi>', dan jumlah_observasi.
     """
+    if metrik is None:
+        metrik = {'suhu_rata_rata': 'mean', 'curah_hujan': 'sum'}
+    
+    try:
+        query, parameter = query_agregat_cuaca(list(dimensi), metrik, tanggal_mulai, tanggal_selesai,
+                                               id_wilayah, id_stasiun)
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return pd.DataFrame()
+    
     db = KonektorDatabase()
     koneksi = db.buat_koneksi()
     
@@ -69,79 +1414,521 @@ def ambil_data_cuaca(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None,
         return pd.DataFrame()
     
     try:
-        # Query dengan nama tabel dan kolom Bahasa Indonesia
-        query = """
-        SELECT 
-            oc.id_observasi,
-            oc.id_stasiun,
-            oc.tanggal,
-            oc.suhu_minimum,
-            oc.suhu_maksimum,
-            oc.suhu_rata_rata,
-            oc.kelembaban_rata_rata,
-            oc.curah_hujan,
-            oc.durasi_sinar_matahari,
-            oc.kecepatan_angin_maksimum,
-            oc.arah_angin_maksimum,
-            oc.kecepatan_angin_rata_rata,
-            oc.kode_arah_angin,
-            s.nama_stasiun,
-            s.lintang,
-            s.bujur,
-            w.nama_wilayah,
-            p.nama_provinsi,
-            aa.nama_arah AS nama_arah_angin
-        FROM observasi_cuaca oc
-        JOIN stasiun s ON oc.id_stasiun = s.id_stasiun
-        LEFT JOIN wilayah w ON s.id_wilayah = w.id_wilayah
-        LEFT JOIN provinsi p ON w.id_provinsi = p.id_provinsi
-        LEFT JOIN arah_angin aa ON oc.kode_arah_angin = aa.kode_arah
-        WHERE 1=1
-        """
-        
-        parameter = []
+        df = baca_sql(query, koneksi, parameter)
         
-        # ===== FILTER TANGGAL YANG SUDAH DIPERBAIKI =====
-        if tanggal_mulai and tanggal_selesai:
-            # Jika kedua tanggal diberikan, gunakan BETWEEN
-            query += " AND oc.tanggal BETWEEN %s AND %s"
-            parameter.append(tanggal_mulai)
-            parameter.append(tanggal_selesai)
-        elif tanggal_mulai:
-            # Jika hanya tanggal mulai, gunakan >=
-            query += " AND oc.tanggal >= %s"
-            parameter.append(tanggal_mulai)
-        elif tanggal_selesai:
-            # Jika hanya tanggal selesai, gunakan <=
-            query += " AND oc.tanggal <= %s"
-            parameter.append(tanggal_selesai)
-        # Jika tidak ada tanggal, ambil semua data
-        # ============================================
+        # AVG/SUM atas kolom DECIMAL dikembalikan sebagai Decimal; jadikan float
+        kolom_metrik = [k for k in df.columns if k.rsplit('_', 1)[-1] in ('sum', 'mean', 'min', 'max')]
+        df[kolom_metrik] = df[kolom_metrik].astype('float64')
+        return df
+    
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return pd.DataFrame()
+    
+    finally:
+        db.tutup_koneksi(koneksi)
+
+# ===== HALAMAN DATA MENTAH (KEYSET PAGINATION) =====
+# Urutan stabil (tanggal, id_observasi) dilayani index idx_tanggal_observasi.
+# Halaman berikut/sebelumnya memakai kunci baris tepi halaman (keyset) dan
+# halaman terakhir memakai urutan terbalik, jadi ketiganya sama murahnya
+# dengan halaman pertama. Lompat ke halaman N memakai batas turunan dari
+# tabel ringkasan bulanan (batas_lompat_halaman): query mulai dari tepi bulan
+# tempat baris ke-(N - 1) * ukuran_halaman berada dan hanya melewati sisa
+# baris di bulan itu (deferred join atas kunci index), jadi biayanya tidak
+# naik dengan nomor halaman. Dengan filter nilai rollup tidak bisa dipakai
+# dan lompat kembali ke OFFSET penuh; main.py menyimpan kunci tepi halaman
+# yang sudah dibuka supaya halaman tetangganya tetap lewat keyset.
+
+URUTAN_HALAMAN = {'terbaru': 'DESC', 'terlama': 'ASC'}
+
+def filter_nilai_cuaca(filter_nilai):
+    """
+    Kondisi rentang nilai per kolom, mis. {'curah_hujan': (50, None)}.
+    
+    Returns:
+        tuple: (string kondisi diawali ' AND ...', list parameter)
+    """
+    kondisi = ""
+    parameter = []
+    for kolom, (bawah, atas) in (filter_nilai or {}).items():
+        if kolom not in KOLOM_NUMERIK_CUACA:
+            raise ValueError(f"Kolom tidak bisa difilter: {kolom}")
+        if bawah is not None:
+            kondisi += f" AND oc.{kolom} >= %s"
+            parameter.append(bawah)
+        if atas is not None:
+            kondisi += f" AND oc.{kolom} <= %s"
+            parameter.append(atas)
+    return kondisi, parameter
+
+def query_halaman_cuaca(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None, id_stasiun=None,
+                        kolom=None, filter_nilai=None, urutan='terbaru', ukuran_halaman=100,
+                        setelah=None, sebelum=None, halaman=None, terakhir=None, batas=None):
+    """
+    Susun query satu halaman grid Data Mentah. Diambil ukuran_halaman + 1
+    baris supaya pemanggil tahu masih ada halaman berikutnya.
+    
+    Args:
+        kolom (list): Kolom dari KOLOM_CUACA/KOLOM_DIMENSI (tanggal dan id_observasi selalu ikut).
+        filter_nilai (dict): Rentang nilai per kolom (lihat filter_nilai_cuaca).
+        urutan (str): 'terbaru' atau 'terlama'.
+        setelah (tuple): (tanggal, id_observasi) baris terakhir halaman sekarang -> halaman berikutnya.
+        sebelum (tuple): (tanggal, id_observasi) baris pertama halaman sekarang -> halaman sebelumnya.
+        halaman (int): Nomor halaman (mulai 1) jika setelah/sebelum tidak diisi.
+            Halaman > 1 memakai OFFSET; tanpa batas biayanya O(offset).
+        terakhir (int): Ambil halaman terakhir berisi `terakhir` baris
+            (jumlah baris % ukuran_halaman, atau ukuran_halaman) lewat urutan
+            terbalik tanpa OFFSET; setelah/sebelum/halaman diabaikan.
+        batas (tuple): (tanggal tepi, jumlah baris sebelum tepi) dari
+            batas_lompat_halaman; query halaman mulai dari tanggal itu dan
+            OFFSET hanya sisa baris sesudah tepi.
+    
+    Returns:
+        tuple: (query SQL, list parameter, list kolom tampil, terbalik). Query
+               hanya memilih kolom observasi_cuaca; kolom dimensi ditempel
+               dengan lampirkan_dimensi. terbalik=True berarti hasil harus
+               dibalik agar sesuai urutan tampilan.
+    """
+    if urutan not in URUTAN_HALAMAN:
+        raise ValueError(f"Urutan tidak dikenal: {urutan}")
+    _, _, kolom = pisahkan_kolom(kolom)
+    kolom = ['tanggal', 'id_observasi'] + [k for k in kolom if k not in ('tanggal', 'id_observasi')]
+    kolom_fakta, _, _ = pisahkan_kolom(kolom)
+    
+    kondisi, parameter = filter_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun)
+    kondisi_nilai, parameter_nilai = filter_nilai_cuaca(filter_nilai)
+    kondisi += kondisi_nilai + filter_stasiun_dikenal(kolom)
+    parameter += parameter_nilai
+    
+    arah = URUTAN_HALAMAN[urutan]
+    if terakhir:
+        setelah = sebelum = halaman = None
+        ukuran_halaman = terakhir
+    terbalik = sebelum is not None or bool(terakhir)
+    if terbalik:
+        arah = 'ASC' if arah == 'DESC' else 'DESC'
+    kunci = setelah if setelah is not None else sebelum
+    if kunci is not None:
+        # Ditulis sebagai OR (bukan (a, b) < (x, y)) agar dipakai sebagai range index
+        pembanding = '<' if arah == 'DESC' else '>'
+        kondisi += (f" AND (oc.tanggal {pembanding} %s OR "
+                    f"(oc.tanggal = %s AND oc.id_observasi {pembanding} %s))")
+        parameter += [kunci[0], kunci[0], kunci[1]]
+    urut = f"oc.tanggal {arah}, oc.id_observasi {arah}"
+    daftar_select = ",\n        ".join(KOLOM_CUACA[k] for k in kolom_fakta)
+    
+    lompat = (halaman - 1) * ukuran_halaman if kunci is None and halaman and halaman > 1 else 0
+    if lompat and batas is not None:
+        kondisi += f" AND oc.tanggal {'<=' if arah == 'DESC' else '>='} %s"
+        parameter.append(batas[0])
+        lompat -= batas[1]
+    if lompat:
+        query = f"""
+    SELECT 
+        {daftar_select}
+    FROM (
+        SELECT oc.id_stasiun, oc.tanggal
+        FROM observasi_cuaca oc
+        WHERE 1=1{kondisi}
+        ORDER BY {urut}
+        LIMIT %s OFFSET %s
+    ) halaman
+    JOIN observasi_cuaca oc ON oc.id_stasiun = halaman.id_stasiun AND oc.tanggal = halaman.tanggal
+    ORDER BY {urut}
+    """
+        parameter += [ukuran_halaman + 1, lompat]
+    else:
+        query = f"""
+    SELECT 
+        {daftar_select}
+    FROM observasi_cuaca oc
+    WHERE 1=1{kondisi}
+    ORDER BY {urut}
+    LIMIT %s
+    """
+        parameter.append(ukuran_halaman + 1)
+    
+    return query, parameter, kolom, terbalik
+
+def batas_lompat_halaman(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun, kolom, urutan, lompat):
+    """
+    Batas keyset turunan untuk melewati `lompat` baris grid tanpa OFFSET
+    sepanjang rentang. Jumlah baris per bulan dari tabel ringkasan (dengan
+    filter dan semi-join stasiun yang sama seperti query halaman) menunjukkan
+    bulan tempat baris ke-`lompat` berada.
+    
+    Returns:
+        tuple: (tanggal tepi bulan itu menurut urutan, jumlah baris sebelum
+               bulan itu), atau None jika lompat melewati seluruh data.
+    """
+    ringkasan = ambil_ringkasan_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun,
+                                      dimensi=('tahun', 'bulan'), variabel=['curah_hujan'],
+                                      stasiun_dikenal=bool(filter_stasiun_dikenal(kolom)))
+    if ringkasan.empty:
+        return None
+    
+    terbaru = URUTAN_HALAMAN[urutan] == 'DESC'
+    ringkasan = ringkasan.sort_values(['tahun', 'bulan'], ascending=not terbaru)
+    kumulatif = ringkasan['jumlah_observasi'].cumsum()
+    melewati = (kumulatif > lompat).to_numpy()
+    if not melewati.any():
+        return None
+    
+    posisi = int(melewati.argmax())
+    bulan = ringkasan.iloc[posisi]
+    sebelumnya = int(kumulatif.iloc[posisi] - bulan['jumlah_observasi'])
+    awal_bulan = date(int(bulan['tahun']), int(bulan['bulan']), 1)
+    tepi = bulan_berikut(awal_bulan) - timedelta(days=1) if terbaru else awal_bulan
+    return tepi, sebelumnya
+
+@instrumentasi
+@cache_hasil
+def ambil_halaman_cuaca(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None, id_stasiun=None,
+                        kolom=None, filter_nilai=None, urutan='terbaru', ukuran_halaman=100,
+                        setelah=None, sebelum=None, halaman=None, terakhir=None):
+    """
+    Satu halaman data mentah dengan urutan dan filter dikerjakan di MySQL.
+    Argumen sama dengan query_halaman_cuaca: setelah/sebelum/terakhir
+    memakai index tanpa OFFSET; halaman=N mulai dari batas bulan turunan
+    tabel ringkasan (batas_lompat_halaman), kecuali dengan filter nilai.
+    
+    Returns:
+        dict: data (DataFrame, kolom database), pertama/terakhir (kunci
+              (tanggal, id_observasi) baris tepi untuk navigasi), ada_sebelumnya,
+              ada_berikutnya.
+    """
+    hasil = {'data': pd.DataFrame(), 'pertama': None, 'terakhir': None,
+             'ada_sebelumnya': False, 'ada_berikutnya': False}
+    try:
+        batas = None
+        if (halaman and halaman > 1 and setelah is None and sebelum is None
+                and not terakhir and not filter_nilai):
+            batas = batas_lompat_halaman(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun,
+                                         kolom, urutan, (halaman - 1) * ukuran_halaman)
+        query, parameter, nama_kolom, terbalik = query_halaman_cuaca(
+            tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun, kolom, filter_nilai,
+            urutan, ukuran_halaman, setelah, sebelum, halaman, terakhir, batas)
+        dimensi = siapkan_dimensi(nama_kolom)
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return hasil
+    
+    db = KonektorDatabase()
+    koneksi = db.buat_koneksi()
+    
+    if koneksi is None:
+        return hasil
+    
+    try:
+        kursor = koneksi.cursor()
+        jalankan_sql(kursor, query, parameter)
+        baris = kursor.fetchall()
+        kolom_hasil = [d[0] for d in kursor.description]
+        kursor.close()
+    
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return hasil
+    
+    finally:
+        db.tutup_koneksi(koneksi)
+    
+    if terakhir:
+        ukuran_halaman = terakhir
+    masih_ada = len(baris) > ukuran_halaman
+    baris = baris[:ukuran_halaman]
+    if terbalik:
+        baris.reverse()
+        hasil['ada_sebelumnya'], hasil['ada_berikutnya'] = masih_ada, not terakhir
+    else:
+        hasil['ada_sebelumnya'] = setelah is not None or bool(halaman and halaman > 1)
+        hasil['ada_berikutnya'] = masih_ada
+    
+    if baris:
+        # Kolom 0 dan 1 selalu tanggal dan id_observasi
+        hasil['pertama'] = (baris[0][0], baris[0][1])
+        hasil['terakhir'] = (baris[-1][0], baris[-1][1])
+    hasil['data'] = lampirkan_dimensi(ke_dataframe_cuaca(baris, kolom_hasil), nama_kolom, dimensi)
+    return hasil
+
+@instrumentasi
+@cache_hasil
+def hitung_baris_cuaca(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None, id_stasiun=None,
+                       filter_nilai=None, kolom=None):
+    """
+    Jumlah baris untuk filter grid (untuk jumlah halaman). Tanpa filter
+    nilai, jumlah diambil dari tabel ringkasan; dengan filter nilai
+    dihitung COUNT(*) di observasi_cuaca. kolom sama dengan query halaman:
+    jika ada kolom dimensi stasiun, stasiun yang tidak dikenal ikut dibuang
+    dari hitungan seperti di query_halaman_cuaca.
+    
+    Returns:
+        int: Jumlah baris.
+    """
+    stasiun_dikenal = filter_stasiun_dikenal(kolom)
+    if not filter_nilai:
+        ringkasan = ambil_ringkasan_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun,
+                                          dimensi=(), variabel=['curah_hujan'],
+                                          stasiun_dikenal=bool(stasiun_dikenal))
+        return int(ringkasan['jumlah_observasi'].sum()) if not ringkasan.empty else 0
+    
+    try:
+        kondisi, parameter = filter_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah, id_stasiun)
+        kondisi_nilai, parameter_nilai = filter_nilai_cuaca(filter_nilai)
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return 0
+    
+    db = KonektorDatabase()
+    koneksi = db.buat_koneksi()
+    
+    if koneksi is None:
+        return 0
+    
+    try:
+        kursor = koneksi.cursor()
+        jalankan_sql(kursor, f"SELECT COUNT(*) FROM observasi_cuaca oc "
+                             f"WHERE 1=1{kondisi}{kondisi_nilai}{stasiun_dikenal}",
+                     parameter + parameter_nilai)
+        return kursor.fetchone()[0]
+    
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return 0
+    
+    finally:
+        db.tutup_koneksi(koneksi)
+
+# ===== RINGKASAN BULANAN/TAHUNAN (tabel rollup dari skema.py) =====
+
+# Dimensi: list (kolom hasil, ekspresi dari observasi_cuaca oc, ekspresi dari ringkasan r)
+# beserta jumlah JOIN_DIMENSI yang dibutuhkan
+DIMENSI_RINGKASAN = {
+    'tahun': ([('tahun', 'YEAR(oc.tanggal)', 'r.tahun')], 0),
+    'bulan': ([('bulan', 'MONTH(oc.tanggal)', 'r.bulan')], 0),
+    'stasiun': ([('id_stasiun', 'oc.id_stasiun', 'r.id_stasiun'),
+                 ('nama_stasiun', 's.nama_stasiun', 's.nama_stasiun')], 1),
+    'wilayah': ([('id_wilayah', 's.id_wilayah', 's.id_wilayah'),
+                 ('nama_wilayah', 'w.nama_wilayah', 'w.nama_wilayah')], 2),
+    'provinsi': ([('id_provinsi', 'w.id_provinsi', 'w.id_provinsi'),
+                  ('nama_provinsi', 'p.nama_provinsi', 'p.nama_provinsi')], 3),
+}
+
+def ke_tanggal(nilai):
+    """Terima date/datetime/string 'YYYY-MM-DD' dan kembalikan date"""
+    if isinstance(nilai, datetime):
+        return nilai.date()
+    if isinstance(nilai, date):
+        return nilai
+    return datetime.strptime(str(nilai)[:10], '%Y-%m-%d').date()
+
+def bulan_berikut(tanggal):
+    """Tanggal 1 bulan berikutnya"""
+    return (tanggal.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def bagi_periode_ringkasan(tanggal_mulai, tanggal_selesai, pakai_tahunan=True):
+    """
+    Bagi rentang tanggal ke sumber termurah: tahun penuh dari ringkasan
+    tahunan, bulan penuh dari ringkasan bulanan, dan sisa hari di tepi
+    rentang langsung dari observasi_cuaca.
+    
+    Returns:
+        list: Tuple (sumber, awal, akhir); sumber 'harian' (date),
+              'bulanan' ((tahun, bulan)), atau 'tahunan' (tahun).
+    """
+    mulai, selesai = ke_tanggal(tanggal_mulai), ke_tanggal(tanggal_selesai)
+    if mulai > selesai:
+        return []
+    
+    awal_penuh = mulai if mulai.day == 1 else bulan_berikut(mulai)
+    akhir_penuh = (selesai if bulan_berikut(selesai) - timedelta(days=1) == selesai
+                   else selesai.replace(day=1) - timedelta(days=1))
+    if awal_penuh > akhir_penuh:
+        return [('harian', mulai, selesai)]
+    
+    potongan = []
+    if mulai < awal_penuh:
+        potongan.append(('harian', mulai, awal_penuh - timedelta(days=1)))
+    if akhir_penuh < selesai:
+        potongan.append(('harian', akhir_penuh + timedelta(days=1), selesai))
+    
+    pertama = (awal_penuh.year, awal_penuh.month)
+    terakhir = (akhir_penuh.year, akhir_penuh.month)
+    if pakai_tahunan:
+        tahun_awal = pertama[0] if pertama[1] == 1 else pertama[0] + 1
+        tahun_akhir = terakhir[0] if terakhir[1] == 12 else terakhir[0] - 1
+        if tahun_awal <= tahun_akhir:
+            potongan.append(('tahunan', tahun_awal, tahun_akhir))
+            if pertama < (tahun_awal, 1):
+                potongan.append(('bulanan', pertama, (tahun_awal - 1, 12)))
+            if terakhir > (tahun_akhir, 12):
+                potongan.append(('bulanan', (tahun_akhir + 1, 1), terakhir))
+            return potongan
+    
+    potongan.append(('bulanan', pertama, terakhir))
+    return potongan
+
+def query_ringkasan_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah=None, id_stasiun=None,
+                          dimensi=('bulan',), variabel=None, stasiun_dikenal=False):
+    """
+    Susun query UNION ALL untuk ambil_ringkasan_cuaca: satu SELECT per
+    potongan periode, masing-masing mengembalikan n/jumlah/min/maks/
+    jumlah kuadrat per variabel yang dikelompokkan menurut dimensi.
+    
+    Returns:
+        tuple: (query SQL, list parameter, list kolom dimensi)
+    """
+    tidak_dikenal = [d for d in dimensi if d not in DIMENSI_RINGKASAN]
+    if tidak_dikenal:
+        raise ValueError(f"Dimensi ringkasan tidak dikenal: {', '.join(tidak_dikenal)}")
+    variabel = list(variabel or VARIABEL_RINGKASAN)
+    tidak_dikenal = [v for v in variabel if v not in VARIABEL_RINGKASAN]
+    if tidak_dikenal:
+        raise ValueError(f"Variabel tanpa ringkasan: {', '.join(tidak_dikenal)}")
+    
+    kolom_dimensi = []
+    jumlah_join = 0
+    for d in dimensi:
+        kolom, join = DIMENSI_RINGKASAN[d]
+        kolom_dimensi += kolom
+        jumlah_join = max(jumlah_join, join)
+    
+    daftar_select = []
+    parameter = []
+    for sumber, awal, akhir in bagi_periode_ringkasan(tanggal_mulai, tanggal_selesai,
+                                                     pakai_tahunan='bulan' not in dimensi):
+        harian = sumber == 'harian'
+        fakta = 'oc' if harian else 'r'
+        ekspresi = [(e_oc if harian else e_r) for _, e_oc, e_r in kolom_dimensi]
+        pilih = [f"{e} AS {nama}" for e, (nama, _, _) in zip(ekspresi, kolom_dimensi)]
+        pilih.append("COUNT(*) AS jumlah_observasi" if harian else "SUM(r.jumlah_observasi) AS jumlah_observasi")
+        for v in variabel:
+            for akhiran, _, dari_observasi, dari_ringkasan in STATISTIK_RINGKASAN:
+                teks = (dari_observasi.format(k=f"oc.{v}") if harian
+                        else dari_ringkasan.format(k=f"r.{v}_{akhiran}"))
+                pilih.append(f"{teks} AS {v}_{akhiran}")
         
+        if harian:
+            sumber_sql = "observasi_cuaca oc"
+            kondisi = "oc.tanggal BETWEEN %s AND %s"
+            parameter += [awal, akhir]
+        elif sumber == 'bulanan':
+            sumber_sql = "ringkasan_bulanan_stasiun r"
+            # Rentang (tahun, bulan) ditulis tanpa perbandingan baris supaya
+            # berlaku juga di DuckDB; r.tahun BETWEEN tetap menjadi range index
+            kondisi = ("r.tahun BETWEEN %s AND %s AND (r.tahun > %s OR r.bulan >= %s) "
+                       "AND (r.tahun < %s OR r.bulan <= %s)")
+            parameter += [awal[0], akhir[0], *awal, *akhir]
+        else:
+            sumber_sql = "ringkasan_tahunan_stasiun r"
+            kondisi = "r.tahun BETWEEN %s AND %s"
+            parameter += [awal, akhir]
         if id_wilayah:
-            query += " AND w.id_wilayah = %s"
-            parameter.append(id_wilayah)
-        
+            kondisi_wilayah, parameter_wilayah = filter_wilayah(id_wilayah, fakta)
+            kondisi += kondisi_wilayah
+            parameter += parameter_wilayah
         if id_stasiun:
-            query += " AND s.id_stasiun = %s"
+            kondisi += f" AND {fakta}.id_stasiun = %s"
             parameter.append(id_stasiun)
+        if stasiun_dikenal and not jumlah_join:
+            # Dengan dimensi bernama, JOIN stasiun sudah membuang stasiun tak dikenal
+            kondisi += SEMI_JOIN_STASIUN.format(fakta=fakta)
         
-        query += " ORDER BY oc.tanggal DESC LIMIT %s"
-        parameter.append(batas)
-        
-        # Eksekusi query
-        df = pd.read_sql(query, koneksi, params=parameter)
-        
-        return df
+        sql = f"""
+    SELECT {", ".join(pilih)}
+    FROM {sumber_sql}{klausa_join_dimensi(jumlah_join, fakta)}
+    WHERE {kondisi}"""
+        if ekspresi:
+            sql += f"\n    GROUP BY {', '.join(ekspresi)}"
+        daftar_select.append(sql)
+    
+    return "\n    UNION ALL".join(daftar_select), parameter, [nama for nama, _, _ in kolom_dimensi]
+
+@instrumentasi
+@cache_hasil
+def ambil_ringkasan_cuaca(tanggal_mulai=None, tanggal_selesai=None, id_wilayah=None, id_stasiun=None,
+                          dimensi=('bulan',), variabel=None, stasiun_dikenal=False):
+    """
+    Statistik cuaca dari tabel ringkasan bulanan/tahunan per stasiun.
+    Rentang multi-tahun dijawab dari ribuan baris ringkasan, bukan jutaan
+    observasi harian; hanya hari di tepi rentang yang tidak membentuk
+    bulan penuh dibaca dari observasi_cuaca.
+    
+    Args:
+        tanggal_mulai, tanggal_selesai: Rentang tanggal (date atau 'YYYY-MM-DD');
+            None = seluruh data sampai hari ini.
+        id_wilayah, id_stasiun: Filter seperti ambil_data_cuaca.
+        dimensi (tuple): Kombinasi 'tahun', 'bulan', 'stasiun', 'wilayah', 'provinsi'.
+        variabel (list): Kolom dari skema.VARIABEL_RINGKASAN (None = semua).
+        stasiun_dikenal (bool): Hanya stasiun yang ada di tabel stasiun
+            (sama dengan semi-join query halaman Data Mentah).
+    
+    Returns:
+        DataFrame: Satu baris per grup dengan kolom dimensi, jumlah_observasi,
+            dan '<variabel>_<count|sum|mean|min|max|std>' (nama sama seperti
+            ambil_agregat_cuaca).
+    """
+    if tanggal_mulai is None:
+        tanggal_mulai = date(1900, 1, 1)
+    if tanggal_selesai is None:
+        tanggal_selesai = date.today()
+    variabel = list(variabel or VARIABEL_RINGKASAN)
+    
+    try:
+        query, parameter, kolom_dimensi = query_ringkasan_cuaca(tanggal_mulai, tanggal_selesai, id_wilayah,
+                                                                id_stasiun, dimensi, variabel,
+                                                                stasiun_dikenal)
+    except Error as e:
+        laporkan_error("❌ Error SQL", e)
+        return pd.DataFrame()
+    if not query:
+        return pd.DataFrame()
+    
+    db = KonektorDatabase()
+    koneksi = db.buat_koneksi()
+    
+    if koneksi is None:
+        return pd.DataFrame()
+    
+    try:
+        df = baca_sql(query, koneksi, parameter)
     
     except Error as e:
-        st.error(f"❌ Error SQL: {str(e)[:200]}")
+        laporkan_error("❌ Error SQL", e)
         return pd.DataFrame()
     
     finally:
-        if koneksi and koneksi.is_connected():
-            koneksi.close()
+        db.tutup_koneksi(koneksi)
+    
+    # Gabungkan potongan periode (harian/bulanan/tahunan) per grup
+    kolom_statistik = [c for c in df.columns if c not in kolom_dimensi]
+    df[kolom_statistik] = df[kolom_statistik].astype('float64')
+    fungsi = {c: ('min' if c.endswith('_min') else 'max' if c.endswith('_maks') else 'sum')
+              for c in kolom_statistik}
+    if kolom_dimensi:
+        gabungan = df.groupby(kolom_dimensi, dropna=False, sort=True).agg(fungsi).reset_index()
+    else:
+        gabungan = df.agg(fungsi).to_frame().T
+    gabungan = gabungan[gabungan['jumlah_observasi'] > 0]
+    
+    hasil = gabungan[kolom_dimensi].copy()
+    hasil['jumlah_observasi'] = gabungan['jumlah_observasi'].astype('int64')
+    for v in variabel:
+        n = gabungan[f"{v}_n"]
+        ada = n > 0
+        rata_rata = (gabungan[f"{v}_jumlah"] / n).where(ada)
+        varians = (gabungan[f"{v}_jumlah_kuadrat"] / n - rata_rata ** 2).clip(lower=0)
+        hasil[f"{v}_count"] = n.astype('int64')
+        hasil[f"{v}_sum"] = gabungan[f"{v}_jumlah"].where(ada)
+        hasil[f"{v}_mean"] = rata_rata
+        hasil[f"{v}_min"] = gabungan[f"{v}_min"]
+        hasil[f"{v}_max"] = gabungan[f"{v}_maks"]
+        hasil[f"{v}_std"] = varians ** 0.5
+    return hasil.reset_index(drop=True)
 
+@instrumentasi
+@cache_hasil
 def ambil_data_stasiun():
     """Ambil data stasiun dengan lokasi"""
     db = KonektorDatabase()
@@ -167,17 +1954,18 @@ def ambil_data_stasiun():
         ORDER BY s.nama_stasiun
         """
         
-        df = pd.read_sql(query, koneksi)
+        df = baca_sql(query, koneksi)
         return df
     
     except Error as e:
-        st.error(f"Error mengambil data stasiun: {e}")
+        laporkan_error("Error mengambil data stasiun", e, batas=None)
         return pd.DataFrame()
     
     finally:
-        if koneksi and koneksi.is_connected():
-            koneksi.close()
+        db.tutup_koneksi(koneksi)
 
+@instrumentasi
+@cache_hasil
 def ambil_daftar_wilayah():
     """Ambil daftar wilayah"""
     db = KonektorDatabase()
@@ -189,15 +1977,16 @@ def ambil_daftar_wilayah():
     try:
         query = "SELECT id_wilayah, nama_wilayah FROM wilayah ORDER BY nama_wilayah"
         kursor = koneksi.cursor(dictionary=True)
-        kursor.execute(query)
+        jalankan_sql(kursor, query)
         hasil = kursor.fetchall()
         return hasil
     except:
         return []
     finally:
-        if koneksi and koneksi.is_connected():
-            koneksi.close()
+        db.tutup_koneksi(koneksi)
 
+@instrumentasi
+@cache_hasil
 def ambil_arah_angin():
     """Ambil data arah angin"""
     db = KonektorDatabase()
@@ -215,16 +2004,24 @@ def ambil_arah_angin():
         FROM arah_angin 
         ORDER BY nama_arah
         """
-        df = pd.read_sql(query, koneksi)
+        df = baca_sql(query, koneksi)
         return df
     except:
         return pd.DataFrame()
     finally:
-        if koneksi and koneksi.is_connected():
-            koneksi.close()
+        db.tutup_koneksi(koneksi)
 
-def ambil_statistik_database():
-    """Ambil statistik database"""
+@instrumentasi
+@cache_hasil(per_hari=True)
+def ambil_katalog():
+    """
+    Baca katalog_data yang diperbarui importer (lihat skema.segarkan_katalog).
+    
+    Returns:
+        dict: baris (jumlah baris per tabel), tanggal_min, tanggal_maks,
+              tahun (dict tahun -> jumlah observasi), versi_import,
+              terbaru_30_hari. Dict kosong jika katalog belum ada.
+    """
     db = KonektorDatabase()
     koneksi = db.buat_koneksi()
     
@@ -232,47 +2029,76 @@ def ambil_statistik_database():
         return {}
     
     try:
-        statistik = {}
         kursor = koneksi.cursor()
-        
-        # Hitung total observasi cuaca
-        kursor.execute("SELECT COUNT(*) FROM observasi_cuaca")
-        statistik['total_observasi'] = kursor.fetchone()[0]
-        
-        # Hitung total stasiun
-        kursor.execute("SELECT COUNT(*) FROM stasiun")
-        statistik['total_stasiun'] = kursor.fetchone()[0]
-        
-        # Hitung rentang tanggal
-        kursor.execute("SELECT MIN(tanggal), MAX(tanggal) FROM observasi_cuaca")
-        tanggal_min, tanggal_maks = kursor.fetchone()
-        if tanggal_min and tanggal_maks:
-            statistik['rentang_tanggal'] = f"{tanggal_min.strftime('%Y-%m-%d')} sampai {tanggal_maks.strftime('%Y-%m-%d')}"
-        else:
-            statistik['rentang_tanggal'] = "Data tidak tersedia"
-        
-        # Hitung data terbaru
-        kursor.execute("SELECT COUNT(*) FROM observasi_cuaca WHERE tanggal >= DATE_SUB(NOW(), INTERVAL 30 DAY)")
-        statistik['terbaru_30_hari'] = kursor.fetchone()[0]
-        
-        # Hitung jumlah wilayah
-        kursor.execute("SELECT COUNT(*) FROM wilayah")
-        statistik['total_wilayah'] = kursor.fetchone()[0]
-        
-        # Hitung jumlah provinsi
-        kursor.execute("SELECT COUNT(*) FROM provinsi")
-        statistik['total_provinsi'] = kursor.fetchone()[0]
-        
-        return statistik
+        jalankan_sql(kursor, QUERY_KATALOG, (date.today() - timedelta(days=30),))
+        katalog = {'baris': {}, 'tahun': {}, 'tanggal_min': None, 'tanggal_maks': None,
+                   'versi_import': 0, 'terbaru_30_hari': 0}
+        for kunci, angka, tanggal in kursor.fetchall():
+            if kunci.startswith('baris:'):
+                katalog['baris'][kunci[6:]] = int(angka or 0)
+            elif kunci.startswith('tahun:'):
+                katalog['tahun'][int(kunci[6:])] = int(angka or 0)
+            elif kunci in ('tanggal_min', 'tanggal_maks'):
+                katalog[kunci] = tanggal
+            else:
+                katalog[kunci] = int(angka or 0)
+        return katalog if katalog['baris'] else {}
     
-    except Error as e:
-        st.error(f"Error mengambil statistik: {e}")
+    except Error:
+        # katalog_data belum dibuat (skema lama): pemanggil memakai query langsung
         return {}
     
     finally:
-        if koneksi and koneksi.is_connected():
-            koneksi.close()
+        db.tutup_koneksi(koneksi)
+
+def format_rentang_tanggal(tanggal_min, tanggal_maks):
+    """Teks rentang tanggal untuk statistik database"""
+    if tanggal_min and tanggal_maks:
+        return f"{tanggal_min.strftime('%Y-%m-%d')} sampai {tanggal_maks.strftime('%Y-%m-%d')}"
+    return "Data tidak tersedia"
+
+@instrumentasi
+@cache_hasil(per_hari=True)
+def ambil_statistik_database():
+    """Ambil statistik database (dari katalog_data; query langsung jika katalog belum ada)"""
+    katalog = ambil_katalog()
+    if katalog:
+        baris = katalog['baris']
+        return {
+            'total_observasi': baris.get('observasi_cuaca', 0),
+            'total_stasiun': baris.get('stasiun', 0),
+            'rentang_tanggal': format_rentang_tanggal(katalog['tanggal_min'], katalog['tanggal_maks']),
+            'tanggal_min': katalog['tanggal_min'],
+            'tanggal_maks': katalog['tanggal_maks'],
+            'terbaru_30_hari': katalog['terbaru_30_hari'],
+            'total_wilayah': baris.get('wilayah', 0),
+            'total_provinsi': baris.get('provinsi', 0),
+            'versi_import': katalog['versi_import'],
+        }
+    
+    # Katalog belum ada: enam query langsung, dijalankan bersamaan
+    try:
+        hasil = jalankan_bersamaan({
+            'total_observasi': (ambil_satu_baris, QUERY_TOTAL_OBSERVASI),
+            'total_stasiun': (ambil_satu_baris, "SELECT COUNT(*) FROM stasiun"),
+            'rentang': (ambil_satu_baris, QUERY_RENTANG_TANGGAL),
+            'terbaru_30_hari': (ambil_satu_baris, QUERY_TERBARU_30_HARI, (date.today() - timedelta(days=30),)),
+            'total_wilayah': (ambil_satu_baris, "SELECT COUNT(*) FROM wilayah"),
+            'total_provinsi': (ambil_satu_baris, "SELECT COUNT(*) FROM provinsi"),
+        })
+    except Error as e:
+        laporkan_error("Error mengambil statistik", e, batas=None)
+        return {}
+    
+    tanggal_min, tanggal_maks = hasil.pop('rentang')
+    statistik = {nama: baris[0] for nama, baris in hasil.items()}
+    statistik['rentang_tanggal'] = format_rentang_tanggal(tanggal_min, tanggal_maks)
+    statistik['tanggal_min'] = tanggal_min
+    statistik['tanggal_maks'] = tanggal_maks
+    return statistik
 
+@instrumentasi
+@cache_hasil
 def ambil_data_contoh(batas=100):
     """Ambil sample data untuk testing"""
     db = KonektorDatabase()
@@ -282,21 +2108,21 @@ def ambil_data_contoh(batas=100):
         return pd.DataFrame()
     
     try:
-        query = f"""
-        SELECT * FROM observasi_cuaca 
-        ORDER BY tanggal DESC 
-        LIMIT {batas}
-        """
-        df = pd.read_sql(query, koneksi)
+        df = baca_sql(QUERY_DATA_CONTOH, koneksi, [int(batas)])
         return df
     except:
         return pd.DataFrame()
     finally:
-        if koneksi and koneksi.is_connected():
-            koneksi.close()
+        db.tutup_koneksi(koneksi)
 
+@instrumentasi
+@cache_hasil
 def ambil_tahun_tersedia():
-    """Dapatkan tahun-tahun yang tersedia di data"""
+    """Dapatkan tahun-tahun yang tersedia di data (terbaru dulu)"""
+    katalog = ambil_katalog()
+    if katalog:
+        return sorted((t for t, jumlah in katalog['tahun'].items() if jumlah), reverse=True)
+    
     db = KonektorDatabase()
     koneksi = db.buat_koneksi()
     
@@ -304,17 +2130,24 @@ def ambil_tahun_tersedia():
         return []
     
     try:
-        query = "SELECT DISTINCT YEAR(tanggal) as tahun FROM observasi_cuaca ORDER BY tahun DESC"
         kursor = koneksi.cursor()
-        kursor.execute(query)
+        # MIN/MAX cukup satu lookup index per partisi
+        jalankan_sql(kursor, QUERY_RENTANG_TANGGAL)
+        tanggal_min, tanggal_maks = kursor.fetchone()
+        if not tanggal_min or not tanggal_maks:
+            return []
+        
+        query, parameter = query_tahun_tersedia(tanggal_min.year, tanggal_maks.year)
+        jalankan_sql(kursor, query, parameter)
         hasil = [baris[0] for baris in kursor.fetchall() if baris[0]]
         return hasil
     except:
         return []
     finally:
-        if koneksi and koneksi.is_connected():
-            koneksi.close()
+        db.tutup_koneksi(koneksi)
 
+@instrumentasi
+@cache_hasil
 def ambil_statistik_cuaca_stasiun(id_stasiun):
     """Dapatkan statistik cuaca untuk stasiun tertentu"""
     db = KonektorDatabase()
@@ -324,28 +2157,14 @@ def ambil_statistik_cuaca_stasiun(id_stasiun):
         return {}
     
     try:
-        query = """
-        SELECT 
-            COUNT(*) as total_hari,
-            AVG(suhu_rata_rata) as suhu_rata,
-            MIN(suhu_rata_rata) as suhu_minimum,
-            MAX(suhu_rata_rata) as suhu_maksimum,
-            SUM(curah_hujan) as total_hujan,
-            AVG(kelembaban_rata_rata) as kelembaban_rata,
-            AVG(kecepatan_angin_rata_rata) as angin_rata
-        FROM observasi_cuaca 
-        WHERE id_stasiun = %s
-        """
-        
         kursor = koneksi.cursor(dictionary=True)
-        kursor.execute(query, (id_stasiun,))
+        jalankan_sql(kursor, QUERY_STATISTIK_STASIUN, (id_stasiun,))
         hasil = kursor.fetchone()
         return hasil
     except:
         return {}
     finally:
-        if koneksi and koneksi.is_connected():
-            koneksi.close()
+        db.tutup_koneksi(koneksi)
 
 # Fungsi tambahan untuk kenyamanan
 def ambil_nama_kolom():
@@ -379,4 +2198,99 @@ def ambil_data_periode(tanggal_mulai, tanggal_selesai, batas=50000):
         tanggal_mulai=tanggal_mulai,
         tanggal_selesai=tanggal_selesai,
         batas=batas
-    )
\ No newline at end of file
+    )
+
+def ambil_statistik_pool():
+    """Statistik pool koneksi bersama (waktu tunggu dan rasio pinjam langsung)"""
+    return KonektorDatabase.statistik_pool()
+
+# Fungsi untuk pemeriksaan rencana query (python skema.py --periksa)
+def stasiun_contoh(dimensi):
+    """
+    Stasiun dan wilayah contoh untuk EXPLAIN: stasiun ber-id terkecil yang
+    punya wilayah, supaya filter wilayah tidak menjadi 1=0.
+    
+    Returns:
+        tuple: (id_stasiun, id_wilayah); (96001, 20) jika tabel stasiun kosong.
+    """
+    stasiun = dimensi['stasiun']
+    punya_wilayah = stasiun[stasiun['id_wilayah'].notna()].sort_index()
+    if punya_wilayah.empty:
+        return 96001, 20
+    return int(punya_wilayah.index[0]), int(punya_wilayah['id_wilayah'].iloc[0])
+
+def daftar_query_periksa(koneksi=None, id_stasiun=None, id_wilayah=None):
+    """
+    Semua query ambil_* yang menyentuh observasi_cuaca, dengan parameter
+    contoh yang mewakili pola pemakaian dashboard.
+    
+    Args:
+        koneksi: Koneksi ke database yang diperiksa. Stasiun contoh dan daftar
+            stasiun per wilayah diambil dari database ini (None = database default).
+        id_stasiun (int): Stasiun contoh (None = stasiun_contoh).
+        id_wilayah (int): Wilayah contoh (None = wilayah stasiun_contoh).
+    
+    Returns:
+        list: Tuple (nama, query SQL, parameter).
+    """
+    with dimensi_dari(koneksi) as dimensi:
+        contoh_stasiun, contoh_wilayah = stasiun_contoh(dimensi)
+        id_stasiun = id_stasiun or contoh_stasiun
+        id_wilayah = id_wilayah or contoh_wilayah
+        tahun_ini = datetime.now().year
+        mulai, selesai = f"{tahun_ini - 1}-01-01", f"{tahun_ini - 1}-12-31"
+        daftar = [
+            ('ambil_data_cuaca (rentang tanggal)', *query_data_cuaca(mulai, selesai, batas=50000)),
+            ('ambil_data_cuaca (tanggal mulai)', *query_data_cuaca(tanggal_mulai=mulai, batas=5000)),
+            ('ambil_data_cuaca (tanggal selesai)', *query_data_cuaca(tanggal_selesai=selesai, batas=5000)),
+            ('ambil_data_cuaca (wilayah)', *query_data_cuaca(mulai, selesai, id_wilayah=id_wilayah)),
+            ('ambil_data_cuaca (stasiun)', *query_data_cuaca(mulai, selesai, id_stasiun=id_stasiun)),
+            ('ambil_data_cuaca (tanpa filter)', *query_data_cuaca(batas=100)),
+            ('ambil_data_cuaca (kolom hujan)', *query_data_cuaca(mulai, selesai, id_wilayah=id_wilayah,
+                                                                 kolom=['tanggal', 'curah_hujan', 'nama_wilayah'])),
+            ('ambil_agregat_cuaca (bulan)', *query_agregat_cuaca(['bulan'], {'curah_hujan': 'sum'}, mulai, selesai)),
+            ('ambil_agregat_cuaca (wilayah)', *query_agregat_cuaca(['provinsi', 'wilayah'], {'curah_hujan': 'sum'},
+                                                                   mulai, selesai)),
+            ('ambil_ringkasan_cuaca (tepi bulan)', *query_ringkasan_cuaca(f"{tahun_ini - 3}-03-15", selesai,
+                                                                          dimensi=('bulan',))[:2]),
+            ('ambil_halaman_cuaca (berikutnya)', *query_halaman_cuaca(
+                mulai, selesai, setelah=(selesai, 10 ** 9), ukuran_halaman=100)[:2]),
+            ('ambil_halaman_cuaca (lompat)', *query_halaman_cuaca(
+                mulai, selesai, id_wilayah=id_wilayah, halaman=50, ukuran_halaman=100)[:2]),
+            ('ambil_statistik_database (total)', QUERY_TOTAL_OBSERVASI, []),
+            ('ambil_statistik_database (rentang)', QUERY_RENTANG_TANGGAL, []),
+            ('ambil_statistik_database (30 hari)', QUERY_TERBARU_30_HARI, [date.today() - timedelta(days=30)]),
+            ('ambil_katalog', QUERY_KATALOG, [date.today() - timedelta(days=30)]),
+            ('ambil_data_contoh', QUERY_DATA_CONTOH, [100]),
+            ('ambil_tahun_tersedia', *query_tahun_tersedia(tahun_ini - 5, tahun_ini)),
+            ('ambil_statistik_cuaca_stasiun', QUERY_STATISTIK_STASIUN, [id_stasiun]),
+        ]
+        return daftar
+
+def daftar_query_partisi(koneksi=None):
+    """
+    Query berfilter tanggal beserta tahun partisi yang boleh disentuhnya
+    (lihat skema.periksa_pemangkasan_partisi).
+    
+    Args:
+        koneksi: Koneksi ke database yang diperiksa (None = database default),
+            sumber stasiun contoh.
+    
+    Returns:
+        list: Tuple (nama, query SQL, parameter, tahun yang boleh, maks partisi per baris).
+    """
+    with dimensi_dari(koneksi) as dimensi:
+        id_stasiun, _ = stasiun_contoh(dimensi)
+    tahun_lalu = datetime.now().year - 1
+    mulai, selesai = f"{tahun_lalu}-01-01", f"{tahun_lalu}-12-31"
+    batas_30_hari = date.today() - timedelta(days=30)
+    return [
+        ('ambil_data_cuaca (rentang tanggal)',
+         *query_data_cuaca(mulai, selesai, batas=50000), {tahun_lalu}, None),
+        ('ambil_data_cuaca (stasiun)',
+         *query_data_cuaca(mulai, selesai, id_stasiun=id_stasiun), {tahun_lalu}, None),
+        ('ambil_statistik_database (30 hari)', QUERY_TERBARU_30_HARI, [batas_30_hari],
+         set(range(batas_30_hari.year, date.today().year + 1)), None),
+        # Setiap subquery UNION ALL hanya boleh menyentuh satu partisi
+        ('ambil_tahun_tersedia', *query_tahun_tersedia(tahun_lalu - 4, tahun_lalu), None, 1),
+    ]
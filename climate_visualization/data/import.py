@@ -4,134 +4,1556 @@ Versi minimalis - hanya import
 """
 
 import pandas as pd
+import numpy as np
 import mysql.connector
+import argparse
+import itertools
+import tempfile
+import json
+import gzip
+import io
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime
+import time
+import sys
 import os
 
-def import_csv_sederhana():
-    """Import CSV ke database iklim_indonesia (versi sederhana)"""
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# skema.py ada satu folder di atas data/ (climate_visualization)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import skema
+import arsip
+import backend
+
+# Parameter koneksi database (dipakai proses utama dan setiap worker).
+# Nama database bisa diganti lewat IKLIM_DB_NAMA, mis. untuk benchmark;
+# server dan akun lewat IKLIM_DB_HOST/PORT/USER/PASSWORD (lihat skema.py).
+KONFIG_DB = {
+    **skema.KONFIG_DB,
+    'database': os.environ.get('IKLIM_DB_NAMA', 'iklim_indonesia'),
+}
+
+# Jumlah baris per batch executemany (INSERT multi-VALUES)
+UKURAN_BATCH = 5000
+
+# Jumlah baris CSV cuaca yang dibaca per chunk (memori tetap datar)
+UKURAN_CHUNK = 100000
+
+# Commit + simpan checkpoint setiap N baris cuaca (dibulatkan ke batas chunk)
+COMMIT_SETIAP = 100000
+
+# Satu baris checkpoint per file/partisi cuaca agar import bisa dilanjutkan
+SQL_BUAT_CHECKPOINT = """
+    CREATE TABLE IF NOT EXISTS checkpoint_import (
+        kunci VARCHAR(255) PRIMARY KEY,
+        nama_file VARCHAR(255) NOT NULL,
+        ukuran_file BIGINT NOT NULL,
+        waktu_ubah DOUBLE NOT NULL,
+        offset_byte BIGINT NOT NULL DEFAULT 0,
+        offset_baris BIGINT NOT NULL DEFAULT 0,
+        batch_terakhir INT NOT NULL DEFAULT 0,
+        selesai TINYINT(1) NOT NULL DEFAULT 0,
+        diperbarui TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB
+"""
+
+SQL_SIMPAN_CHECKPOINT = """
+    INSERT INTO checkpoint_import
+    (kunci, nama_file, ukuran_file, waktu_ubah, offset_byte, offset_baris, batch_terakhir, selesai)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        nama_file = VALUES(nama_file),
+        ukuran_file = VALUES(ukuran_file),
+        waktu_ubah = VALUES(waktu_ubah),
+        offset_byte = VALUES(offset_byte),
+        offset_baris = VALUES(offset_baris),
+        batch_terakhir = VALUES(batch_terakhir),
+        selesai = VALUES(selesai)
+"""
+
+SQL_INSERT_PROVINSI = """
+    INSERT IGNORE INTO provinsi (id_provinsi, nama_provinsi)
+    VALUES (%s, %s)
+"""
+
+SQL_INSERT_WILAYAH = """
+    INSERT IGNORE INTO wilayah (id_wilayah, nama_wilayah, id_provinsi)
+    VALUES (%s, %s, %s)
+"""
+
+SQL_INSERT_STASIUN = """
+    INSERT IGNORE INTO stasiun 
+    (id_stasiun, nama_stasiun, id_wilayah, lintang, bujur)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+SQL_INSERT_CUACA = """
+    INSERT IGNORE INTO observasi_cuaca 
+    (id_stasiun, tanggal, suhu_minimum, suhu_maksimum, suhu_rata_rata,
+     kelembaban_rata_rata, curah_hujan, durasi_sinar_matahari,
+     kecepatan_angin_maksimum, arah_angin_maksimum,
+     kecepatan_angin_rata_rata, kode_arah_angin)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+# Kolom observasi_cuaca yang diisi oleh import (urutan = urutan placeholder)
+KOLOM_DB_CUACA = ['id_stasiun', 'tanggal', 'suhu_minimum', 'suhu_maksimum', 'suhu_rata_rata',
+                  'kelembaban_rata_rata', 'curah_hujan', 'durasi_sinar_matahari',
+                  'kecepatan_angin_maksimum', 'arah_angin_maksimum',
+                  'kecepatan_angin_rata_rata', 'kode_arah_angin']
+
+# Tabel staging tanpa index untuk LOAD DATA (hanya hidup selama sesi);
+# CREATE TEMPORARY TABLE tidak melakukan commit implisit
+SQL_BUAT_STAGING = """
+    CREATE TEMPORARY TABLE IF NOT EXISTS staging_observasi_cuaca (
+        id_stasiun INT,
+        tanggal DATE,
+        suhu_minimum DOUBLE,
+        suhu_maksimum DOUBLE,
+        suhu_rata_rata DOUBLE,
+        kelembaban_rata_rata DOUBLE,
+        curah_hujan DOUBLE,
+        durasi_sinar_matahari DOUBLE,
+        kecepatan_angin_maksimum DOUBLE,
+        arah_angin_maksimum DOUBLE,
+        kecepatan_angin_rata_rata DOUBLE,
+        kode_arah_angin VARCHAR(10)
+    ) ENGINE=InnoDB
+"""
+
+SQL_LOAD_STAGING = f"""
+    LOAD DATA LOCAL INFILE %s
+    INTO TABLE staging_observasi_cuaca
+    FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+    LINES TERMINATED BY '\\n'
+    ({', '.join(KOLOM_DB_CUACA)})
+"""
+
+# INSERT IGNORE tetap melewati baris duplikat seperti jalur insert biasa
+SQL_GABUNG_STAGING = f"""
+    INSERT IGNORE INTO observasi_cuaca ({', '.join(KOLOM_DB_CUACA)})
+    SELECT {', '.join(KOLOM_DB_CUACA)} FROM staging_observasi_cuaca
+"""
+
+# duckdb = muat ke file DuckDB (backend tertanam, lihat backend.py), bukan MySQL
+MODE_IMPORT = ['insert', 'infile', 'duckdb']
+
+# Urutan kolom CSV cuaca sesuai urutan placeholder SQL_INSERT_CUACA
+KOLOM_CSV_CUACA = ['station_id', 'date', 'Tn', 'Tx', 'Tavg', 'RH_avg', 'RR',
+                   'ss', 'ff_x', 'ddd_x', 'ff_avg', 'ddd_car']
+
+# Semua kolom CSV dibaca sebagai teks (pandas tidak menebak tipe tiap chunk).
+# Konversi ke angka dilakukan di transformasi_chunk, supaya satu sel rusak
+# (mis. '-' di Tx) hanya menolak barisnya, bukan menggagalkan seluruh import.
+DTYPE_CUACA = {kolom: 'str' for kolom in KOLOM_CSV_CUACA}
+
+def buat_koneksi(mode='insert'):
+    """
+    Buka koneksi baru ke database (LOAD DATA LOCAL diizinkan untuk mode infile).
+    Sesi memakai READ COMMITTED: skema.segarkan_ringkasan harus melihat
+    observasi yang sudah di-commit worker lain.
+    """
+    conn = mysql.connector.connect(allow_local_infile=(mode == 'infile'), **KONFIG_DB)
+    cur = conn.cursor()
+    cur.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
+    cur.close()
+    return conn
+
+def memori_puncak_mb():
+    """Puncak memori (RSS) proses ini dalam MB, None jika tidak bisa diukur"""
+    if resource is not None:
+        puncak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux melaporkan KB, macOS melaporkan byte
+        return puncak / (1024 * 1024) if sys.platform == 'darwin' else puncak / 1024
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+# Batas atas bucket histogram latensi batch (milidetik); bucket terakhir = lebih dari itu
+BATAS_HISTOGRAM_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# Fase import yang diukur: parse CSV, transformasi, validasi, kirim ke server,
+# segarkan ringkasan bulanan/tahunan, commit
+FASE_IMPORT = ['dimensi', 'baca_csv', 'transformasi', 'validasi', 'kirim', 'ringkasan', 'commit', 'arsip']
+
+class InstrumenImport:
+    """Mencatat waktu per fase, latensi batch, dan baris ditolak selama import"""
+    
+    def __init__(self):
+        self.fase = {}
+        self.per_file = {}
+        self.histogram_batch = [0] * (len(BATAS_HISTOGRAM_MS) + 1)
+        self.jumlah_batch = 0
+        self.total_latensi_batch = 0.0
+        self.latensi_batch_maks = 0.0
+        self.ditolak = {}
+        self.pelanggaran = {}
+    
+    @staticmethod
+    def _tambah(tujuan, nama, detik, baris):
+        catatan = tujuan.setdefault(nama, {'detik': 0.0, 'baris': 0, 'panggilan': 0})
+        catatan['detik'] += detik
+        catatan['baris'] += baris
+        catatan['panggilan'] += 1
+    
+    @contextmanager
+    def ukur(self, nama_fase, label=None):
+        """
+        Ukur satu fase. Yield dict yang kunci 'baris'-nya boleh diisi
+        pemanggil dengan jumlah baris yang diproses fase itu.
+        """
+        catatan = {'baris': 0}
+        mulai = time.perf_counter()
+        try:
+            yield catatan
+        finally:
+            detik = time.perf_counter() - mulai
+            self._tambah(self.fase, nama_fase, detik, catatan['baris'])
+            if label is not None:
+                self._tambah(self.per_file.setdefault(label, {}), nama_fase, detik, catatan['baris'])
+    
+    def catat_batch(self, detik):
+        """Masukkan latensi satu batch ke histogram"""
+        ms = detik * 1000
+        indeks = next((i for i, batas in enumerate(BATAS_HISTOGRAM_MS) if ms <= batas),
+                      len(BATAS_HISTOGRAM_MS))
+        self.histogram_batch[indeks] += 1
+        self.jumlah_batch += 1
+        self.total_latensi_batch += detik
+        self.latensi_batch_maks = max(self.latensi_batch_maks, detik)
+    
+    def catat_ditolak(self, alasan_jumlah):
+        """Tambahkan jumlah baris ditolak per alasan"""
+        for alasan, jumlah in alasan_jumlah.items():
+            self.ditolak[alasan] = self.ditolak.get(alasan, 0) + int(jumlah)
+    
+    def catat_pelanggaran(self, pelanggaran):
+        """Tambahkan jumlah nilai yang dikosongkan oleh validasi_chunk"""
+        for kunci, jumlah in pelanggaran.items():
+            self.pelanggaran[kunci] = self.pelanggaran.get(kunci, 0) + int(jumlah)
+    
+    def gabung(self, data):
+        """Gabungkan hasil ke_dict() dari worker lain (import paralel)"""
+        for nama, c in data['fase'].items():
+            tujuan = self.fase.setdefault(nama, {'detik': 0.0, 'baris': 0, 'panggilan': 0})
+            for kunci in ('detik', 'baris', 'panggilan'):
+                tujuan[kunci] += c[kunci]
+        for label, fase in data['per_file'].items():
+            self.per_file[label] = {nama: {k: c[k] for k in ('detik', 'baris', 'panggilan')}
+                                    for nama, c in fase.items()}
+        batch = data['batch']
+        self.histogram_batch = [a + b for a, b in zip(self.histogram_batch, batch['histogram'])]
+        self.jumlah_batch += batch['jumlah']
+        self.total_latensi_batch += batch['total_detik']
+        self.latensi_batch_maks = max(self.latensi_batch_maks, batch['maks_ms'] / 1000)
+        self.catat_ditolak(data['ditolak'])
+        self.catat_pelanggaran(data.get('pelanggaran', {}))
+    
+    @staticmethod
+    def _dengan_kecepatan(fase):
+        return {
+            nama: dict(c, baris_per_detik=(c['baris'] / c['detik'] if c['detik'] > 0 else 0))
+            for nama, c in fase.items()
+        }
+    
+    def ke_dict(self):
+        """Laporan dalam bentuk dict yang bisa ditulis sebagai JSON"""
+        label_bucket = [f"<={b}ms" for b in BATAS_HISTOGRAM_MS] + [f">{BATAS_HISTOGRAM_MS[-1]}ms"]
+        return {
+            'fase': self._dengan_kecepatan(self.fase),
+            'per_file': {label: self._dengan_kecepatan(fase) for label, fase in self.per_file.items()},
+            'batch': {
+                'jumlah': self.jumlah_batch,
+                'total_detik': self.total_latensi_batch,
+                'rata_rata_ms': (self.total_latensi_batch / self.jumlah_batch * 1000
+                                 if self.jumlah_batch else 0),
+                'maks_ms': self.latensi_batch_maks * 1000,
+                'histogram': self.histogram_batch,
+                'bucket': label_bucket,
+            },
+            'ditolak': dict(self.ditolak),
+            'pelanggaran': dict(self.pelanggaran),
+        }
+    
+    def cetak_ringkasan(self):
+        """Ringkasan singkat di konsol: fase mana yang paling makan waktu"""
+        total = sum(c['detik'] for c in self.fase.values()) or 1
+        print(f"{'FASE':14} {'DETIK':>9} {'PORSI':>6} {'BARIS/DETIK':>12}")
+        for nama in FASE_IMPORT:
+            if nama in self.fase:
+                c = self.fase[nama]
+                kecepatan = c['baris'] / c['detik'] if c['detik'] > 0 and c['baris'] else 0
+                print(f"{nama:14} {c['detik']:>9,.1f} {c['detik'] / total:>6.0%} {kecepatan:>12,.0f}")
+        if self.jumlah_batch:
+            print(f"BATCH: {self.jumlah_batch:,} kali, rata-rata "
+                  f"{self.total_latensi_batch / self.jumlah_batch * 1000:,.1f} ms, "
+                  f"maks {self.latensi_batch_maks * 1000:,.1f} ms")
+        if self.ditolak:
+            print("DITOLAK: " + ', '.join(f"{a}={j:,}" for a, j in sorted(self.ditolak.items())))
+        if self.pelanggaran:
+            cetak_pelanggaran(self.pelanggaran)
+
+# Ekstensi input yang dikenali; format kolumnar butuh pyarrow, .zst butuh zstandard
+EKSTENSI_CSV = ('.csv', '.csv.gz', '.csv.zst')
+EKSTENSI_PARQUET = ('.parquet', '.pq')
+EKSTENSI_ARROW = ('.arrow', '.feather', '.ipc')
+
+# File cuaca default jika tidak ada yang diberikan lewat --file-cuaca
+FILE_CUACA_DEFAULT = ['climate_data.csv', '2021_2025.csv']
+
+def jenis_input(nama_file):
+    """Tentukan pembaca dari ekstensi file: 'csv', 'parquet', atau 'arrow'"""
+    nama = nama_file.lower()
+    if nama.endswith(EKSTENSI_PARQUET):
+        return 'parquet'
+    if nama.endswith(EKSTENSI_ARROW):
+        return 'arrow'
+    return 'csv'
+
+def buka_csv_biner(nama_file):
+    """Buka CSV biasa / gzip / zstd sebagai stream biner yang bisa dibaca per baris"""
+    nama = nama_file.lower()
+    if nama.endswith('.gz'):
+        return gzip.open(nama_file, 'rb')
+    if nama.endswith('.zst'):
+        import zstandard
+        mentah = open(nama_file, 'rb')
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(mentah, closefd=True))
+    return open(nama_file, 'rb')
+
+def lompat_ke(berkas, offset_byte):
+    """Pindah ke offset (tak terkompresi); stream zstd tidak bisa seek, jadi dibaca lalu dibuang"""
+    if berkas.seekable():
+        berkas.seek(offset_byte)
+        return
+    while berkas.tell() < offset_byte:
+        if not berkas.read(min(1 << 20, offset_byte - berkas.tell())):
+            break
+
+def baca_csv_bertahap(nama_file, ukuran_chunk=UKURAN_CHUNK, offset_byte=0, akhir_byte=None):
+    """
+    Generator chunk dari CSV cuaca (hanya kolom yang dipakai), juga untuk
+    .csv.gz dan .csv.zst yang didekompresi sambil jalan.
+    File dibaca per blok baris mentah supaya posisi byte setiap batas chunk
+    diketahui dan import bisa dilanjutkan dari offset_byte. Field CSV
+    diasumsikan tidak berisi baris baru (berlaku untuk data BMKG).
+    akhir_byte (awal baris, lihat bagi_rentang_baca) menghentikan pembacaan
+    di batas bagian file milik worker lain.
+
+    Yields:
+        tuple: (DataFrame chunk, offset byte setelah chunk, jumlah baris mentah)
+    """
+    with buka_csv_biner(nama_file) as berkas:
+        header = berkas.readline()
+        if offset_byte:
+            lompat_ke(berkas, offset_byte)
+        posisi = berkas.tell()
+        while akhir_byte is None or posisi < akhir_byte:
+            blok = list(itertools.islice(berkas, ukuran_chunk))
+            if not blok:
+                break
+            posisi = berkas.tell()
+            if akhir_byte is not None and posisi > akhir_byte:
+                # Buang baris yang dimulai di bagian berikutnya
+                while posisi > akhir_byte:
+                    posisi -= len(blok.pop())
+            df = pd.read_csv(
+                io.BytesIO(header + b''.join(blok)),
+                usecols=lambda kolom: kolom in DTYPE_CUACA,
+                dtype=DTYPE_CUACA
+            )
+            yield df, posisi, len(blok)
+
+def baca_kolumnar_bertahap(nama_file, ukuran_chunk=UKURAN_CHUNK, offset_baris=0, akhir_baris=None):
+    """
+    Generator chunk dari Parquet / Arrow IPC. Hanya kolom cuaca yang dipakai
+    yang dibaca (column pruning); row group / record batch sebelum
+    offset_baris dilewati tanpa didekode, dan pembacaan berhenti di
+    akhir_baris (batas bagian file worker lain, lihat bagi_rentang_baca).
+
+    Yields:
+        tuple: (DataFrame chunk, 0 (tidak ada offset byte), jumlah baris)
+    """
+    import pyarrow as pa
+    
+    if jenis_input(nama_file) == 'parquet':
+        import pyarrow.parquet as pq
+        berkas = pq.ParquetFile(nama_file, memory_map=True)
+        kolom = [k for k in berkas.schema_arrow.names if k in DTYPE_CUACA]
+        
+        # Lewati row group yang seluruhnya sudah diimport; mulai dari group
+        # pertama yang memuat offset_baris sampai group sebelum akhir_baris
+        row_group, awal_group, posisi_group = [], 0, 0
+        for i in range(berkas.num_row_groups):
+            if akhir_baris is not None and posisi_group >= akhir_baris:
+                break
+            jumlah = berkas.metadata.row_group(i).num_rows
+            if posisi_group + jumlah > offset_baris:
+                if not row_group:
+                    awal_group = posisi_group
+                row_group.append(i)
+            posisi_group += jumlah
+        batches = berkas.iter_batches(batch_size=ukuran_chunk, row_groups=row_group,
+                                      columns=kolom) if row_group else iter(())
+    else:
+        pembaca = pa.ipc.open_file(pa.memory_map(nama_file, 'r'))
+        kolom = [k for k in pembaca.schema.names if k in DTYPE_CUACA]
+        awal_group = 0
+        batches = (pembaca.get_batch(i).select(kolom) for i in range(pembaca.num_record_batches))
+    
+    posisi = awal_group
+    for batch in batches:
+        if akhir_baris is not None:
+            if posisi >= akhir_baris:
+                break
+            batch = batch.slice(0, akhir_baris - posisi)
+        # Potong sisa baris yang sudah diimport di dalam group pertama
+        if posisi < offset_baris:
+            lewati = min(offset_baris - posisi, batch.num_rows)
+            batch = batch.slice(lewati)
+            posisi += lewati
+        for awal in range(0, batch.num_rows, ukuran_chunk):
+            potongan = batch.slice(awal, ukuran_chunk)
+            posisi += potongan.num_rows
+            yield potongan.to_pandas(date_as_object=False), 0, potongan.num_rows
+
+def baca_cuaca_bertahap(nama_file, ukuran_chunk=UKURAN_CHUNK, offset_byte=0, offset_baris=0, akhir=None):
+    """
+    Pilih pembaca dari ekstensi file. CSV (biasa/gzip/zstd) dilanjutkan
+    dengan offset_byte, Parquet/Arrow dengan offset_baris; akhir adalah
+    batas bagian dalam satuan yang sama (byte atau baris).
+    """
+    if jenis_input(nama_file) == 'csv':
+        return baca_csv_bertahap(nama_file, ukuran_chunk, offset_byte, akhir)
+    return baca_kolumnar_bertahap(nama_file, ukuran_chunk, offset_baris, akhir)
+
+# Kolom numerik CSV cuaca (dikonversi ke angka di tahap transformasi)
+KOLOM_NUMERIK_CUACA = ['Tn', 'Tx', 'Tavg', 'RH_avg', 'RR', 'ss', 'ff_x', 'ddd_x', 'ff_avg']
+
+# Nama kolom CSV -> nama kolom observasi_cuaca
+PETA_KOLOM_CUACA = dict(zip(KOLOM_CSV_CUACA, KOLOM_DB_CUACA))
+
+# Pola tanggal yang diterima: d/m/yy atau d/m/yyyy, dan ISO yyyy-mm-dd (boleh diikuti jam)
+POLA_TANGGAL_GARING = r'^(?P<hari>\d{1,2})/(?P<bulan>\d{1,2})/(?P<tahun>\d{2}|\d{4})$'
+POLA_TANGGAL_ISO = r'^(?P<tahun>\d{4})-(?P<bulan>\d{1,2})-(?P<hari>\d{1,2})(?:[ T].*)?$'
+
+def normalisasi_tanggal(kolom_tanggal):
+    """
+    Normalisasi satu kolom tanggal sekaligus ke 'yyyy-mm-dd'.
+    Format d/m/yy (tahun 2 digit dianggap 20yy) dan ISO diterima.
+
+    Returns:
+        tuple: (Series tanggal, Series alasan penolakan; None jika valid)
+    """
+    if pd.api.types.is_datetime64_any_dtype(kolom_tanggal):
+        # Sudah bertipe tanggal (mis. dari Parquet hasil konversi)
+        alasan = pd.Series(None, index=kolom_tanggal.index, dtype='object')
+        alasan[kolom_tanggal.isna()] = 'tanggal_kosong'
+        return kolom_tanggal.dt.strftime('%Y-%m-%d').astype(object), alasan
+    
+    teks = kolom_tanggal.astype('string').str.strip()
+    bagian = teks.str.extract(POLA_TANGGAL_GARING)
+    iso = teks.str.extract(POLA_TANGGAL_ISO)
+    bagian = bagian.fillna(iso)
+    
+    tahun = bagian['tahun'].where(bagian['tahun'].str.len() != 2, '20' + bagian['tahun'])
+    hasil = tahun + '-' + bagian['bulan'].str.zfill(2) + '-' + bagian['hari'].str.zfill(2)
+    
+    # Tanggal kalender yang mustahil (mis. 31/02) juga ditolak
+    valid = pd.to_datetime(hasil, format='%Y-%m-%d', errors='coerce').notna()
+    
+    alasan = pd.Series(None, index=kolom_tanggal.index, dtype='object')
+    alasan[hasil.notna() & ~valid] = 'tanggal_tidak_valid'
+    alasan[hasil.isna()] = 'format_tanggal'
+    alasan[teks.isna() | (teks == '')] = 'tanggal_kosong'
+    return hasil.where(valid).astype(object), alasan
+
+def id_stasiun_angka(kolom):
+    """station_id teks -> Int64; bukan angka atau bukan bilangan bulat menjadi NA"""
+    angka = pd.to_numeric(kolom, errors='coerce')
+    return angka.where(angka % 1 == 0).astype('Int64')
+
+def transformasi_chunk(df_cuaca):
+    """
+    Tahap transformasi tervektorisasi untuk satu chunk: normalisasi tanggal,
+    konversi numerik, dan rename kolom CSV ke kolom observasi_cuaca.
+
+    Returns:
+        tuple: (DataFrame bersih dengan kolom KOLOM_DB_CUACA,
+                DataFrame baris ditolak dengan kolom tambahan 'alasan')
+    """
+    df = df_cuaca.reindex(columns=KOLOM_CSV_CUACA)
+    tanggal, alasan = normalisasi_tanggal(df['date'])
+    df['date'] = tanggal
+    
+    # Konversi numerik hanya perlu jika kolom belum bertipe angka
+    for kolom in KOLOM_NUMERIK_CUACA:
+        if not pd.api.types.is_numeric_dtype(df[kolom]):
+            angka = pd.to_numeric(df[kolom], errors='coerce')
+            gagal = df[kolom].notna() & angka.isna() & alasan.isna()
+            alasan[gagal] = f'bukan_angka:{kolom}'
+            df[kolom] = angka
+    
+    if not pd.api.types.is_numeric_dtype(df['station_id']):
+        angka = id_stasiun_angka(df['station_id'])
+        gagal = df['station_id'].notna() & angka.isna() & alasan.isna()
+        alasan[gagal] = 'bukan_angka:station_id'
+        df['station_id'] = angka
+    alasan[df['station_id'].isna() & alasan.isna()] = 'stasiun_kosong'
+    
+    ditolak = alasan.notna()
+    df_ditolak = df_cuaca[ditolak].assign(alasan=alasan[ditolak])
+    df_bersih = df[~ditolak].rename(columns=PETA_KOLOM_CUACA)
+    return df_bersih, df_ditolak
+
+# Nilai sentinel BMKG: 8888 = tidak terukur, 9999 = tidak ada data
+NILAI_SENTINEL = [8888.0, 9999.0]
+
+# Rentang nilai yang masih masuk akal secara fisik (inklusif) per kolom observasi_cuaca
+RENTANG_VALID = {
+    'suhu_minimum': (-10.0, 45.0),
+    'suhu_maksimum': (-10.0, 50.0),
+    'suhu_rata_rata': (-10.0, 45.0),
+    'kelembaban_rata_rata': (0.0, 100.0),
+    'curah_hujan': (0.0, 1000.0),
+    'durasi_sinar_matahari': (0.0, 24.0),
+    'kecepatan_angin_maksimum': (0.0, 100.0),
+    'arah_angin_maksimum': (0.0, 360.0),
+    'kecepatan_angin_rata_rata': (0.0, 100.0),
+}
+KOLOM_VALIDASI = list(RENTANG_VALID)
+BATAS_BAWAH = np.array([RENTANG_VALID[k][0] for k in KOLOM_VALIDASI])
+BATAS_ATAS = np.array([RENTANG_VALID[k][1] for k in KOLOM_VALIDASI])
+INDEKS_SUHU = [KOLOM_VALIDASI.index(k) for k in ['suhu_minimum', 'suhu_rata_rata', 'suhu_maksimum']]
+
+def validasi_chunk(df_bersih):
+    """
+    Validasi tervektorisasi untuk satu chunk hasil transformasi_chunk.
+    Semua kolom diperiksa sekaligus sebagai satu array NumPy:
+    sentinel 8888/9999 dan nilai di luar RENTANG_VALID dijadikan NULL,
+    lalu ketiga kolom suhu dikosongkan jika Tn <= Tavg <= Tx dilanggar.
+    Barisnya tetap diimport, hanya nilai yang salah yang dibuang.
+
+    Returns:
+        tuple: (DataFrame tervalidasi, dict jumlah pelanggaran per
+                'sentinel:<kolom>', 'rentang:<kolom>', dan 'urutan_suhu')
+    """
+    nilai = df_bersih[KOLOM_VALIDASI].to_numpy(dtype='float64', copy=True)
+    
+    sentinel = np.isin(nilai, NILAI_SENTINEL)
+    nilai[sentinel] = np.nan
+    
+    with np.errstate(invalid='ignore'):
+        luar = (nilai < BATAS_BAWAH) | (nilai > BATAS_ATAS)
+        nilai[luar] = np.nan
+        
+        # Perbandingan dengan NaN selalu False, jadi suhu yang kosong tidak dihitung
+        tn, tavg, tx = (nilai[:, i] for i in INDEKS_SUHU)
+        tidak_urut = (tn > tx) | (tn > tavg) | (tavg > tx)
+    nilai[np.ix_(tidak_urut, INDEKS_SUHU)] = np.nan
+    
+    df_bersih[KOLOM_VALIDASI] = nilai
+    
+    pelanggaran = {}
+    for kolom, jumlah_sentinel, jumlah_luar in zip(KOLOM_VALIDASI, sentinel.sum(axis=0), luar.sum(axis=0)):
+        if jumlah_sentinel:
+            pelanggaran[f'sentinel:{kolom}'] = int(jumlah_sentinel)
+        if jumlah_luar:
+            pelanggaran[f'rentang:{kolom}'] = int(jumlah_luar)
+    if tidak_urut.any():
+        pelanggaran['urutan_suhu'] = int(tidak_urut.sum())
+    return df_bersih, pelanggaran
+
+def cetak_pelanggaran(pelanggaran):
+    """Tabel jumlah nilai yang dikosongkan validasi, per kolom dan jenis"""
+    print(f"{'KOLOM':26} {'SENTINEL':>10} {'RENTANG':>10}")
+    for kolom in KOLOM_VALIDASI:
+        jumlah_sentinel = pelanggaran.get(f'sentinel:{kolom}', 0)
+        jumlah_luar = pelanggaran.get(f'rentang:{kolom}', 0)
+        if jumlah_sentinel or jumlah_luar:
+            print(f"{kolom:26} {jumlah_sentinel:>10,} {jumlah_luar:>10,}")
+    if pelanggaran.get('urutan_suhu'):
+        print(f"URUTAN SUHU (Tn <= Tavg <= Tx dilanggar): {pelanggaran['urutan_suhu']:,} baris")
+
+def nama_file_ditolak(label):
+    """Nama file laporan baris ditolak untuk satu file/partisi"""
+    aman = ''.join(c if c.isalnum() or c in '._-' else '_' for c in label)
+    return f"ditolak_{aman}.csv"
+
+def tulis_ditolak(df_ditolak, nama_file):
+    """Tambahkan baris ditolak ke file laporan (header hanya ditulis sekali)"""
+    if df_ditolak.empty:
+        return
+    df_ditolak.to_csv(nama_file, mode='a', index=False,
+                      header=not os.path.exists(nama_file))
+
+def konversi_ke_parquet(file_csv, file_parquet=None, ukuran_chunk=UKURAN_CHUNK):
+    """
+    Ubah CSV cuaca mentah menjadi Parquet bertipe (sekali saja), supaya
+    import berikutnya tidak perlu parsing CSV lagi. Tanggal disimpan
+    sebagai date32 yang sudah dinormalisasi; baris yang gagal
+    ditransformasi ditulis ke file ditolak seperti saat import.
+
+    Returns:
+        tuple: (path Parquet, jumlah baris ditulis, jumlah baris ditolak)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    if file_parquet is None:
+        dasar = os.path.basename(file_csv)
+        for ekstensi in ('.gz', '.zst', '.csv'):
+            if dasar.lower().endswith(ekstensi):
+                dasar = dasar[:-len(ekstensi)]
+        file_parquet = os.path.join(os.path.dirname(file_csv), dasar + '.parquet')
+    
+    skema = pa.schema(
+        [('station_id', pa.int32()), ('date', pa.date32())]
+        + [(k, pa.float64()) for k in KOLOM_NUMERIK_CUACA]
+        + [('ddd_car', pa.string())]
+    )
+    kembali_ke_csv = {db: csv for csv, db in PETA_KOLOM_CUACA.items()}
+    file_ditolak = nama_file_ditolak(os.path.basename(file_parquet))
+    if os.path.exists(file_ditolak):
+        os.remove(file_ditolak)
+    
+    tertulis, ditolak = 0, 0
+    with pq.ParquetWriter(file_parquet, skema, compression='zstd') as penulis:
+        for df, _, _ in baca_csv_bertahap(file_csv, ukuran_chunk):
+            df_bersih, df_ditolak = transformasi_chunk(df)
+            tulis_ditolak(df_ditolak, file_ditolak)
+            ditolak += len(df_ditolak)
+            
+            df_bersih = df_bersih.rename(columns=kembali_ke_csv)
+            df_bersih['date'] = pd.to_datetime(df_bersih['date'], format='%Y-%m-%d').dt.date
+            tabel = pa.Table.from_pandas(df_bersih[skema.names], schema=skema, preserve_index=False)
+            penulis.write_table(tabel, row_group_size=ukuran_chunk)
+            tertulis += len(df_bersih)
+    
+    return file_parquet, tertulis, ditolak
+
+def siapkan_checkpoint(cur, ulang=False):
+    """Buat tabel checkpoint_import; kosongkan jika import diulang dari awal"""
+    cur.execute(SQL_BUAT_CHECKPOINT)
+    if ulang:
+        cur.execute("DELETE FROM checkpoint_import")
+
+def baca_checkpoint(cur, kunci, nama_file):
+    """
+    Ambil checkpoint yang masih berlaku untuk file ini. Checkpoint dianggap
+    basi (return None) jika ukuran atau waktu ubah file sudah berbeda.
+    """
+    cur.execute("""
+        SELECT ukuran_file, waktu_ubah, offset_byte, offset_baris, batch_terakhir, selesai
+        FROM checkpoint_import WHERE kunci = %s
+    """, (kunci,))
+    baris = cur.fetchone()
+    if baris is None:
+        return None
+    
+    info = os.stat(nama_file)
+    ukuran_file, waktu_ubah, offset_byte, offset_baris, batch_terakhir, selesai = baris
+    if ukuran_file != info.st_size or abs(waktu_ubah - info.st_mtime) > 1e-3:
+        return None
+    return {
+        'offset_byte': offset_byte,
+        'offset_baris': offset_baris,
+        'batch_terakhir': batch_terakhir,
+        'selesai': bool(selesai),
+    }
+
+def simpan_checkpoint(cur, kunci, nama_file, offset_byte, offset_baris, batch_terakhir, selesai=False):
+    """Simpan posisi terakhir yang ter-commit (dijalankan dalam transaksi data yang sama)"""
+    info = os.stat(nama_file)
+    cur.execute(SQL_SIMPAN_CHECKPOINT, (
+        kunci, os.path.basename(nama_file), info.st_size, info.st_mtime,
+        offset_byte, offset_baris, batch_terakhir, int(selesai)
+    ))
+
+def ke_tuple(df, kolom):
+    """Bangun list tuple parameter dari kolom utuh (NaN -> None)"""
+    data = df.reindex(columns=kolom).astype(object)
+    data = data.where(data.notna(), None)
+    return list(zip(*(data[k].tolist() for k in kolom)))
+
+def sisipkan_batch(cur, sql, data, ukuran_batch=UKURAN_BATCH, instrumen=None):
+    """
+    Kirim data dengan executemany per batch.
+    mysql.connector menulis ulang INSERT ... VALUES menjadi satu
+    statement multi-VALUES, jadi satu batch = satu round trip.
+    Jika satu batch gagal, batch itu diulang per baris supaya baris rusak
+    tetap dilewati seperti sebelumnya.
+
+    Returns:
+        tuple: (jumlah baris yang berhasil dikirim, jumlah baris yang benar-benar
+               ditambahkan; INSERT IGNORE melewati baris yang sudah ada)
+    """
+    terkirim = 0
+    baru = 0
+    for awal in range(0, len(data), ukuran_batch):
+        batch = data[awal:awal + ukuran_batch]
+        mulai = time.perf_counter()
+        try:
+            cur.executemany(sql, batch)
+            terkirim += len(batch)
+            baru += max(cur.rowcount, 0)
+        except mysql.connector.Error:
+            for baris in batch:
+                try:
+                    cur.execute(sql, baris)
+                    terkirim += 1
+                    baru += max(cur.rowcount, 0)
+                except mysql.connector.Error:
+                    continue
+        if instrumen is not None:
+            instrumen.catat_batch(time.perf_counter() - mulai)
+    return terkirim, baru
+
+def local_infile_aktif(cur):
+    """Cek apakah server mengizinkan LOAD DATA LOCAL INFILE"""
+    try:
+        cur.execute("SELECT @@GLOBAL.local_infile")
+        return bool(int(cur.fetchone()[0]))
+    except mysql.connector.Error:
+        return False
+
+def muat_cuaca_insert(cur, df_cuaca, ukuran_batch=UKURAN_BATCH, instrumen=None):
+    """
+    Muat observasi lewat INSERT IGNORE batch.
+
+    Returns:
+        tuple: (jumlah baris terkirim, jumlah baris baru di observasi_cuaca)
+    """
+    data_cuaca = ke_tuple(df_cuaca, KOLOM_DB_CUACA)
+    return sisipkan_batch(cur, SQL_INSERT_CUACA, data_cuaca, ukuran_batch, instrumen)
+
+def muat_cuaca_infile(cur, df_cuaca, instrumen=None):
+    """
+    Muat observasi lewat file sementara + LOAD DATA LOCAL INFILE ke tabel
+    staging, lalu digabung ke observasi_cuaca dengan satu INSERT IGNORE ... SELECT.
+    Staging dikosongkan dengan DELETE, bukan TRUNCATE: TRUNCATE adalah DDL
+    yang melakukan commit implisit, sehingga batch akan ter-commit tanpa
+    checkpoint dan ringkasannya di tengah transaksi import_file_cuaca.
+
+    Returns:
+        tuple: (jumlah baris di staging, jumlah baris baru di observasi_cuaca)
+    """
+    data = df_cuaca.reindex(columns=KOLOM_DB_CUACA)
+    
+    berkas = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False,
+                                         encoding='utf-8', newline='')
+    try:
+        data.to_csv(berkas, header=False, index=False, na_rep='\\N', lineterminator='\n')
+        berkas.close()
+        
+        mulai = time.perf_counter()
+        cur.execute(SQL_BUAT_STAGING)
+        cur.execute("DELETE FROM staging_observasi_cuaca")
+        cur.execute(SQL_LOAD_STAGING, (berkas.name.replace('\\', '/'),))
+        cur.execute("SELECT COUNT(*) FROM staging_observasi_cuaca")
+        jumlah_staging = cur.fetchone()[0]
+        
+        cur.execute(SQL_GABUNG_STAGING)
+        jumlah_baru = cur.rowcount
+        cur.execute("DELETE FROM staging_observasi_cuaca")
+        if instrumen is not None:
+            instrumen.catat_batch(time.perf_counter() - mulai)
+        return jumlah_staging, jumlah_baru
+    finally:
+        berkas.close()
+        os.remove(berkas.name)
+
+def bagi_rentang_stasiun(file_stasiun, jumlah):
+    """
+    Bagi station_id dari station_detail.csv menjadi `jumlah` rentang
+    (min, maks) inklusif dengan jumlah stasiun yang kira-kira sama.
+    Rentang pertama dan terakhir dibuka (None) agar stasiun yang tidak
+    terdaftar tetap ikut terimport.
+    
+    Hanya dipakai untuk CSV gzip/zstd yang tidak bisa dibagi per byte
+    (lihat bagi_rentang_baca): setiap worker tetap membaca dan mem-parse
+    seluruh file lalu membuang baris di luar rentangnya, jadi yang
+    dipercepat hanya tahap transformasi/validasi/muat.
+    """
+    if jumlah <= 1 or not os.path.exists(file_stasiun):
+        return [(None, None)]
+    
+    id_stasiun = sorted(int(i) for i in pd.read_csv(file_stasiun, usecols=['station_id'])['station_id'].dropna().unique())
+    jumlah = min(jumlah, len(id_stasiun))
+    if jumlah <= 1:
+        return [(None, None)]
+    
+    batas = [id_stasiun[len(id_stasiun) * i // jumlah] for i in range(1, jumlah)]
+    bawah = [None] + batas
+    atas = [b - 1 for b in batas] + [None]
+    return list(zip(bawah, atas))
+
+def bagi_rentang_baca(nama_file, jumlah):
+    """
+    Bagi satu file cuaca menjadi `jumlah` rentang baca (awal, akhir) yang
+    tidak tumpang tindih, sehingga setiap worker hanya membaca dan mem-parse
+    bagiannya sendiri. CSV biasa dibagi per byte dengan batas digeser ke
+    awal baris berikutnya; Parquet per row group dan Arrow per record batch
+    (dalam nomor baris). akhir None = sampai akhir file.
+    Dua worker boleh memuat stasiun-bulan yang sama: ringkasannya dihitung
+    ulang bergantian di bawah kunci per stasiun (skema.kunci_ringkasan).
+    
+    Returns:
+        list: Rentang (awal, akhir), [(None, None)] jika file tidak perlu
+              dibagi, atau None jika file tidak bisa dibuka di tengah
+              (CSV gzip/zstd; pakai bagi_rentang_stasiun).
+    """
+    if jumlah <= 1:
+        return [(None, None)]
+    
+    jenis = jenis_input(nama_file)
+    if jenis == 'csv':
+        if not nama_file.lower().endswith('.csv'):
+            return None
+        ukuran = os.path.getsize(nama_file)
+        batas = set()
+        with open(nama_file, 'rb') as berkas:
+            berkas.readline()
+            awal_data = berkas.tell()
+            for i in range(1, jumlah):
+                # Mundur satu byte lalu habiskan baris: posisi jatuh di awal baris
+                berkas.seek(awal_data + (ukuran - awal_data) * i // jumlah - 1)
+                berkas.readline()
+                if berkas.tell() < ukuran:
+                    batas.add(berkas.tell())
+    else:
+        import pyarrow as pa
+        if jenis == 'parquet':
+            import pyarrow.parquet as pq
+            metadata = pq.ParquetFile(nama_file).metadata
+            ukuran_group = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        else:
+            pembaca = pa.ipc.open_file(pa.memory_map(nama_file, 'r'))
+            ukuran_group = [pembaca.get_batch(i).num_rows for i in range(pembaca.num_record_batches)]
+        awal_group = list(itertools.accumulate(ukuran_group, initial=0))[:-1]
+        total = sum(ukuran_group)
+        # Batas di awal group terdekat dari setiap 1/jumlah total baris
+        batas = {min(awal_group, key=lambda a: abs(a - total * i // jumlah)) for i in range(1, jumlah)}
+        batas.discard(0)
+    
+    if not batas:
+        return [(None, None)]
+    batas = sorted(batas)
+    return list(zip([0] + batas, batas + [None]))
+
+def label_partisi(nama_file, rentang_stasiun=(None, None), rentang_baca=(None, None)):
+    """
+    Nama partisi untuk ringkasan dan kunci checkpoint, mis.
+    climate_data.csv[96001-96745] (rentang stasiun) atau
+    climate_data.csv@1048576-2097152 (rentang byte/baris).
+    """
+    label = nama_file
+    bawah, atas = rentang_stasiun
+    if bawah is not None or atas is not None:
+        label += f"[{'' if bawah is None else bawah}-{'' if atas is None else atas}]"
+    awal, akhir = rentang_baca
+    if awal is not None or akhir is not None:
+        label += f"@{awal or 0}-{'' if akhir is None else akhir}"
+    return label
+
+def stasiun_bulan_chunk(df_cuaca):
+    """Pasangan (id_stasiun, 'YYYY-MM') unik dalam satu chunk hasil transformasi"""
+    pasangan = pd.DataFrame({'id_stasiun': df_cuaca['id_stasiun'], 'bulan': df_cuaca['tanggal'].str[:7]})
+    return set(pasangan.drop_duplicates().itertuples(index=False, name=None))
+
+def segarkan_ringkasan_tersentuh(cur, stasiun_bulan, instrumen, label):
+    """
+    Perbarui ringkasan stasiun-bulan yang dimuat sejak commit terakhir.
+
+    Returns:
+        set: Stasiun yang dikunci; lepaskan dengan skema.lepas_kunci_ringkasan
+             setelah commit.
+    """
+    stasiun = {s for s, _ in stasiun_bulan}
+    with instrumen.ukur('ringkasan', label) as fase:
+        fase['baris'] = skema.segarkan_ringkasan(cur, stasiun_bulan)
+    stasiun_bulan.clear()
+    return stasiun
+
+def import_file_cuaca(conn, nama_file, mode='insert', ukuran_batch=UKURAN_BATCH,
+                      ukuran_chunk=UKURAN_CHUNK, rentang_stasiun=(None, None),
+                      commit_setiap=COMMIT_SETIAP, instrumen=None, validasi=True,
+                      rentang_baca=(None, None)):
+    """
+    Import satu file cuaca chunk demi chunk: baca, ubah, validasi, muat, lalu lepas.
+    Import paralel membatasi setiap worker dengan rentang_baca (awal, akhir)
+    dari bagi_rentang_baca, atau untuk CSV terkompresi dengan rentang_stasiun
+    (hanya baris dengan station_id di rentang itu yang dimuat). Baris yang gagal
+    ditransformasi ditulis ke ditolak_<partisi>.csv beserta alasannya.
+
+    Setiap kira-kira commit_setiap baris, data di-commit bersama checkpoint
+    (offset byte/baris dan nomor batch) sehingga import yang terhenti
+    dilanjutkan dari posisi itu tanpa membaca ulang baris yang sudah masuk.
+    Waktu setiap fase dicatat ke `instrumen` (InstrumenImport) jika diberikan.
+    Jika validasi=True, sentinel dan nilai mustahil dikosongkan (validasi_chunk).
+    Partisi tahunan yang belum ada dibuat sebelum chunk dikirim.
+    Ringkasan bulanan/tahunan stasiun-bulan yang dimuat diperbarui dalam
+    transaksi yang sama dengan setiap commit (skema.segarkan_ringkasan).
+
+    Returns:
+        dict: baris (baru di observasi_cuaca), baris_dikirim (termasuk
+              duplikat yang dilewati INSERT IGNORE), ditolak, alasan_ditolak (jumlah per alasan),
+              pelanggaran (jumlah nilai dikosongkan validasi), mode (yang
+              dipakai setelah fallback), file_ditolak, dilanjutkan.
+    """
+    if instrumen is None:
+        instrumen = InstrumenImport()
+    cur = conn.cursor()
+    bawah, atas = rentang_stasiun
+    awal, akhir = rentang_baca
+    # Awal bagian: posisi byte untuk CSV, posisi baris untuk Parquet/Arrow
+    # (offset_baris Parquet/Arrow adalah posisi di file, bukan hitungan bagian)
+    input_csv = jenis_input(nama_file) == 'csv'
+    baris_awal = 0 if input_csv else (awal or 0)
+    label = label_partisi(nama_file, rentang_stasiun, rentang_baca)
+    file_ditolak = nama_file_ditolak(label)
+    
+    checkpoint = baca_checkpoint(cur, label, nama_file)
+    if checkpoint and checkpoint['selesai']:
+        print(f"⏭️ {label} sudah selesai diimport sebelumnya, dilewati")
+        cur.close()
+        return {'baris': 0, 'baris_dikirim': 0, 'ditolak': 0, 'alasan_ditolak': {}, 'pelanggaran': {},
+                'mode': mode, 'file_ditolak': None,
+                'dilanjutkan': checkpoint['offset_baris'] - baris_awal}
+    
+    offset_byte = (awal or 0) if input_csv else 0
+    offset_baris, batch_ke = baris_awal, 0
+    if checkpoint:
+        offset_byte = checkpoint['offset_byte']
+        offset_baris = checkpoint['offset_baris']
+        batch_ke = checkpoint['batch_terakhir']
+        print(f"↪️ {label} dilanjutkan dari baris {offset_baris - baris_awal:,} (batch {batch_ke})")
+    elif os.path.exists(file_ditolak):
+        os.remove(file_ditolak)
+    
+    baris_diimport = 0  # benar-benar baru di observasi_cuaca
+    baris_dikirim = 0   # terkirim ke server, termasuk duplikat yang di-IGNORE
+    belum_commit = 0
+    alasan_ditolak = {}
+    pelanggaran = {}
+    # Stasiun-bulan yang dimuat tetapi ringkasannya belum diperbarui
+    stasiun_bulan = set()
+    # Tahun yang sudah dipastikan punya partisi (None = tabel tidak berpartisi)
+    info_partisi = skema.partisi_tahun(cur)
+    tahun_siap = info_partisi[0] if info_partisi else None
+    pembaca = baca_cuaca_bertahap(nama_file, ukuran_chunk, offset_byte, offset_baris, akhir)
+    while True:
+        with instrumen.ukur('baca_csv', label) as fase:
+            chunk = next(pembaca, None)
+            if chunk is not None:
+                fase['baris'] = chunk[2]
+        if chunk is None:
+            break
+        df_cuaca, offset_byte, jumlah_mentah = chunk
+        del chunk
+        offset_baris += jumlah_mentah
+        
+        with instrumen.ukur('transformasi', label) as fase:
+            fase['baris'] = len(df_cuaca)
+            if bawah is not None or atas is not None:
+                # station_id yang bukan angka ikut rentang pertama (bawah None)
+                # supaya ditolak tepat sekali, bukan hilang di semua worker
+                id_angka = id_stasiun_angka(df_cuaca['station_id'])
+                masuk = id_angka.notna()
+                if bawah is not None:
+                    masuk &= (id_angka >= bawah).fillna(False)
+                if atas is not None:
+                    masuk &= (id_angka <= atas).fillna(False)
+                if bawah is None:
+                    masuk |= id_angka.isna()
+                df_cuaca = df_cuaca[masuk.to_numpy(dtype=bool)]
+            
+            df_cuaca, df_ditolak = transformasi_chunk(df_cuaca)
+            if not df_ditolak.empty:
+                tulis_ditolak(df_ditolak, file_ditolak)
+                jumlah_per_alasan = df_ditolak['alasan'].value_counts().to_dict()
+                instrumen.catat_ditolak(jumlah_per_alasan)
+                for alasan, jumlah in jumlah_per_alasan.items():
+                    alasan_ditolak[alasan] = alasan_ditolak.get(alasan, 0) + int(jumlah)
+            del df_ditolak
+        
+        if validasi:
+            with instrumen.ukur('validasi', label) as fase:
+                fase['baris'] = len(df_cuaca)
+                df_cuaca, pelanggaran_chunk = validasi_chunk(df_cuaca)
+                instrumen.catat_pelanggaran(pelanggaran_chunk)
+                for kunci, jumlah in pelanggaran_chunk.items():
+                    pelanggaran[kunci] = pelanggaran.get(kunci, 0) + jumlah
+        
+        with instrumen.ukur('kirim', label) as fase:
+            fase['baris'] = len(df_cuaca)
+            if tahun_siap is not None and len(df_cuaca):
+                tahun_chunk = set(df_cuaca['tanggal'].str[:4].astype(int).unique())
+                if not tahun_chunk <= tahun_siap:
+                    # Commit dulu supaya transaksi ini tidak menahan metadata lock
+                    # observasi_cuaca sementara worker lain menunggu GET_LOCK partisi.
+                    # Baris yang ter-commit tanpa checkpoint aman diulang (INSERT IGNORE).
+                    conn.commit()
+                    tahun_siap |= skema.pastikan_partisi_tahun(cur, tahun_chunk) | tahun_chunk
+            if mode == 'infile':
+                try:
+                    jumlah_staging, baris_baru = muat_cuaca_infile(cur, df_cuaca, instrumen)
+                    baris_dikirim += jumlah_staging
+                    baris_diimport += baris_baru
+                except mysql.connector.Error as e:
+                    print(f"⚠️ LOAD DATA gagal ({e}), kembali ke mode insert")
+                    mode = 'insert'
+            if mode == 'insert':
+                terkirim, baris_baru = muat_cuaca_insert(cur, df_cuaca, ukuran_batch, instrumen)
+                baris_dikirim += terkirim
+                baris_diimport += baris_baru
+            if len(df_cuaca):
+                stasiun_bulan |= stasiun_bulan_chunk(df_cuaca)
+        
+        belum_commit += jumlah_mentah
+        del df_cuaca
+        if belum_commit >= commit_setiap:
+            terkunci = segarkan_ringkasan_tersentuh(cur, stasiun_bulan, instrumen, label)
+            with instrumen.ukur('commit', label) as fase:
+                fase['baris'] = belum_commit
+                batch_ke += 1
+                simpan_checkpoint(cur, label, nama_file, offset_byte, offset_baris, batch_ke)
+                conn.commit()
+            skema.lepas_kunci_ringkasan(cur, terkunci)
+            belum_commit = 0
+        print(f"  {label} diproses: {baris_dikirim:,} baris dikirim, {baris_diimport:,} baris baru")
+    
+    terkunci = segarkan_ringkasan_tersentuh(cur, stasiun_bulan, instrumen, label)
+    with instrumen.ukur('commit', label) as fase:
+        fase['baris'] = belum_commit
+        batch_ke += 1
+        simpan_checkpoint(cur, label, nama_file, offset_byte, offset_baris, batch_ke, selesai=True)
+        conn.commit()
+    skema.lepas_kunci_ringkasan(cur, terkunci)
+    cur.close()
+    
+    total_ditolak = sum(alasan_ditolak.values())
+    if total_ditolak:
+        rincian = ', '.join(f"{a}={j:,}" for a, j in sorted(alasan_ditolak.items()))
+        print(f"⚠️ {label}: {total_ditolak:,} baris ditolak ({rincian}) -> {file_ditolak}")
+    if pelanggaran:
+        print(f"⚠️ {label}: {sum(pelanggaran.values()):,} nilai dikosongkan oleh validasi")
+    
+    return {
+        'baris': baris_diimport,
+        'baris_dikirim': baris_dikirim,
+        'ditolak': total_ditolak,
+        'alasan_ditolak': alasan_ditolak,
+        'pelanggaran': pelanggaran,
+        'mode': mode,
+        'file_ditolak': file_ditolak if total_ditolak else None,
+        'dilanjutkan': checkpoint['offset_baris'] - baris_awal if checkpoint else 0,
+    }
+
+def periksa_file_cuaca(nama_file, ukuran_chunk=UKURAN_CHUNK, instrumen=None):
+    """
+    Dry run satu file cuaca: baca, transformasi, dan validasi chunk demi
+    chunk persis seperti import, tetapi tanpa koneksi database, tanpa
+    checkpoint, dan tanpa menulis file ditolak.
+
+    Returns:
+        dict: baris (yang akan diimport), ditolak, alasan_ditolak, pelanggaran.
+    """
+    if instrumen is None:
+        instrumen = InstrumenImport()
+    baris_valid = 0
+    alasan_ditolak = {}
+    pelanggaran = {}
+    pembaca = baca_cuaca_bertahap(nama_file, ukuran_chunk)
+    while True:
+        with instrumen.ukur('baca_csv', nama_file) as fase:
+            chunk = next(pembaca, None)
+            if chunk is not None:
+                fase['baris'] = chunk[2]
+        if chunk is None:
+            break
+        df_cuaca = chunk[0]
+        del chunk
+        
+        with instrumen.ukur('transformasi', nama_file) as fase:
+            fase['baris'] = len(df_cuaca)
+            df_cuaca, df_ditolak = transformasi_chunk(df_cuaca)
+            jumlah_per_alasan = df_ditolak['alasan'].value_counts().to_dict()
+            instrumen.catat_ditolak(jumlah_per_alasan)
+            for alasan, jumlah in jumlah_per_alasan.items():
+                alasan_ditolak[alasan] = alasan_ditolak.get(alasan, 0) + int(jumlah)
+            del df_ditolak
+        
+        with instrumen.ukur('validasi', nama_file) as fase:
+            fase['baris'] = len(df_cuaca)
+            _, pelanggaran_chunk = validasi_chunk(df_cuaca)
+            instrumen.catat_pelanggaran(pelanggaran_chunk)
+            for kunci, jumlah in pelanggaran_chunk.items():
+                pelanggaran[kunci] = pelanggaran.get(kunci, 0) + jumlah
+        
+        baris_valid += len(df_cuaca)
+        del df_cuaca
+    
+    return {
+        'baris': baris_valid,
+        'ditolak': sum(alasan_ditolak.values()),
+        'alasan_ditolak': alasan_ditolak,
+        'pelanggaran': pelanggaran,
+    }
+
+def dry_run_cuaca(daftar_file, ukuran_chunk=UKURAN_CHUNK, file_laporan=None):
+    """
+    Periksa file cuaca tanpa menulis apa pun ke database, lalu tampilkan
+    jumlah baris ditolak dan jumlah pelanggaran validasi per kolom.
+
+    Returns:
+        dict: Ringkasan per file dan total (ditulis ke JSON jika file_laporan diisi).
+    """
+    print("Dry run: membaca dan memvalidasi data cuaca tanpa menulis ke database...")
+    waktu_mulai = time.perf_counter()
+    waktu_mulai_iso = datetime.now().isoformat(timespec='seconds')
+    instrumen = InstrumenImport()
+    
+    per_file = {}
+    for nama_file in daftar_file:
+        if not os.path.exists(nama_file):
+            print(f"⚠️ {nama_file} tidak ditemukan, dilewati")
+            continue
+        print(f"\nMemeriksa {nama_file}...")
+        per_file[nama_file] = periksa_file_cuaca(nama_file, ukuran_chunk, instrumen)
+        print(f"✅ {per_file[nama_file]['baris']:,} baris lolos, "
+              f"{per_file[nama_file]['ditolak']:,} ditolak")
+    
+    durasi = time.perf_counter() - waktu_mulai
+    total_baris = sum(h['baris'] for h in per_file.values())
+    
+    print("\n" + "=" * 50)
+    print("RINGKASAN DRY RUN:")
+    print("=" * 50)
+    print(f"BARIS AKAN DIIMPORT: {total_baris:,}")
+    print(f"TOTAL DITOLAK      : {sum(instrumen.ditolak.values()):,}")
+    print(f"NILAI DIKOSONGKAN  : {sum(instrumen.pelanggaran.values()):,}")
+    print(f"WAKTU TOTAL        : {durasi:,.1f} detik")
+    print("=" * 50)
+    instrumen.cetak_ringkasan()
+    print("=" * 50)
+    
+    ringkasan = {
+        'waktu_mulai': waktu_mulai_iso,
+        'dry_run': True,
+        'ukuran_chunk': ukuran_chunk,
+        'baris': total_baris,
+        'ditolak': sum(instrumen.ditolak.values()),
+        'detik_total': durasi,
+        'baris_per_detik': total_baris / durasi if durasi > 0 else 0,
+        'memori_puncak_mb': memori_puncak_mb(),
+        'per_file': per_file,
+        'instrumentasi': instrumen.ke_dict(),
+    }
+    
+    # Dry run tidak menulis file apa pun kecuali laporan diminta lewat --laporan
+    if file_laporan:
+        with open(file_laporan, 'w', encoding='utf-8') as berkas:
+            json.dump(ringkasan, berkas, indent=2, default=str)
+        print(f"📄 Laporan dry run: {file_laporan}")
+    return ringkasan
+
+def import_partisi(tugas):
+    """
+    Worker import paralel: satu partisi (file, rentang baca atau rentang
+    stasiun) dengan koneksi database sendiri. Harus di level modul agar
+    bisa di-pickle.
+
+    Returns:
+        dict: Ringkasan partisi (label, baris, ditolak, detik, mode).
+    """
+    mulai = time.perf_counter()
+    conn = buat_koneksi(tugas['mode'])
+    cur = conn.cursor()
+    try:
+        mode = tugas['mode']
+        if mode == 'infile' and not local_infile_aktif(cur):
+            mode = 'insert'
+        instrumen = InstrumenImport()
+        hasil = import_file_cuaca(conn, tugas['nama_file'], mode, tugas['ukuran_batch'],
+                                  tugas['ukuran_chunk'], tugas['rentang_stasiun'],
+                                  tugas['commit_setiap'], instrumen, tugas['validasi'],
+                                  tugas['rentang_baca'])
+    finally:
+        cur.close()
+        conn.close()
+    
+    hasil['instrumentasi'] = instrumen.ke_dict()
+    hasil['partisi'] = label_partisi(tugas['nama_file'], tugas['rentang_stasiun'], tugas['rentang_baca'])
+    hasil['detik'] = time.perf_counter() - mulai
+    return hasil
+
+def import_cuaca_paralel(daftar_file, file_stasiun, pekerja, mode='insert',
+                         ukuran_batch=UKURAN_BATCH, ukuran_chunk=UKURAN_CHUNK,
+                         commit_setiap=COMMIT_SETIAP, validasi=True):
+    """
+    Import beberapa file cuaca secara paralel dengan process pool.
+    Input dibagi per file lalu setiap file dibagi lagi sehingga ada
+    kira-kira `pekerja` partisi. CSV biasa dan Parquet/Arrow dibagi per
+    rentang byte/baris (bagi_rentang_baca), jadi setiap baris dibaca dan
+    di-parse oleh tepat satu worker. CSV gzip/zstd tidak bisa dibuka di
+    tengah dan dibagi per rentang station_id (bagi_rentang_stasiun): setiap
+    partisinya mem-parse ulang seluruh file.
+
+    Returns:
+        list: Ringkasan per partisi (urut sesuai label).
+    """
+    per_file = -(-pekerja // max(len(daftar_file), 1))
+    rentang_stasiun = None
+    daftar_tugas = []
+    for nama_file in daftar_file:
+        bagian = bagi_rentang_baca(nama_file, per_file)
+        if bagian is not None:
+            bagian = [((None, None), rentang) for rentang in bagian]
+        else:
+            if rentang_stasiun is None:
+                rentang_stasiun = bagi_rentang_stasiun(file_stasiun, per_file)
+            bagian = [(rentang, (None, None)) for rentang in rentang_stasiun]
+        daftar_tugas += [
+            {
+                'nama_file': nama_file,
+                'rentang_stasiun': stasiun,
+                'rentang_baca': baca,
+                'mode': mode,
+                'ukuran_batch': ukuran_batch,
+                'ukuran_chunk': ukuran_chunk,
+                'commit_setiap': commit_setiap,
+                'validasi': validasi,
+            }
+            for stasiun, baca in bagian
+        ]
+    
+    print(f"\nMengimport {len(daftar_file)} file cuaca dalam {len(daftar_tugas)} partisi "
+          f"dengan {pekerja} worker...")
+    hasil = []
+    with ProcessPoolExecutor(max_workers=pekerja) as pool:
+        futures = {pool.submit(import_partisi, tugas): tugas for tugas in daftar_tugas}
+        for future in as_completed(futures):
+            tugas = futures[future]
+            label = label_partisi(tugas['nama_file'], tugas['rentang_stasiun'], tugas['rentang_baca'])
+            try:
+                ringkasan = future.result()
+                print(f"✅ {label}: {ringkasan['baris']:,} observasi cuaca baru diimport "
+                      f"({ringkasan['baris_dikirim']:,} baris dikirim)")
+            except Exception as e:
+                print(f"❌ {label} gagal: {e}")
+                ringkasan = {'partisi': label, 'baris': 0, 'baris_dikirim': 0, 'ditolak': 0,
+                             'detik': 0.0, 'mode': 'gagal'}
+            hasil.append(ringkasan)
+    
+    return sorted(hasil, key=lambda r: r['partisi'])
+
+def import_ke_duckdb(file_duckdb=None, ukuran_chunk=UKURAN_CHUNK, file_cuaca=None, validasi=True,
+                     file_laporan=None):
+    """
+    Import CSV ke file DuckDB untuk backend tertanam. Baca, transformasi,
+    dan validasi chunk sama dengan jalur MySQL; setiap chunk dimuat dengan
+    satu INSERT OR IGNORE ... SELECT dari DataFrame (tanpa tuple per baris).
+    Semua dalam satu transaksi, jadi tidak butuh checkpoint: import yang
+    gagal tidak meninggalkan data setengah jadi. Ringkasan dan katalog
+    dihitung ulang penuh di akhir (skema.segarkan_duckdb).
+
+    Args:
+        file_duckdb (str): File tujuan (default backend.FILE_DUCKDB).
+        ukuran_chunk, file_cuaca, validasi, file_laporan: Sama seperti import_csv_sederhana.
+
+    Returns:
+        dict: Ringkasan angka import (kunci sama dengan import_csv_sederhana).
+    """
+    file_duckdb = file_duckdb or backend.FILE_DUCKDB
+    print(f"Memulai import data ke DuckDB ({file_duckdb})...")
+    waktu_mulai = time.perf_counter()
+    waktu_mulai_iso = datetime.now().isoformat(timespec='seconds')
+    instrumen = InstrumenImport()
+    
+    conn = backend.buka_duckdb(file_duckdb, tulis=True)
+    skema.buat_skema_duckdb(conn)
+    conn.begin()
+    
+    file_provinsi = 'province_detail.csv'
+    file_stasiun = 'station_detail.csv'
+    if os.path.exists(file_provinsi):
+        with instrumen.ukur('dimensi', file_provinsi) as fase:
+            df_provinsi = pd.read_csv(file_provinsi)
+            fase['baris'] = len(df_provinsi)
+            conn.register('df_provinsi', df_provinsi)
+            conn.execute("INSERT OR IGNORE INTO provinsi (id_provinsi, nama_provinsi) "
+                         "SELECT province_id, province_name FROM df_provinsi")
+        print(f"✅ {len(df_provinsi)} provinsi diimport")
+    
+    if os.path.exists(file_stasiun):
+        with instrumen.ukur('dimensi', file_stasiun) as fase:
+            df_stasiun = pd.read_csv(file_stasiun)
+            fase['baris'] = len(df_stasiun)
+            for kolom in ['latitude', 'longitude']:
+                if kolom not in df_stasiun.columns:
+                    df_stasiun[kolom] = 0
+            conn.register('df_stasiun', df_stasiun)
+            conn.execute("INSERT OR IGNORE INTO wilayah (id_wilayah, nama_wilayah, id_provinsi) "
+                         "SELECT DISTINCT region_id, region_name, province_id FROM df_stasiun")
+            conn.execute("INSERT OR IGNORE INTO stasiun (id_stasiun, nama_stasiun, id_wilayah, lintang, bujur) "
+                         "SELECT station_id, station_name, region_id, latitude, longitude FROM df_stasiun")
+        print(f"✅ {len(df_stasiun)} stasiun diimport")
+    
+    total_data = 0
+    total_ditolak = 0
+    mulai_cuaca = time.perf_counter()
+    sql_cuaca = (f"INSERT OR IGNORE INTO observasi_cuaca ({', '.join(KOLOM_DB_CUACA)}) "
+                 f"SELECT {', '.join(KOLOM_DB_CUACA)} FROM chunk_cuaca")
+    for nama_file in [f for f in (file_cuaca or FILE_CUACA_DEFAULT) if os.path.exists(f)]:
+        print(f"\nMengimport {nama_file}...")
+        file_ditolak = nama_file_ditolak(nama_file)
+        if os.path.exists(file_ditolak):
+            os.remove(file_ditolak)
+        pembaca = baca_cuaca_bertahap(nama_file, ukuran_chunk)
+        while True:
+            with instrumen.ukur('baca_csv', nama_file) as fase:
+                chunk = next(pembaca, None)
+                if chunk is not None:
+                    fase['baris'] = chunk[2]
+            if chunk is None:
+                break
+            df_cuaca = chunk[0]
+            del chunk
+            
+            with instrumen.ukur('transformasi', nama_file) as fase:
+                fase['baris'] = len(df_cuaca)
+                df_cuaca, df_ditolak = transformasi_chunk(df_cuaca)
+                if not df_ditolak.empty:
+                    tulis_ditolak(df_ditolak, file_ditolak)
+                    instrumen.catat_ditolak(df_ditolak['alasan'].value_counts().to_dict())
+                    total_ditolak += len(df_ditolak)
+            
+            if validasi:
+                with instrumen.ukur('validasi', nama_file) as fase:
+                    fase['baris'] = len(df_cuaca)
+                    df_cuaca, pelanggaran_chunk = validasi_chunk(df_cuaca)
+                    instrumen.catat_pelanggaran(pelanggaran_chunk)
+            
+            with instrumen.ukur('kirim', nama_file) as fase:
+                fase['baris'] = len(df_cuaca)
+                conn.register('chunk_cuaca', df_cuaca)
+                total_data += conn.execute(sql_cuaca).fetchone()[0]
+                conn.unregister('chunk_cuaca')
+            print(f"  {nama_file} diproses: {total_data:,} baris")
+    waktu_cuaca = time.perf_counter() - mulai_cuaca
+    
+    with instrumen.ukur('ringkasan'):
+        versi_import = skema.segarkan_duckdb(conn)
+    with instrumen.ukur('commit'):
+        conn.commit()
+    
+    durasi = time.perf_counter() - waktu_mulai
+    print("\n" + "=" * 50)
+    print("RINGKASAN IMPORT (DUCKDB):")
+    print("=" * 50)
+    for tabel in ['provinsi', 'wilayah', 'stasiun', 'observasi_cuaca']:
+        jumlah = conn.execute("SELECT nilai_angka FROM katalog_data WHERE kunci = ?",
+                              [f"baris:{tabel}"]).fetchone()[0]
+        print(f"{tabel.upper():20} : {jumlah:>10,}")
+    print("=" * 50)
+    print(f"TOTAL DATA DIREKAM: {total_data:,}")
+    print(f"TOTAL DITOLAK     : {total_ditolak:,}")
+    print(f"VERSI IMPORT      : {versi_import}")
+    print(f"WAKTU TOTAL       : {durasi:,.1f} detik")
+    if waktu_cuaca > 0:
+        print(f"KECEPATAN CUACA   : {total_data / waktu_cuaca:,.0f} baris/detik")
+    memori = memori_puncak_mb()
+    if memori is not None:
+        print(f"MEMORI PUNCAK     : {memori:,.1f} MB")
+    print("=" * 50)
+    instrumen.cetak_ringkasan()
+    print("=" * 50)
+    conn.close()
+    
+    ringkasan = {
+        'waktu_mulai': waktu_mulai_iso,
+        'mode': 'duckdb',
+        'pekerja': 1,
+        'ukuran_batch': None,
+        'ukuran_chunk': ukuran_chunk,
+        'baris': total_data,
+        'ditolak': total_ditolak,
+        'validasi': validasi,
+        'versi_import': versi_import,
+        'file_duckdb': file_duckdb,
+        'detik_total': durasi,
+        'detik_cuaca': waktu_cuaca,
+        'baris_per_detik': total_data / waktu_cuaca if waktu_cuaca > 0 else 0,
+        'memori_puncak_mb': memori,
+        'partisi': [],
+        'instrumentasi': instrumen.ke_dict(),
+    }
+    if file_laporan is None:
+        file_laporan = f"laporan_import_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(file_laporan, 'w', encoding='utf-8') as berkas:
+        json.dump(ringkasan, berkas, indent=2, default=str)
+    print(f"📄 Laporan import: {file_laporan}")
+    
+    print("\n✅ IMPORT SELESAI!")
+    return ringkasan
+
+def import_csv_sederhana(ukuran_batch=UKURAN_BATCH, mode='insert', ukuran_chunk=UKURAN_CHUNK,
+                         pekerja=1, commit_setiap=COMMIT_SETIAP, ulang=False, file_laporan=None,
+                         file_cuaca=None, validasi=True, dry_run=False, file_duckdb=None):
+    """
+    Import CSV ke database iklim_indonesia (versi sederhana)
+    
+    Args:
+        ukuran_batch (int): Jumlah baris per batch INSERT.
+        mode (str): 'insert' (INSERT IGNORE batch) atau 'infile'
+            (LOAD DATA LOCAL INFILE + staging, kembali ke 'insert'
+            jika local_infile dimatikan di server), atau 'duckdb'
+            (muat ke file DuckDB lewat import_ke_duckdb; pekerja,
+            ukuran_batch, commit_setiap, dan ulang tidak dipakai).
+        ukuran_chunk (int): Jumlah baris CSV cuaca yang dibaca per chunk.
+        pekerja (int): Jumlah proses worker untuk data cuaca (1 = berurutan).
+        commit_setiap (int): Commit + simpan checkpoint setiap N baris cuaca.
+        ulang (bool): Abaikan checkpoint lama dan import dari awal.
+        file_laporan (str): Path laporan JSON (default laporan_import_<waktu>.json).
+        file_cuaca (list): File cuaca (.csv, .csv.gz, .csv.zst, .parquet, .arrow/.feather);
+            default climate_data.csv dan 2021_2025.csv.
+        validasi (bool): Kosongkan sentinel 8888/9999 dan nilai mustahil sebelum dimuat.
+        dry_run (bool): Hanya baca, transformasi, dan validasi data cuaca
+            tanpa menulis ke database (lihat dry_run_cuaca).
+        file_duckdb (str): File tujuan untuk mode 'duckdb'.
+    
+    Returns:
+        dict: Ringkasan angka import (baris, waktu, kecepatan, memori puncak).
+    """
+    
+    if dry_run:
+        return dry_run_cuaca(file_cuaca or FILE_CUACA_DEFAULT, ukuran_chunk, file_laporan)
+    if mode == 'duckdb':
+        return import_ke_duckdb(file_duckdb, ukuran_chunk, file_cuaca, validasi, file_laporan)
     
     print("Memulai import data...")
+    waktu_mulai = time.perf_counter()
+    waktu_mulai_iso = datetime.now().isoformat(timespec='seconds')
+    instrumen = InstrumenImport()
     
     # Koneksi database
-    conn = mysql.connector.connect(
-        host='localhost',
-        database='iklim_indonesia',
-        user='root',
-        password=''
-    )
+    conn = buat_koneksi(mode)
     cur = conn.cursor()
     
+    if mode == 'infile' and not local_infile_aktif(cur):
+        print("⚠️ local_infile nonaktif di server, kembali ke mode insert")
+        mode = 'insert'
+    
+    # Pastikan tabel dan index sesuai skema.py sebelum data dimuat
+    skema.migrasi(conn)
+    
     # File CSV yang akan diimport
     file_provinsi = 'province_detail.csv'
     file_stasiun = 'station_detail.csv'
-    file_cuaca = 'climate_data.csv'
-    file_cuaca2 = '2021_2025.csv'
+    if file_cuaca is None:
+        file_cuaca = FILE_CUACA_DEFAULT
     
     total_data = 0
+    total_dikirim = 0
+    total_ditolak = 0
     
     # 1. IMPORT PROVINSI
     if os.path.exists(file_provinsi):
         print(f"Mengimport {file_provinsi}...")
-        df_provinsi = pd.read_csv(file_provinsi)
-        
-        for _, baris in df_provinsi.iterrows():
-            cur.execute("""
-                INSERT IGNORE INTO provinsi (id_provinsi, nama_provinsi)
-                VALUES (%s, %s)
-            """, (baris['province_id'], baris['province_name']))
+        with instrumen.ukur('dimensi', file_provinsi) as fase:
+            df_provinsi = pd.read_csv(file_provinsi)
+            fase['baris'] = len(df_provinsi)
+            
+            sisipkan_batch(cur, SQL_INSERT_PROVINSI,
+                           ke_tuple(df_provinsi, ['province_id', 'province_name']),
+                           ukuran_batch)
         
         print(f"✅ {len(df_provinsi)} provinsi diimport")
     
     # 2. IMPORT WILAYAH & STASIUN
     if os.path.exists(file_stasiun):
         print(f"\nMengimport {file_stasiun}...")
-        df_stasiun = pd.read_csv(file_stasiun)
-        
-        # Import wilayah
-        wilayah_unik = df_stasiun[['region_id', 'region_name', 'province_id']].drop_duplicates()
-        for _, baris in wilayah_unik.iterrows():
-            cur.execute("""
-                INSERT IGNORE INTO wilayah (id_wilayah, nama_wilayah, id_provinsi)
-                VALUES (%s, %s, %s)
-            """, (baris['region_id'], baris['region_name'], baris['province_id']))
-        
-        # Import stasiun
-        for _, baris in df_stasiun.iterrows():
-            cur.execute("""
-                INSERT IGNORE INTO stasiun 
-                (id_stasiun, nama_stasiun, id_wilayah, lintang, bujur)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (
-                baris['station_id'],
-                baris['station_name'],
-                baris['region_id'],
-                baris.get('latitude', 0),
-                baris.get('longitude', 0)
-            ))
+        with instrumen.ukur('dimensi', file_stasiun) as fase:
+            df_stasiun = pd.read_csv(file_stasiun)
+            fase['baris'] = len(df_stasiun)
+            
+            # Import wilayah
+            wilayah_unik = df_stasiun[['region_id', 'region_name', 'province_id']].drop_duplicates()
+            sisipkan_batch(cur, SQL_INSERT_WILAYAH,
+                           ke_tuple(wilayah_unik, ['region_id', 'region_name', 'province_id']),
+                           ukuran_batch)
+            
+            # Import stasiun (lintang/bujur default 0 jika kolom tidak ada)
+            for kolom in ['latitude', 'longitude']:
+                if kolom not in df_stasiun.columns:
+                    df_stasiun[kolom] = 0
+            sisipkan_batch(cur, SQL_INSERT_STASIUN,
+                           ke_tuple(df_stasiun, ['station_id', 'station_name', 'region_id',
+                                                 'latitude', 'longitude']),
+                           ukuran_batch)
         
         print(f"✅ {len(wilayah_unik)} wilayah diimport")
         print(f"✅ {len(df_stasiun)} stasiun diimport")
     
     # 3. IMPORT DATA CUACA
-    for file_cuaca_nama in [file_cuaca, file_cuaca2]:
-        if os.path.exists(file_cuaca_nama):
+    waktu_cuaca = 0.0
+    ringkasan_partisi = []
+    daftar_file_cuaca = [f for f in file_cuaca if os.path.exists(f)]
+    siapkan_checkpoint(cur, ulang)
+    if pekerja > 1 and daftar_file_cuaca:
+        # Dimensi dan tabel checkpoint harus sudah ter-commit sebelum worker mulai
+        conn.commit()
+        mulai_cuaca = time.perf_counter()
+        ringkasan_partisi = import_cuaca_paralel(daftar_file_cuaca, file_stasiun, pekerja,
+                                                 mode, ukuran_batch, ukuran_chunk, commit_setiap,
+                                                 validasi)
+        waktu_cuaca = time.perf_counter() - mulai_cuaca
+        for r in ringkasan_partisi:
+            if 'instrumentasi' in r:
+                instrumen.gabung(r.pop('instrumentasi'))
+        total_data += sum(r['baris'] for r in ringkasan_partisi)
+        total_dikirim += sum(r['baris_dikirim'] for r in ringkasan_partisi)
+        total_ditolak += sum(r['ditolak'] for r in ringkasan_partisi)
+    else:
+        for file_cuaca_nama in daftar_file_cuaca:
             print(f"\nMengimport {file_cuaca_nama}...")
-            df_cuaca = pd.read_csv(file_cuaca_nama)
+            mulai_file = time.perf_counter()
+            hasil = import_file_cuaca(conn, file_cuaca_nama, mode, ukuran_batch, ukuran_chunk,
+                                      commit_setiap=commit_setiap, instrumen=instrumen,
+                                      validasi=validasi)
+            mode = hasil['mode']
             
-            baris_diimport = 0
-            for idx, baris in df_cuaca.iterrows():
-                try:
-                    # Format tanggal
-                    tanggal = str(baris.get('date', ''))
-                    
-                    # Konversi format tanggal
-                    if '/' in tanggal:
-                        parts = tanggal.split('/')
-                        if len(parts) == 3:
-                            hari, bulan, tahun = parts
-                            if len(tahun) == 2:
-                                tahun = '20' + tahun
-                            tanggal_fix = f"{tahun}-{bulan.zfill(2)}-{hari.zfill(2)}"
-                        else:
-                            continue
-                    else:
-                        tanggal_fix = tanggal
-                    
-                    # Insert data
-                    cur.execute("""
-                        INSERT IGNORE INTO observasi_cuaca 
-                        (id_stasiun, tanggal, suhu_minimum, suhu_maksimum, suhu_rata_rata,
-                         kelembaban_rata_rata, curah_hujan, durasi_sinar_matahari,
-                         kecepatan_angin_maksimum, arah_angin_maksimum,
-                         kecepatan_angin_rata_rata, kode_arah_angin)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (
-                        baris.get('station_id'),
-                        tanggal_fix,
-                        baris.get('Tn'),
-                        baris.get('Tx'),
-                        baris.get('Tavg'),
-                        baris.get('RH_avg'),
-                        baris.get('RR'),
-                        baris.get('ss'),
-                        baris.get('ff_x'),
-                        baris.get('ddd_x'),
-                        baris.get('ff_avg'),
-                        baris.get('ddd_car')
-                    ))
-                    
-                    baris_diimport += 1
-                    total_data += 1
-                    
-                    if baris_diimport % 10000 == 0:
-                        print(f"  Diproses: {baris_diimport:,} baris")
-                        
-                except Exception as e:
-                    continue
-            
-            print(f"✅ {baris_diimport:,} observasi cuaca diimport")
+            total_data += hasil['baris']
+            total_dikirim += hasil['baris_dikirim']
+            total_ditolak += hasil['ditolak']
+            waktu_cuaca += time.perf_counter() - mulai_file
+            print(f"✅ {hasil['baris']:,} observasi cuaca baru diimport "
+                  f"({hasil['baris_dikirim']:,} baris dikirim)")
+    
+    # Katalog metadata (jumlah baris, batas tanggal, tahun) untuk dashboard
+    with instrumen.ukur('commit'):
+        versi_import = skema.segarkan_katalog(cur)
+        conn.commit()
     
-    conn.commit()
+    # Arsip Parquet tahun lalu (jika sudah pernah dibuat untuk database ini)
+    # diperbarui supaya dashboard tidak kembali membaca semuanya dari MySQL
+    manifest_arsip = arsip.baca_manifest()
+    if (arsip.pa is not None and manifest_arsip
+            and manifest_arsip.get('sumber') == arsip.sumber_mysql(conn.database)):
+        with instrumen.ukur('arsip'):
+            print("\nMemperbarui arsip Parquet...")
+            arsip.ekspor_arsip(conn)
+    
+    durasi = time.perf_counter() - waktu_mulai
     
     # Tampilkan ringkasan
     print("\n" + "=" * 50)
@@ -140,17 +1562,105 @@ def import_csv_sederhana():
     
     tabel_tampil = ['provinsi', 'wilayah', 'stasiun', 'observasi_cuaca']
     for tabel in tabel_tampil:
-        cur.execute(f"SELECT COUNT(*) FROM {tabel}")
+        cur.execute("SELECT nilai_angka FROM katalog_data WHERE kunci = %s", (f"baris:{tabel}",))
         jumlah = cur.fetchone()[0]
         print(f"{tabel.upper():20} : {jumlah:>10,}")
     
     print("=" * 50)
+    if ringkasan_partisi:
+        print(f"{'PARTISI':32} {'DIKIRIM':>10} {'BARU':>10} {'DITOLAK':>8} {'DETIK':>8} {'BARIS/DETIK':>12}")
+        for r in ringkasan_partisi:
+            kecepatan = r['baris_dikirim'] / r['detik'] if r['detik'] > 0 else 0
+            print(f"{r['partisi'][:32]:32} {r['baris_dikirim']:>10,} {r['baris']:>10,} "
+                  f"{r['ditolak']:>8,} {r['detik']:>8,.1f} {kecepatan:>12,.0f}")
+        print("=" * 50)
     print(f"TOTAL DATA DIREKAM: {total_data:,}")
+    print(f"TOTAL DIKIRIM     : {total_dikirim:,}")
+    print(f"TOTAL DITOLAK     : {total_ditolak:,}")
+    print(f"VERSI IMPORT      : {versi_import}")
+    print(f"MODE IMPORT       : {mode}")
+    print(f"UKURAN BATCH      : {ukuran_batch:,}")
+    print(f"UKURAN CHUNK      : {ukuran_chunk:,}")
+    print(f"JUMLAH WORKER     : {pekerja}")
+    print(f"COMMIT SETIAP     : {commit_setiap:,} baris")
+    print(f"WAKTU TOTAL       : {durasi:,.1f} detik")
+    if waktu_cuaca > 0:
+        print(f"KECEPATAN CUACA   : {total_dikirim / waktu_cuaca:,.0f} baris/detik")
+    memori = memori_puncak_mb()
+    if memori is not None:
+        print(f"MEMORI PUNCAK     : {memori:,.1f} MB")
+    print("=" * 50)
+    instrumen.cetak_ringkasan()
     print("=" * 50)
     
     cur.close()
     conn.close()
+    
+    ringkasan = {
+        'waktu_mulai': waktu_mulai_iso,
+        'mode': mode,
+        'pekerja': pekerja,
+        'ukuran_batch': ukuran_batch,
+        'ukuran_chunk': ukuran_chunk,
+        'baris': total_data,
+        'baris_dikirim': total_dikirim,
+        'ditolak': total_ditolak,
+        'validasi': validasi,
+        'versi_import': versi_import,
+        'detik_total': durasi,
+        'detik_cuaca': waktu_cuaca,
+        'baris_per_detik': total_dikirim / waktu_cuaca if waktu_cuaca > 0 else 0,
+        'memori_puncak_mb': memori,
+        'partisi': ringkasan_partisi,
+        'instrumentasi': instrumen.ke_dict(),
+    }
+    
+    if file_laporan is None:
+        file_laporan = f"laporan_import_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(file_laporan, 'w', encoding='utf-8') as berkas:
+        json.dump(ringkasan, berkas, indent=2, default=str)
+    print(f"📄 Laporan import: {file_laporan}")
+    
     print("\n✅ IMPORT SELESAI!")
+    return ringkasan
 
 if __name__ == "__main__":
-    import_csv_sederhana()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Import CSV ke database iklim_indonesia")
+    parser.add_argument('--ukuran-batch', type=int, default=UKURAN_BATCH,
+                        help="Jumlah baris per batch INSERT (1 = per baris seperti versi lama)")
+    parser.add_argument('--mode', choices=MODE_IMPORT, default='insert',
+                        help="insert = INSERT IGNORE batch, infile = LOAD DATA LOCAL INFILE + staging, "
+                             "duckdb = muat ke file DuckDB (backend tertanam)")
+    parser.add_argument('--file-duckdb', default=None,
+                        help="File tujuan mode duckdb (default IKLIM_FILE_DUCKDB / data/iklim_indonesia.duckdb)")
+    parser.add_argument('--ukuran-chunk', type=int, default=UKURAN_CHUNK,
+                        help="Jumlah baris CSV cuaca yang dibaca per chunk")
+    parser.add_argument('--pekerja', type=int, default=1,
+                        help="Jumlah proses worker paralel untuk data cuaca (1 = berurutan)")
+    parser.add_argument('--commit-setiap', type=int, default=COMMIT_SETIAP,
+                        help="Commit dan simpan checkpoint setiap N baris cuaca")
+    parser.add_argument('--ulang', action='store_true',
+                        help="Abaikan checkpoint dan import semua file dari awal")
+    parser.add_argument('--laporan', default=None,
+                        help="Path laporan JSON (default laporan_import_<waktu>.json)")
+    parser.add_argument('--file-cuaca', nargs='+', default=None,
+                        help="File cuaca yang diimport (csv, csv.gz, csv.zst, parquet, arrow/feather)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Baca dan validasi data cuaca tanpa menulis ke database")
+    parser.add_argument('--tanpa-validasi', action='store_true',
+                        help="Lewati validasi sentinel/rentang (data dimuat apa adanya)")
+    parser.add_argument('--konversi-parquet', nargs='+', metavar='FILE_CSV', default=None,
+                        help="Hanya ubah CSV cuaca menjadi Parquet bertipe lalu keluar")
+    args = parser.parse_args()
+    
+    if args.konversi_parquet:
+        for file_csv in args.konversi_parquet:
+            file_parquet, tertulis, ditolak = konversi_ke_parquet(file_csv, ukuran_chunk=args.ukuran_chunk)
+            print(f"✅ {file_csv} -> {file_parquet}: {tertulis:,} baris ({ditolak:,} ditolak)")
+    else:
+        import_csv_sederhana(ukuran_batch=args.ukuran_batch, mode=args.mode,
+                             ukuran_chunk=args.ukuran_chunk, pekerja=args.pekerja,
+                             commit_setiap=args.commit_setiap, ulang=args.ulang,
+                             file_laporan=args.laporan, file_cuaca=args.file_cuaca,
+                             validasi=not args.tanpa_validasi, dry_run=args.dry_run,
+                             file_duckdb=args.file_duckdb)
@@ -12,6 +12,12 @@ import numpy as np
 from config import (
     KonektorDatabase,
     ambil_data_cuaca,
+    ambil_data_cuaca_bertahap,
+    ambil_agregat_cuaca,
+    ambil_ringkasan_cuaca,
+    ambil_halaman_cuaca,
+    hitung_baris_cuaca,
+    KOLOM_NUMERIK_CUACA,
     ambil_data_stasiun,
     ambil_daftar_wilayah,
     ambil_arah_angin,
@@ -19,7 +25,16 @@ from config import (
     ambil_data_contoh,
     ambil_tahun_tersedia,
     ambil_statistik_cuaca_stasiun,
-    ambil_nama_kolom
+    ambil_nama_kolom,
+    ambil_statistik_pool,
+    ambil_katalog,
+    ambil_statistik_cache,
+    ambil_riwayat_query,
+    ringkasan_latensi,
+    atur_explain_lambat,
+    BATAS_QUERY_LAMBAT_MS,
+    versi_data,
+    jalankan_bersamaan
 )
 
 # Konfigurasi halaman
@@ -115,6 +130,37 @@ st.markdown("""
 st.markdown('<h1 class="main-title">🌤️ DASHBOARD IKLIM INDONESIA</h1>', unsafe_allow_html=True)
 st.markdown('<p class="subtitle">Visualisasi Data Cuaca Stasiun BMKG Seluruh Indonesia</p>', unsafe_allow_html=True)
 
+# Cache Streamlit di memori berkunci versi_import (di bawahnya cache disk
+# config.cache_hasil): hasil berlaku sampai import berikutnya, bukan 5 menit.
+# versi_aktif dicek ke database paling sering sekali per BATAS_CEK_DIMENSI detik.
+ENTRI_CACHE = 64
+versi_aktif = versi_data()
+
+@st.cache_data(max_entries=ENTRI_CACHE)
+def muat_katalog(versi):
+    """Katalog metadata database (batas tanggal dan tahun) untuk filter sidebar"""
+    try:
+        return ambil_katalog()
+    except Exception:
+        return {}
+
+# Katalog dan daftar wilayah tidak saling bergantung: diambil bersamaan
+try:
+    data_sidebar = jalankan_bersamaan({'katalog': (muat_katalog, versi_aktif),
+                                       'wilayah': ambil_daftar_wilayah})
+except Exception as e:
+    st.error(f"Error mengambil data filter: {str(e)[:100]}")
+    data_sidebar = {'katalog': {}, 'wilayah': []}
+
+# Batas filter dari katalog; angka tetap jika katalog belum tersedia
+katalog = data_sidebar['katalog']
+if katalog.get('tanggal_min') and katalog.get('tanggal_maks'):
+    batas_tanggal_min = katalog['tanggal_min']
+    batas_tanggal_maks = katalog['tanggal_maks']
+else:
+    batas_tanggal_min = datetime(2010, 1, 1).date()
+    batas_tanggal_maks = datetime(2024, 12, 31).date()
+
 # Sidebar untuk filter
 with st.sidebar:
 
@@ -133,25 +179,27 @@ with st.sidebar:
     with col1:
         tanggal_mulai = st.date_input(
             "Dari",
-            value=datetime(2010, 1, 1).date(),
-            min_value=datetime(2000, 1, 1).date(),
-            max_value=datetime(2035, 12, 31).date()
+            value=batas_tanggal_min,
+            min_value=batas_tanggal_min,
+            max_value=batas_tanggal_maks
         )
     with col2:
         tanggal_selesai = st.date_input(
             "Sampai",
-            value=datetime(2024, 12, 31).date(),
-            min_value=datetime(2000, 1, 1).date(),
-            max_value=datetime(2035, 12, 31).date()
+            value=batas_tanggal_maks,
+            min_value=batas_tanggal_min,
+            max_value=batas_tanggal_maks
         )
     
-    # Method 2: Slider untuk tahun
+    # Method 2: Slider untuk tahun (rentang sesuai data di database)
     st.markdown("**Filter berdasarkan tahun:**")
+    tahun_pertama = batas_tanggal_min.year
+    tahun_terakhir = max(batas_tanggal_maks.year, tahun_pertama + 1)
     tahun_min, tahun_maks = st.slider(
         "Pilih rentang tahun:",
-        min_value=2010,
-        max_value=2035,
-        value=(2010, 2024),
+        min_value=tahun_pertama,
+        max_value=tahun_terakhir,
+        value=(tahun_pertama, tahun_terakhir),
         step=1
     )
     
@@ -161,7 +209,7 @@ with st.sidebar:
     
     # Wilayah filter
     try:
-        daftar_wilayah = ambil_daftar_wilayah()
+        daftar_wilayah = data_sidebar['wilayah']
         if isinstance(daftar_wilayah, list) and len(daftar_wilayah) > 0:
             nama_wilayah_list = [w.get('nama_wilayah', '') for w in daftar_wilayah if 'nama_wilayah' in w]
             wilayah_terpilih = st.selectbox(
@@ -197,23 +245,40 @@ with st.sidebar:
         except Exception as e:
             st.error(f"❌ Error: {str(e)[:100]}")
 
+def cari_id_wilayah(nama_wilayah):
+    """Cari id_wilayah dari nama wilayah di sidebar (None = semua wilayah)"""
+    if nama_wilayah != "Semua Wilayah" and daftar_wilayah and isinstance(daftar_wilayah, list):
+        for w in daftar_wilayah:
+            if isinstance(w, dict) and w.get('nama_wilayah') == nama_wilayah:
+                return w.get('id_wilayah')
+    return None
+
+# Kolom database yang benar-benar dipakai setiap halaman (None = semua kolom).
+# Halaman hanya menarik kolom dan JOIN yang dibutuhkannya dari database.
+KOLOM_HALAMAN = {
+    'dashboard': ('tanggal', 'suhu_rata_rata', 'curah_hujan', 'kelembaban_rata_rata',
+                  'kecepatan_angin_rata_rata'),
+    'peta': ('id_stasiun', 'tanggal', 'suhu_rata_rata', 'curah_hujan', 'kelembaban_rata_rata',
+             'kecepatan_angin_rata_rata'),
+    'suhu': ('tanggal', 'suhu_minimum', 'suhu_maksimum', 'suhu_rata_rata', 'nama_wilayah'),
+    'hujan': ('tanggal', 'curah_hujan'),
+    'angin': ('kecepatan_angin_rata_rata', 'kecepatan_angin_maksimum', 'nama_arah_angin',
+              'suhu_rata_rata', 'curah_hujan'),
+    'data_mentah': None,
+}
+
 # Cache data untuk performa
 # Cache data untuk performa
-@st.cache_data(ttl=300)
-def muat_data_cuaca(tanggal_mulai, tanggal_selesai, nama_wilayah, batas):
-    """Load data dengan error handling"""
+@st.cache_data(max_entries=ENTRI_CACHE)
+def muat_data_cuaca(versi, tanggal_mulai, tanggal_selesai, nama_wilayah, batas, kolom=None):
+    """Load data dengan error handling (kolom: tuple nama kolom database, None = semua)"""
     try:
         # Format date untuk query (UBAH DI SINI)
         tanggal_mulai_str = tanggal_mulai.strftime('%Y-%m-%d')
         tanggal_selesai_str = tanggal_selesai.strftime('%Y-%m-%d')
         
         # Get wilayah_id jika wilayah dipilih
-        id_wilayah = None
-        if nama_wilayah != "Semua Wilayah" and daftar_wilayah and isinstance(daftar_wilayah, list):
-            for w in daftar_wilayah:
-                if isinstance(w, dict) and w.get('nama_wilayah') == nama_wilayah:
-                    id_wilayah = w.get('id_wilayah')
-                    break
+        id_wilayah = cari_id_wilayah(nama_wilayah)
         
         # Gunakan fungsi yang sudah diperbaiki (UBAH DI SINI)
         # PARAMETER BERUBAH: filter_tanggal -> tanggal_mulai dan tanggal_selesai
@@ -221,7 +286,9 @@ def muat_data_cuaca(tanggal_mulai, tanggal_selesai, nama_wilayah, batas):
             tanggal_mulai=tanggal_mulai_str,
             tanggal_selesai=tanggal_selesai_str,
             id_wilayah=id_wilayah,
-            batas=batas
+            batas=batas,
+            kolom=list(kolom) if kolom else None,
+            pakai_arsip=True
         )
         
         if isinstance(df, pd.DataFrame) and not df.empty:
@@ -248,12 +315,165 @@ def muat_data_cuaca(tanggal_mulai, tanggal_selesai, nama_wilayah, batas):
         st.error(f"❌ Error loading data: {str(e)[:200]}")
         return pd.DataFrame()
 
+NAMA_BULAN = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
+              'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
+NAMA_HARI = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+
+@st.cache_data(max_entries=ENTRI_CACHE)
+def muat_agregat_cuaca(versi, tanggal_mulai, tanggal_selesai, nama_wilayah, dimensi, metrik):
+    """
+    Agregat seluruh periode dihitung di database (tidak terpengaruh Limit Data).
+    
+    Args:
+        versi (int): versi_import (hanya sebagai kunci cache).
+        dimensi (tuple): Dimensi GROUP BY, mis. ('bulan',).
+        metrik (tuple): Pasangan (kolom, fungsi), mis. (('curah_hujan', 'sum'),).
+    
+    Returns:
+        DataFrame: Hasil ambil_agregat_cuaca (kolom '<kolom>_<fungsi>').
+    """
+    # metrik dikirim sebagai tuple agar bisa di-hash oleh st.cache_data
+    spesifikasi = {}
+    for kolom, fungsi in metrik:
+        spesifikasi.setdefault(kolom, []).append(fungsi)
+    
+    try:
+        return ambil_agregat_cuaca(
+            tanggal_mulai=tanggal_mulai.strftime('%Y-%m-%d'),
+            tanggal_selesai=tanggal_selesai.strftime('%Y-%m-%d'),
+            id_wilayah=cari_id_wilayah(nama_wilayah),
+            dimensi=dimensi,
+            metrik=spesifikasi
+        )
+    except Exception as e:
+        st.error(f"❌ Error loading agregat: {str(e)[:200]}")
+        return pd.DataFrame()
+
+@st.cache_data(max_entries=ENTRI_CACHE)
+def muat_ringkasan_cuaca(versi, tanggal_mulai, tanggal_selesai, nama_wilayah, dimensi, variabel):
+    """
+    Statistik dari tabel ringkasan bulanan/tahunan per stasiun (diisi saat
+    import), untuk tren multi-tahun tanpa membaca observasi harian.
+    
+    Returns:
+        DataFrame: Hasil ambil_ringkasan_cuaca (kolom '<variabel>_<fungsi>').
+    """
+    try:
+        return ambil_ringkasan_cuaca(
+            tanggal_mulai=tanggal_mulai,
+            tanggal_selesai=tanggal_selesai,
+            id_wilayah=cari_id_wilayah(nama_wilayah),
+            dimensi=dimensi,
+            variabel=list(variabel)
+        )
+    except Exception as e:
+        st.error(f"❌ Error loading ringkasan: {str(e)[:200]}")
+        return pd.DataFrame()
+
+@st.cache_data(max_entries=ENTRI_CACHE)
+def muat_halaman_cuaca(versi, tanggal_mulai, tanggal_selesai, nama_wilayah, kolom, filter_nilai, urutan,
+                       ukuran_halaman, setelah=None, sebelum=None, halaman=None, terakhir=None):
+    """
+    Satu halaman grid Data Mentah (lihat ambil_halaman_cuaca).
+    filter_nilai: tuple (kolom, minimum, maksimum) agar bisa di-hash cache.
+    """
+    try:
+        return ambil_halaman_cuaca(
+            tanggal_mulai=tanggal_mulai.strftime('%Y-%m-%d'),
+            tanggal_selesai=tanggal_selesai.strftime('%Y-%m-%d'),
+            id_wilayah=cari_id_wilayah(nama_wilayah),
+            kolom=list(kolom) if kolom else None,
+            filter_nilai={k: (bawah, atas) for k, bawah, atas in filter_nilai},
+            urutan=urutan,
+            ukuran_halaman=ukuran_halaman,
+            setelah=setelah,
+            sebelum=sebelum,
+            halaman=halaman,
+            terakhir=terakhir
+        )
+    except Exception as e:
+        st.error(f"❌ Error loading halaman: {str(e)[:200]}")
+        return {'data': pd.DataFrame(), 'pertama': None, 'terakhir': None,
+                'ada_sebelumnya': False, 'ada_berikutnya': False}
+
+@st.cache_data(max_entries=ENTRI_CACHE)
+def muat_jumlah_baris(versi, tanggal_mulai, tanggal_selesai, nama_wilayah, kolom, filter_nilai):
+    """Jumlah baris grid Data Mentah (predikat sama dengan muat_halaman_cuaca)"""
+    try:
+        return hitung_baris_cuaca(
+            tanggal_mulai=tanggal_mulai.strftime('%Y-%m-%d'),
+            tanggal_selesai=tanggal_selesai.strftime('%Y-%m-%d'),
+            id_wilayah=cari_id_wilayah(nama_wilayah),
+            filter_nilai={k: (bawah, atas) for k, bawah, atas in filter_nilai},
+            kolom=list(kolom) if kolom else None
+        )
+    except Exception:
+        return 0
+
+def geser_grid(permintaan, halaman):
+    """Callback tombol navigasi grid: simpan permintaan halaman berikutnya"""
+    st.session_state['grid_mentah'].update(permintaan=permintaan, halaman=halaman)
+
+def permintaan_halaman(halaman, jumlah_halaman, jumlah_baris, ukuran_halaman, tepi=None):
+    """
+    Permintaan muat_halaman_cuaca untuk nomor halaman: halaman pertama dan
+    terakhir tanpa OFFSET (terakhir = urutan terbalik), tetangga halaman yang
+    sudah dibuka lewat kunci tepinya (keyset), halaman lain lewat batas bulan
+    dari ringkasan (lihat ambil_halaman_cuaca).
+    
+    Args:
+        tepi (dict): {nomor halaman: (kunci pertama, kunci terakhir)} halaman
+            yang sudah dibuka.
+    """
+    tepi = tepi or {}
+    if halaman > 1 and halaman == jumlah_halaman:
+        return {'terakhir': jumlah_baris - (jumlah_halaman - 1) * ukuran_halaman}
+    if halaman > 1 and halaman - 1 in tepi:
+        return {'setelah': tepi[halaman - 1][1]}
+    if halaman + 1 in tepi:
+        return {'sebelum': tepi[halaman + 1][0]}
+    return {'halaman': halaman}
+
+def lompat_grid(jumlah_halaman, jumlah_baris, ukuran_halaman):
+    """Callback tombol Lompat: pakai nomor di input 'halaman_tujuan'"""
+    halaman = min(max(int(st.session_state['halaman_tujuan']), 1), jumlah_halaman)
+    tepi = st.session_state['grid_mentah']['tepi']
+    geser_grid(permintaan_halaman(halaman, jumlah_halaman, jumlah_baris, ukuran_halaman, tepi), halaman)
+
+def ekspor_csv_periode_penuh(tanggal_mulai, tanggal_selesai, nama_wilayah):
+    """
+    CSV (gzip) seluruh periode tanpa Limit Data. Data dibaca per chunk
+    lewat ambil_data_cuaca_bertahap dan langsung dikompres, jadi memori
+    tidak ikut membesar dengan jumlah baris.
+    
+    Returns:
+        tuple: (bytes gzip, jumlah baris)
+    """
+    import gzip
+    from io import BytesIO
+    
+    output = BytesIO()
+    nama_kolom = ambil_nama_kolom()
+    jumlah_baris = 0
+    with gzip.GzipFile(fileobj=output, mode='wb') as berkas:
+        berkas.write('\ufeff'.encode('utf-8'))  # BOM seperti ekspor CSV biasa (utf-8-sig)
+        for chunk in ambil_data_cuaca_bertahap(
+            tanggal_mulai=tanggal_mulai.strftime('%Y-%m-%d'),
+            tanggal_selesai=tanggal_selesai.strftime('%Y-%m-%d'),
+            id_wilayah=cari_id_wilayah(nama_wilayah)
+        ):
+            teks = chunk.rename(columns=nama_kolom).to_csv(index=False, header=(jumlah_baris == 0))
+            berkas.write(teks.encode('utf-8'))
+            jumlah_baris += len(chunk)
+    return output.getvalue(), jumlah_baris
+
 # Main content berdasarkan tab selection
 if tab_selection == "🏠 Dashboard Utama":
     st.markdown("## 📊 Gambaran Umum Data Iklim")
     
     # Load data
-    df = muat_data_cuaca(tanggal_mulai, tanggal_selesai, wilayah_terpilih, batas_data)
+    df = muat_data_cuaca(versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih, batas_data,
+                         KOLOM_HALAMAN['dashboard'])
     
     if df.empty:
         st.markdown('<div class="warning-box"><b>⚠️ Tidak ada data yang ditemukan</b><br>Coba periksa filter tanggal atau koneksi database</div>', unsafe_allow_html=True)
@@ -349,17 +569,17 @@ if tab_selection == "🏠 Dashboard Utama":
         
         # Tabel data ringkasan
         st.markdown("### 📋 Ringkasan Data")
-        if 'Tanggal' in df.columns:
-            df['Bulan'] = df['Tanggal'].dt.month
-            ringkasan_bulanan = df.groupby('Bulan').agg({
-                'Suhu Rata-rata': 'mean',
-                'Curah Hujan': 'sum',
-                'Kelembaban Rata-rata': 'mean'
-            }).reset_index()
-            
-            nama_bulan = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
-                         'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
-            ringkasan_bulanan['Nama Bulan'] = ringkasan_bulanan['Bulan'].apply(lambda x: nama_bulan[x-1] if 1 <= x <= 12 else 'Unknown')
+        ringkasan_bulanan = muat_ringkasan_cuaca(
+            versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih, ('bulan',),
+            ('suhu_rata_rata', 'curah_hujan', 'kelembaban_rata_rata')
+        )
+        if not ringkasan_bulanan.empty:
+            ringkasan_bulanan = ringkasan_bulanan.rename(columns={
+                'suhu_rata_rata_mean': 'Suhu Rata-rata',
+                'curah_hujan_sum': 'Curah Hujan',
+                'kelembaban_rata_rata_mean': 'Kelembaban Rata-rata'
+            })
+            ringkasan_bulanan['Nama Bulan'] = ringkasan_bulanan['bulan'].apply(lambda x: NAMA_BULAN[x-1] if 1 <= x <= 12 else 'Unknown')
             
             st.dataframe(ringkasan_bulanan[['Nama Bulan', 'Suhu Rata-rata', 'Curah Hujan', 'Kelembaban Rata-rata']].round(2), 
                         use_container_width=True)
@@ -374,8 +594,13 @@ elif tab_selection == "🗺️ Peta Stasiun":
          "🔥 Heatmap Suhu", "💧 Heatmap Hujan", "🌈 Kombinasi Iklim"]
     )
     
-    # Load data stasiun
-    df_stasiun = ambil_data_stasiun()
+    # Data stasiun dan data cuaca diambil bersamaan
+    data_peta = jalankan_bersamaan({
+        'stasiun': ambil_data_stasiun,
+        'cuaca': (muat_data_cuaca, versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih, 5000,
+                  KOLOM_HALAMAN['peta']),
+    })
+    df_stasiun = data_peta['stasiun']
     
     if df_stasiun.empty:
         st.error("❌ Tidak ada data stasiun yang ditemukan.")
@@ -390,7 +615,7 @@ elif tab_selection == "🗺️ Peta Stasiun":
         })
         
         # Load weather data untuk analisis
-        df_cuaca = muat_data_cuaca(tanggal_mulai, tanggal_selesai, wilayah_terpilih, 5000)
+        df_cuaca = data_peta['cuaca']
         
         # Gabungkan data stasiun dengan data cuaca terbaru
         if not df_cuaca.empty and 'ID Stasiun' in df_cuaca.columns:
@@ -950,7 +1175,8 @@ elif tab_selection == "🗺️ Peta Stasiun":
 elif tab_selection == "📈 Analisis Suhu":
     st.markdown("## 📈 Analisis Data Suhu")
     
-    df = muat_data_cuaca(tanggal_mulai, tanggal_selesai, wilayah_terpilih, batas_data)
+    df = muat_data_cuaca(versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih, batas_data,
+                         KOLOM_HALAMAN['suhu'])
     
     if df.empty:
         st.warning("Tidak ada data yang ditemukan")
@@ -1001,17 +1227,17 @@ elif tab_selection == "📈 Analisis Suhu":
                         st.plotly_chart(fig_box, use_container_width=True)
             
             with tab2:
-                if 'Tanggal' in df.columns:
-                    df['Bulan'] = df['Tanggal'].dt.month
-                    rata_bulanan = df.groupby('Bulan').agg({
-                        'Suhu Rata-rata': 'mean',
-                        'Suhu Minimum': 'min',
-                        'Suhu Maksimum': 'max'
-                    }).reset_index()
-                    
-                    nama_bulan = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
-                                 'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
-                    rata_bulanan['Nama Bulan'] = rata_bulanan['Bulan'].apply(lambda x: nama_bulan[x-1] if 1 <= x <= 12 else 'Unknown')
+                rata_bulanan = muat_ringkasan_cuaca(
+                    versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih, ('bulan',),
+                    ('suhu_rata_rata', 'suhu_minimum', 'suhu_maksimum')
+                )
+                if not rata_bulanan.empty:
+                    rata_bulanan = rata_bulanan.rename(columns={
+                        'suhu_rata_rata_mean': 'Suhu Rata-rata',
+                        'suhu_minimum_min': 'Suhu Minimum',
+                        'suhu_maksimum_max': 'Suhu Maksimum'
+                    })
+                    rata_bulanan['Nama Bulan'] = rata_bulanan['bulan'].apply(lambda x: NAMA_BULAN[x-1] if 1 <= x <= 12 else 'Unknown')
                     
                     fig_trend = go.Figure()
                     
@@ -1053,7 +1279,8 @@ elif tab_selection == "📈 Analisis Suhu":
 elif tab_selection == "🌧️ Analisis Hujan":
     st.markdown("## 🌧️ Analisis Data Curah Hujan")
     
-    df = muat_data_cuaca(tanggal_mulai, tanggal_selesai, wilayah_terpilih, batas_data)
+    df = muat_data_cuaca(versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih, batas_data,
+                         KOLOM_HALAMAN['hujan'])
     
     if df.empty:
         st.warning("Tidak ada data yang ditemukan")
@@ -1103,12 +1330,15 @@ elif tab_selection == "🌧️ Analisis Hujan":
                         st.plotly_chart(fig_hujan_dist, use_container_width=True)
                 
                 with col2:
-                    if 'Tanggal' in df.columns:
-                        df['Hari'] = df['Tanggal'].dt.dayofweek
-                        nama_hari = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
-                        df['Nama Hari'] = df['Hari'].apply(lambda x: nama_hari[x])
-                        
-                        hujan_per_hari = df.groupby('Nama Hari')['Curah Hujan'].sum().reindex(nama_hari)
+                    agregat_hari = muat_agregat_cuaca(versi_aktif, tanggal_mulai, tanggal_selesai,
+                                                      wilayah_terpilih, ('hari',), (('curah_hujan', 'sum'),))
+                    if not agregat_hari.empty:
+                        # WEEKDAY di MySQL: 0 = Senin, sama dengan dt.dayofweek
+                        hujan_per_hari = pd.Series(
+                            agregat_hari['curah_hujan_sum'].to_numpy(),
+                            index=pd.Index([NAMA_HARI[h] for h in agregat_hari['hari']], name='Nama Hari'),
+                            name='Curah Hujan'
+                        ).reindex(NAMA_HARI)
                         
                         fig_hari = px.bar(
                             hujan_per_hari.reset_index(),
@@ -1128,14 +1358,21 @@ elif tab_selection == "🌧️ Analisis Hujan":
                 # Analisis spasial hujan
                 st.markdown("### 📍 Distribusi Spasial Hujan")
                 
-                if 'Wilayah' in df.columns and 'Provinsi' in df.columns:
-                    # Group by wilayah
-                    hujan_per_wilayah = df.groupby(['Provinsi', 'Wilayah']).agg({
-                        'Curah Hujan': ['sum', 'mean', 'max', 'count']
-                    }).reset_index()
-                    
-                    # Flatten multi-index columns
-                    hujan_per_wilayah.columns = ['Provinsi', 'Wilayah', 'Total_Hujan', 'Rata_Hujan', 'Maks_Hujan', 'Jumlah_Data']
+                hujan_per_wilayah = muat_agregat_cuaca(
+                    versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih, ('provinsi', 'wilayah'),
+                    (('curah_hujan', 'sum'), ('curah_hujan', 'mean'), ('curah_hujan', 'max'), ('curah_hujan', 'count'))
+                )
+                
+                if not hujan_per_wilayah.empty:
+                    # Group by wilayah (dihitung di database)
+                    hujan_per_wilayah = hujan_per_wilayah.rename(columns={
+                        'nama_provinsi': 'Provinsi',
+                        'nama_wilayah': 'Wilayah',
+                        'curah_hujan_sum': 'Total_Hujan',
+                        'curah_hujan_mean': 'Rata_Hujan',
+                        'curah_hujan_max': 'Maks_Hujan',
+                        'curah_hujan_count': 'Jumlah_Data'
+                    })[['Provinsi', 'Wilayah', 'Total_Hujan', 'Rata_Hujan', 'Maks_Hujan', 'Jumlah_Data']]
                     
                     # Tampilkan top 10 wilayah dengan hujan terbanyak
                     top_hujan = hujan_per_wilayah.nlargest(10, 'Total_Hujan')
@@ -1162,7 +1399,8 @@ elif tab_selection == "🌧️ Analisis Hujan":
 elif tab_selection == "🌀 Analisis Angin":
     st.markdown("## 🌀 Analisis Data Angin")
     
-    df = muat_data_cuaca(tanggal_mulai, tanggal_selesai, wilayah_terpilih, batas_data)
+    df = muat_data_cuaca(versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih, batas_data,
+                         KOLOM_HALAMAN['angin'])
     
     if df.empty:
         st.warning("Tidak ada data yang ditemukan")
@@ -1279,7 +1517,8 @@ elif tab_selection == "🌀 Analisis Angin":
 elif tab_selection == "📋 Data Mentah":
     st.markdown("## 📋 Data Mentah dan Ekspor")
     
-    df = muat_data_cuaca(tanggal_mulai, tanggal_selesai, wilayah_terpilih, batas_data)
+    df = muat_data_cuaca(versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih, batas_data,
+                         KOLOM_HALAMAN['data_mentah'])
     
     if df.empty:
         st.warning("Tidak ada data yang ditemukan")
@@ -1293,7 +1532,7 @@ elif tab_selection == "📋 Data Mentah":
             tanggal_maks = df['Tanggal'].max()
             st.markdown(f"**Periode:** {tanggal_min.strftime('%Y-%m-%d')} - {tanggal_maks.strftime('%Y-%m-%d')}")
         
-        # Preview dengan pilihan kolom
+        # Preview per halaman: urutan, filter, dan kolom dikerjakan di database
         st.markdown("### 👁️ Preview Data")
         
         # Pilih kolom untuk ditampilkan
@@ -1304,10 +1543,74 @@ elif tab_selection == "📋 Data Mentah":
             default=semua_kolom[:10] if len(semua_kolom) > 10 else semua_kolom
         )
         
-        if kolom_pilihan:
-            st.dataframe(df[kolom_pilihan].head(100), use_container_width=True, height=400)
-        else:
-            st.dataframe(df.head(100), use_container_width=True, height=400)
+        nama_kolom = ambil_nama_kolom()
+        kolom_db = {tampil: db for db, tampil in nama_kolom.items()}
+        kolom_grid = tuple(kolom_db[k] for k in kolom_pilihan if k in kolom_db)
+        
+        col_urut, col_ukuran = st.columns(2)
+        with col_urut:
+            urutan = st.radio("Urutan tanggal:", ['terbaru', 'terlama'], horizontal=True,
+                              format_func=lambda u: "Terbaru dulu" if u == 'terbaru' else "Terlama dulu")
+        with col_ukuran:
+            ukuran_halaman = st.selectbox("Baris per halaman:", [50, 100, 250, 500], index=1)
+        
+        filter_nilai = ()
+        with st.expander("🔎 Filter Nilai"):
+            kolom_filter = st.selectbox("Kolom:", [None] + KOLOM_NUMERIK_CUACA,
+                                        format_func=lambda k: "(tanpa filter)" if k is None else nama_kolom.get(k, k))
+            if kolom_filter:
+                col_bawah, col_atas = st.columns(2)
+                with col_bawah:
+                    nilai_bawah = st.number_input("Minimum", value=None)
+                with col_atas:
+                    nilai_atas = st.number_input("Maksimum", value=None)
+                if nilai_bawah is not None or nilai_atas is not None:
+                    filter_nilai = ((kolom_filter, nilai_bawah, nilai_atas),)
+        
+        # Navigasi dimulai ulang dari halaman 1 setiap kali filter berubah
+        kunci_grid = (tanggal_mulai, tanggal_selesai, wilayah_terpilih, kolom_grid, filter_nilai,
+                      urutan, ukuran_halaman)
+        grid = st.session_state.get('grid_mentah')
+        if grid is None or grid['kunci'] != kunci_grid:
+            grid = {'kunci': kunci_grid, 'halaman': 1, 'permintaan': {'halaman': 1}, 'tepi': {}}
+            st.session_state['grid_mentah'] = grid
+        
+        jumlah_baris_grid = muat_jumlah_baris(versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih,
+                                              kolom_grid, filter_nilai)
+        jumlah_halaman = max(1, -(-jumlah_baris_grid // ukuran_halaman))
+        hasil_halaman = muat_halaman_cuaca(versi_aktif, tanggal_mulai, tanggal_selesai, wilayah_terpilih,
+                                           kolom_grid, filter_nilai, urutan, ukuran_halaman,
+                                           **grid['permintaan'])
+        if hasil_halaman['pertama'] is not None:
+            grid['tepi'][grid['halaman']] = (hasil_halaman['pertama'], hasil_halaman['terakhir'])
+        
+        df_halaman = hasil_halaman['data'].rename(columns=nama_kolom)
+        kolom_tampil = [k for k in kolom_pilihan if k in df_halaman.columns] or df_halaman.columns.tolist()
+        st.dataframe(df_halaman[kolom_tampil], use_container_width=True, height=400)
+        st.caption(f"Halaman {grid['halaman']:,} dari {jumlah_halaman:,} • {jumlah_baris_grid:,} baris")
+        
+        col_nav1, col_nav2, col_nav3, col_nav4, col_nav5, col_nav6 = st.columns([1, 1, 1, 1, 1.2, 1])
+        with col_nav1:
+            st.button("⏮️ Pertama", on_click=geser_grid, args=({'halaman': 1}, 1),
+                      disabled=grid['halaman'] <= 1)
+        with col_nav2:
+            st.button("◀️ Sebelumnya", on_click=geser_grid,
+                      args=({'sebelum': hasil_halaman['pertama']}, grid['halaman'] - 1),
+                      disabled=not hasil_halaman['ada_sebelumnya'] or hasil_halaman['pertama'] is None)
+        with col_nav3:
+            st.button("▶️ Berikutnya", on_click=geser_grid,
+                      args=({'setelah': hasil_halaman['terakhir']}, grid['halaman'] + 1),
+                      disabled=not hasil_halaman['ada_berikutnya'] or hasil_halaman['terakhir'] is None)
+        with col_nav4:
+            st.button("⏭️ Terakhir", on_click=geser_grid,
+                      args=(permintaan_halaman(jumlah_halaman, jumlah_halaman, jumlah_baris_grid,
+                                               ukuran_halaman, grid['tepi']), jumlah_halaman),
+                      disabled=grid['halaman'] >= jumlah_halaman)
+        with col_nav5:
+            st.number_input("Ke halaman", min_value=1, value=1, step=1,
+                            key='halaman_tujuan', label_visibility='collapsed')
+        with col_nav6:
+            st.button("Lompat", on_click=lompat_grid, args=(jumlah_halaman, jumlah_baris_grid, ukuran_halaman))
         
         # Statistik deskriptif
         st.markdown("### 📊 Statistik Deskriptif")
@@ -1361,12 +1664,30 @@ elif tab_selection == "📋 Data Mentah":
                 mime="application/json",
                 help="Download data dalam format JSON"
             )
+        
+        # Ekspor tanpa Limit Data (streaming dari database)
+        with st.expander("📦 Ekspor Periode Penuh (tanpa limit)"):
+            st.caption("Semua baris pada rentang tahun dan wilayah terpilih, dibaca bertahap dari database.")
+            if st.button("Siapkan CSV Periode Penuh"):
+                with st.spinner("Membaca data per chunk..."):
+                    csv_gz, jumlah_baris = ekspor_csv_periode_penuh(tanggal_mulai, tanggal_selesai, wilayah_terpilih)
+                st.success(f"✅ {jumlah_baris:,} baris siap diunduh")
+                st.download_button(
+                    label="📥 Download CSV Periode Penuh (.csv.gz)",
+                    data=csv_gz,
+                    file_name=f"data_iklim_{tanggal_mulai:%Y-%m-%d}_ke_{tanggal_selesai:%Y-%m-%d}.csv.gz",
+                    mime="application/gzip"
+                )
 
 elif tab_selection == "🔍 Info Database":
     st.markdown("## 🔍 Informasi Database")
     
-    # Database stats
-    statistik = ambil_statistik_database()
+    # Database stats (statistik dan tahun tersedia diambil bersamaan)
+    data_info = jalankan_bersamaan({
+        'statistik': ambil_statistik_database,
+        'tahun': ambil_tahun_tersedia,
+    })
+    statistik = data_info['statistik']
     
     if statistik:
         st.markdown("### 📊 Statistik Database")
@@ -1385,17 +1706,115 @@ elif tab_selection == "🔍 Info Database":
         with col5:
             st.metric("Total Provinsi", statistik.get('total_provinsi', 0))
         with col6:
-            if 'rentang_tanggal' in statistik:
-                st.metric("Rentang Tanggal", "2010-2025")
+            if statistik.get('tanggal_min') and statistik.get('tanggal_maks'):
+                st.metric("Rentang Tanggal",
+                          f"{statistik['tanggal_min'].year}-{statistik['tanggal_maks'].year}",
+                          help=statistik.get('rentang_tanggal'))
+        with col7:
+            if 'versi_import' in statistik:
+                st.metric("Versi Import", statistik['versi_import'],
+                          help="Naik setiap kali data/import.py selesai memuat data")
         
         # Info tambahan
         st.markdown("### ℹ️ Informasi Tambahan")
         
         # Available years
-        tahun_tersedia = ambil_tahun_tersedia()
+        tahun_tersedia = data_info['tahun']
         if tahun_tersedia:
             st.markdown(f"**Tahun yang Tersedia:** {', '.join(map(str, tahun_tersedia))}")
         
+        # Pemakaian pool koneksi (bersama untuk semua pengguna di proses ini)
+        st.markdown("#### 🔌 Pool Koneksi")
+        statistik_pool = ambil_statistik_pool()
+        col_pool1, col_pool2, col_pool3, col_pool4 = st.columns(4)
+        with col_pool1:
+            st.metric("Ukuran Pool", statistik_pool['ukuran_pool'])
+        with col_pool2:
+            st.metric("Koneksi Dipinjam", f"{statistik_pool['pinjam']:,}")
+        with col_pool3:
+            st.metric("Langsung Dapat", f"{statistik_pool['rasio_langsung']:.0%}")
+        with col_pool4:
+            st.metric("Rata-rata Tunggu", f"{statistik_pool['rata_rata_tunggu_ms']:,.1f} ms",
+                      help=f"Maks {statistik_pool['maks_tunggu_ms']:,.1f} ms, "
+                           f"{statistik_pool['gagal']} gagal, "
+                           f"{statistik_pool['sambung_ulang']} sambung ulang")
+        
+        # Cache hasil di disk (berlaku sampai versi import berikutnya)
+        st.markdown("#### 💾 Cache Hasil")
+        statistik_cache = ambil_statistik_cache()
+        if statistik_cache['aktif']:
+            col_cache1, col_cache2, col_cache3, col_cache4 = st.columns(4)
+            with col_cache1:
+                versi_cache = statistik_cache['versi']
+                st.metric("Versi Cache", versi_cache if versi_cache is not None else "-")
+            with col_cache2:
+                st.metric("Rasio Kena", f"{statistik_cache['rasio_kena']:.0%}",
+                          help=f"{statistik_cache['kena']:,} kena, {statistik_cache['luput']:,} luput "
+                               f"sejak proses dimulai")
+            with col_cache3:
+                st.metric("File Cache", f"{statistik_cache['file']:,}")
+            with col_cache4:
+                st.metric("Ukuran Cache", f"{statistik_cache['ukuran_mb']:,.1f} MB")
+        else:
+            st.info("Cache hasil dimatikan (IKLIM_CACHE_HASIL=0)")
+        
+        # Latensi per fungsi ambil_* dan query lambat (riwayat per proses)
+        st.markdown("#### ⏱️ Kinerja Query")
+        explain_lambat = st.checkbox(
+            "Ambil EXPLAIN untuk query lambat",
+            value=atur_explain_lambat(),
+            help=f"Rencana query dicatat untuk pemanggilan ≥ {BATAS_QUERY_LAMBAT_MS:,.0f} ms "
+                 f"(dijalankan di latar belakang)"
+        )
+        atur_explain_lambat(explain_lambat)
+        
+        latensi = ringkasan_latensi()
+        if not latensi.empty:
+            st.dataframe(
+                latensi.rename(columns={
+                    'fungsi': 'Fungsi', 'panggilan': 'Panggilan', 'p50_ms': 'p50 (ms)',
+                    'p95_ms': 'p95 (ms)', 'p99_ms': 'p99 (ms)', 'maks_ms': 'Maks (ms)',
+                    'rata_tunggu_ms': 'Tunggu Koneksi (ms)', 'rata_baris': 'Rata-rata Baris',
+                    'memori_mb': 'Memori Hasil (MB, perkiraan)', 'rasio_cache': 'Dari Cache', 'error': 'Error'
+                }).round(2),
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.info("Belum ada query yang tercatat")
+        
+        query_lambat = ambil_riwayat_query(hanya_lambat=True, batas=20)
+        st.markdown(f"**Query Lambat Terbaru** (≥ {BATAS_QUERY_LAMBAT_MS:,.0f} ms)")
+        if not query_lambat:
+            st.caption("Tidak ada pemanggilan lambat")
+        for rekaman in query_lambat:
+            judul = (f"{rekaman['waktu']:%H:%M:%S} · {rekaman['fungsi']} · {rekaman['ms']:,.0f} ms"
+                     + (" · ❌ error" if rekaman['error'] else ""))
+            with st.expander(judul):
+                col_q1, col_q2, col_q3, col_q4 = st.columns(4)
+                with col_q1:
+                    st.metric("Baris", f"{rekaman['baris']:,}" if rekaman['baris'] is not None else "-")
+                with col_q2:
+                    st.metric("Memori Hasil (perkiraan)",
+                              f"{rekaman['memori_byte'] / (1024 * 1024):,.2f} MB"
+                              if rekaman['memori_byte'] is not None else "-")
+                with col_q3:
+                    st.metric("Tunggu Koneksi", f"{rekaman['tunggu_ms']:,.1f} ms")
+                with col_q4:
+                    st.metric("Jumlah SQL", rekaman['jumlah_sql'])
+                if rekaman['error']:
+                    st.error(rekaman['error'])
+                for perintah in rekaman['sql']:
+                    st.code(" ".join(perintah['sql'].split()), language='sql')
+                    st.caption(f"{perintah['ms']:,.1f} ms · parameter: {perintah['parameter'][:20]}"
+                               + (" ..." if len(perintah['parameter']) > 20 else ""))
+                if rekaman['explain']:
+                    st.markdown("**EXPLAIN** (SQL paling lambat)")
+                    if 'error' in rekaman['explain']:
+                        st.warning(rekaman['explain']['error'])
+                    else:
+                        st.dataframe(pd.DataFrame(rekaman['explain']['rencana']), use_container_width=True)
+        
         # Info struktur database
         st.markdown("#### 🗃️ Struktur Database")
         st.markdown("""
@@ -1437,16 +1856,18 @@ elif tab_selection == "🔍 Info Database":
         
         with tab4:
             # Query langsung untuk provinsi
+            db = KonektorDatabase()
+            koneksi = None
             try:
-                db = KonektorDatabase()
                 koneksi = db.buat_koneksi()
                 if koneksi:
                     query = "SELECT * FROM provinsi ORDER BY nama_provinsi"
                     df_provinsi = pd.read_sql(query, koneksi)
                     st.dataframe(df_provinsi)
-                    koneksi.close()
             except:
                 st.info("Tidak bisa mengambil data provinsi")
+            finally:
+                db.tutup_koneksi(koneksi)
         
         with tab5:
             data_arah = ambil_arah_angin()
@@ -0,0 +1,820 @@
+"""
+skema.py - DEFINISI DAN MIGRASI SKEMA DATABASE IKLIM INDONESIA
+Membuat tabel provinsi, wilayah, stasiun, arah_angin, dan observasi_cuaca
+beserta index-nya, tabel ringkasan bulanan/tahunan per stasiun, katalog
+metadata, dan memeriksa rencana query ambil_* dengan EXPLAIN.
+Skema yang sama juga dibuat di file DuckDB untuk backend tertanam.
+Hanya butuh mysql.connector sehingga bisa dipakai oleh data/import.py.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+import mysql.connector
+
+# Parameter koneksi (dipakai juga oleh config.KonektorDatabase dan data/import.py);
+# default server Laragon lokal, bisa diganti lewat environment
+KONFIG_DB = {
+    'host': os.environ.get('IKLIM_DB_HOST', 'localhost'),
+    'port': int(os.environ.get('IKLIM_DB_PORT', 3306)),
+    'user': os.environ.get('IKLIM_DB_USER', 'root'),
+    'password': os.environ.get('IKLIM_DB_PASSWORD', ''),
+}
+NAMA_DATABASE = os.environ.get('IKLIM_DB_NAMA', 'iklim_indonesia')
+
+# Riwayat versi skema yang sudah dijalankan pada database
+SQL_BUAT_VERSI_SKEMA = """
+    CREATE TABLE IF NOT EXISTS versi_skema (
+        versi INT PRIMARY KEY,
+        keterangan VARCHAR(255) NOT NULL,
+        dijalankan TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB
+"""
+
+# Tabel dimensi sengaja tanpa FOREIGN KEY: import memakai INSERT IGNORE
+# dan benchmark mengosongkan tabel dengan TRUNCATE
+TABEL = {
+    'provinsi': """
+        CREATE TABLE IF NOT EXISTS provinsi (
+            id_provinsi INT NOT NULL,
+            nama_provinsi VARCHAR(100) NOT NULL,
+            PRIMARY KEY (id_provinsi)
+        ) ENGINE=InnoDB
+    """,
+    'wilayah': """
+        CREATE TABLE IF NOT EXISTS wilayah (
+            id_wilayah INT NOT NULL,
+            nama_wilayah VARCHAR(100) NOT NULL,
+            id_provinsi INT,
+            PRIMARY KEY (id_wilayah),
+            KEY idx_provinsi (id_provinsi)
+        ) ENGINE=InnoDB
+    """,
+    'stasiun': """
+        CREATE TABLE IF NOT EXISTS stasiun (
+            id_stasiun INT NOT NULL,
+            nama_stasiun VARCHAR(150) NOT NULL,
+            id_wilayah INT,
+            lintang DOUBLE,
+            bujur DOUBLE,
+            PRIMARY KEY (id_stasiun),
+            KEY idx_wilayah (id_wilayah)
+        ) ENGINE=InnoDB
+    """,
+    'arah_angin': """
+        CREATE TABLE IF NOT EXISTS arah_angin (
+            kode_arah VARCHAR(10) NOT NULL,
+            nama_arah VARCHAR(30) NOT NULL,
+            nama_arah_id VARCHAR(30) NOT NULL,
+            PRIMARY KEY (kode_arah)
+        ) ENGINE=InnoDB
+    """,
+    # Kunci cluster (id_stasiun, tanggal): data satu stasiun tersimpan
+    # berurutan per tanggal, dan INSERT IGNORE melewati observasi ganda.
+    # id_observasi tetap AUTO_INCREMENT lewat unique key tersendiri.
+    # DOUBLE (bukan DECIMAL) supaya pandas menerima kolom numerik biasa;
+    # bukan FLOAT karena 4 byte hanya ~7 digit (26.1 tersimpan 26.100000381...).
+    'observasi_cuaca': """
+        CREATE TABLE IF NOT EXISTS observasi_cuaca (
+            id_observasi BIGINT NOT NULL AUTO_INCREMENT,
+            id_stasiun INT NOT NULL,
+            tanggal DATE NOT NULL,
+            suhu_minimum DOUBLE,
+            suhu_maksimum DOUBLE,
+            suhu_rata_rata DOUBLE,
+            kelembaban_rata_rata DOUBLE,
+            curah_hujan DOUBLE,
+            durasi_sinar_matahari DOUBLE,
+            kecepatan_angin_maksimum DOUBLE,
+            arah_angin_maksimum SMALLINT,
+            kecepatan_angin_rata_rata DOUBLE,
+            kode_arah_angin VARCHAR(10),
+            PRIMARY KEY (id_stasiun, tanggal),
+            UNIQUE KEY uk_id_observasi (id_observasi),
+            KEY idx_tanggal_observasi (tanggal, id_observasi),
+            KEY idx_tanggal_cakupan (tanggal, suhu_rata_rata, suhu_minimum, suhu_maksimum,
+                                     curah_hujan, kelembaban_rata_rata, kecepatan_angin_rata_rata)
+        ) ENGINE=InnoDB
+    """,
+}
+
+# Index sekunder yang harus ada (juga ditambahkan ke tabel lama buatan tangan
+# oleh migrasi 2)
+# idx_tanggal_cakupan: agregat per rentang tanggal tanpa membaca baris lengkap
+INDEX = {
+    'wilayah': {'idx_provinsi': 'KEY idx_provinsi (id_provinsi)'},
+    'stasiun': {'idx_wilayah': 'KEY idx_wilayah (id_wilayah)'},
+    'observasi_cuaca': {
+        'uk_id_observasi': 'UNIQUE KEY uk_id_observasi (id_observasi)',
+        'idx_tanggal_cakupan': ('KEY idx_tanggal_cakupan (tanggal, suhu_rata_rata, suhu_minimum, '
+                                'suhu_maksimum, curah_hujan, kelembaban_rata_rata, '
+                                'kecepatan_angin_rata_rata)'),
+    },
+}
+
+# Rentang tanggal, ORDER BY tanggal DESC LIMIT, MIN/MAX, COUNT, dan kunci
+# keyset (tanggal, id_observasi) grid Data Mentah; ditambahkan migrasi 6
+INDEX_KEYSET = 'KEY idx_tanggal_observasi (tanggal, id_observasi)'
+
+KUNCI_OBSERVASI = ['id_stasiun', 'tanggal']
+
+# Kode arah angin yang dipakai data BMKG (kolom ddd_car)
+DATA_ARAH_ANGIN = [
+    ('N', 'North', 'Utara'),
+    ('NE', 'Northeast', 'Timur Laut'),
+    ('E', 'East', 'Timur'),
+    ('SE', 'Southeast', 'Tenggara'),
+    ('S', 'South', 'Selatan'),
+    ('SW', 'Southwest', 'Barat Daya'),
+    ('W', 'West', 'Barat'),
+    ('NW', 'Northwest', 'Barat Laut'),
+    ('C', 'Calm', 'Tenang'),
+]
+
+def buat_koneksi(database=NAMA_DATABASE):
+    """Buka koneksi ke server; database dibuat dulu jika belum ada"""
+    koneksi = mysql.connector.connect(**KONFIG_DB)
+    kursor = koneksi.cursor()
+    kursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}` "
+                   "CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+    kursor.execute(f"USE `{database}`")
+    kursor.close()
+    return koneksi
+
+def index_ada(kursor, tabel, nama_index):
+    """Cek apakah index dengan nama tersebut sudah ada di tabel"""
+    kursor.execute("""
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (tabel, nama_index))
+    return kursor.fetchone()[0] > 0
+
+def kolom_primary_key(kursor, tabel):
+    """Daftar kolom PRIMARY KEY tabel sesuai urutannya"""
+    kursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = 'PRIMARY'
+        ORDER BY SEQ_IN_INDEX
+    """, (tabel,))
+    return [baris[0] for baris in kursor.fetchall()]
+
+def migrasi_1_buat_tabel(kursor):
+    """Buat semua tabel yang belum ada dan isi tabel arah_angin"""
+    for sql in TABEL.values():
+        kursor.execute(sql)
+    kursor.executemany("""
+        INSERT IGNORE INTO arah_angin (kode_arah, nama_arah, nama_arah_id)
+        VALUES (%s, %s, %s)
+    """, DATA_ARAH_ANGIN)
+
+def migrasi_2_index(kursor):
+    """
+    Samakan tabel lama (dibuat manual) dengan definisi di atas: pindahkan
+    PRIMARY KEY observasi_cuaca ke (id_stasiun, tanggal) dan tambahkan
+    index sekunder yang belum ada.
+    """
+    if kolom_primary_key(kursor, 'observasi_cuaca') != KUNCI_OBSERVASI:
+        # id_observasi harus tetap ter-index selama ALTER (AUTO_INCREMENT),
+        # jadi unique key ditambahkan dalam perintah yang sama
+        perubahan = ["DROP PRIMARY KEY", "ADD PRIMARY KEY (id_stasiun, tanggal)"]
+        if not index_ada(kursor, 'observasi_cuaca', 'uk_id_observasi'):
+            perubahan.append("ADD " + INDEX['observasi_cuaca']['uk_id_observasi'])
+        print("Memindahkan PRIMARY KEY observasi_cuaca ke (id_stasiun, tanggal)...")
+        kursor.execute("ALTER TABLE observasi_cuaca " + ", ".join(perubahan))
+    
+    for tabel, daftar_index in INDEX.items():
+        tambahan = [f"ADD {definisi}" for nama, definisi in daftar_index.items()
+                    if not index_ada(kursor, tabel, nama)]
+        if tambahan:
+            print(f"Menambahkan {len(tambahan)} index ke {tabel}...")
+            kursor.execute(f"ALTER TABLE {tabel} " + ", ".join(tambahan))
+
+# ===== PARTISI TAHUNAN observasi_cuaca =====
+# RANGE (YEAR(tanggal)) dengan satu partisi per tahun (p2010, p2011, ...),
+# ditambah pawal untuk tahun sebelum partisi pertama dan pmaks (MAXVALUE).
+# pmaks dibiarkan kosong: import memecahnya sebelum memuat tahun baru.
+
+# Nama GET_LOCK supaya worker import paralel tidak mengubah partisi bersamaan
+KUNCI_PARTISI = 'iklim_partisi_observasi_cuaca'
+
+# Total waktu tunggu satu GET_LOCK (partisi dan ringkasan) sebelum import
+# menyerah; REORGANIZE PARTITION tabel besar bisa jauh lebih lama dari 2 menit
+BATAS_TUNGGU_KUNCI = int(os.environ.get('IKLIM_BATAS_TUNGGU_KUNCI', 600))
+# Tunggu GET_LOCK pertama (detik); berikutnya digandakan sampai batas habis
+TUNGGU_AWAL_KUNCI = 5
+
+def ambil_kunci(kursor, nama, batas_tunggu=BATAS_TUNGGU_KUNCI, tunggu_awal=TUNGGU_AWAL_KUNCI):
+    """
+    GET_LOCK dengan backoff: setiap percobaan menunggu di server dua kali
+    lebih lama dari sebelumnya (tunggu_awal, 2x, 4x, ...) sampai total
+    batas_tunggu detik, dengan pesan di antaranya supaya worker yang antre
+    terlihat menunggu, bukan macet.
+    
+    Raises:
+        RuntimeError: Kunci tidak didapat dalam batas_tunggu detik.
+    """
+    sisa = batas_tunggu
+    tunggu = tunggu_awal
+    while True:
+        tunggu = min(tunggu, sisa)
+        kursor.execute("SELECT GET_LOCK(%s, %s)", (nama, tunggu))
+        hasil = kursor.fetchone()[0]
+        if hasil:
+            return
+        if hasil is None:
+            # NULL = error di server (mis. sesi di-KILL), bukan habis waktu
+            time.sleep(tunggu)
+        sisa -= tunggu
+        if sisa <= 0:
+            raise RuntimeError(f"Gagal mendapat kunci {nama} dalam {batas_tunggu} detik")
+        print(f"⏳ Menunggu kunci {nama} ({batas_tunggu - sisa}/{batas_tunggu} detik)...")
+        tunggu *= 2
+
+# Tahun di luar rentang ini tetap masuk pawal/pmaks (tanggal rusak tidak membuat ratusan partisi)
+TAHUN_PARTISI_MIN = 1950
+
+def nama_partisi(tahun):
+    """Nama partisi untuk satu tahun, mis. p2021"""
+    return f"p{tahun}"
+
+def definisi_partisi(tahun_awal, tahun_akhir):
+    """Klausa PARTITION BY untuk tahun_awal..tahun_akhir (inklusif)"""
+    partisi = [f"PARTITION pawal VALUES LESS THAN ({tahun_awal})"]
+    partisi += [f"PARTITION {nama_partisi(t)} VALUES LESS THAN ({t + 1})"
+                for t in range(tahun_awal, tahun_akhir + 1)]
+    partisi.append("PARTITION pmaks VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (YEAR(tanggal)) (\n    " + ",\n    ".join(partisi) + "\n)"
+
+def partisi_tahun(kursor):
+    """
+    Baca partisi observasi_cuaca dari information_schema.
+
+    Returns:
+        tuple: (set tahun yang punya partisi sendiri, batas atas pawal),
+               atau None jika tabel tidak berpartisi.
+    """
+    kursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'observasi_cuaca'
+        AND PARTITION_NAME IS NOT NULL
+    """)
+    baris = kursor.fetchall()
+    if not baris:
+        return None
+    tahun = {int(nama[1:]) for nama, _ in baris if nama[1:].isdigit()}
+    batas_awal = next((int(batas) for nama, batas in baris if nama == 'pawal'), None)
+    return tahun, batas_awal
+
+def pastikan_partisi_tahun(kursor, daftar_tahun, batas_tunggu=BATAS_TUNGGU_KUNCI):
+    """
+    Pastikan setiap tahun di daftar_tahun punya partisi sendiri dengan
+    memecah pmaks (tahun baru) atau pawal (tahun lama) lewat REORGANIZE
+    PARTITION. Dijalankan di bawah GET_LOCK (ambil_kunci) sehingga aman
+    dipanggil dari beberapa worker. DDL melakukan commit implisit.
+
+    Returns:
+        set: Tahun yang sekarang punya partisi (kosong jika tabel tidak berpartisi).
+    """
+    batas_atas = datetime.now().year + 1
+    ambil_kunci(kursor, KUNCI_PARTISI, batas_tunggu)
+    try:
+        info = partisi_tahun(kursor)
+        if info is None:
+            return set()
+        ada, batas_awal = info
+        perlu = {int(t) for t in daftar_tahun
+                 if TAHUN_PARTISI_MIN <= int(t) <= batas_atas and int(t) not in ada}
+        if not perlu:
+            return ada
+        
+        akhir = max(ada) if ada else batas_awal - 1
+        baru_atas = list(range(akhir + 1, max(perlu) + 1))
+        if baru_atas:
+            bagian = [f"PARTITION {nama_partisi(t)} VALUES LESS THAN ({t + 1})" for t in baru_atas]
+            bagian.append("PARTITION pmaks VALUES LESS THAN MAXVALUE")
+            kursor.execute("ALTER TABLE observasi_cuaca REORGANIZE PARTITION pmaks INTO ("
+                           + ", ".join(bagian) + ")")
+        
+        baru_bawah = list(range(min(perlu), batas_awal)) if min(perlu) < batas_awal else []
+        if baru_bawah:
+            bagian = [f"PARTITION pawal VALUES LESS THAN ({baru_bawah[0]})"]
+            bagian += [f"PARTITION {nama_partisi(t)} VALUES LESS THAN ({t + 1})" for t in baru_bawah]
+            kursor.execute("ALTER TABLE observasi_cuaca REORGANIZE PARTITION pawal INTO ("
+                           + ", ".join(bagian) + ")")
+        
+        tambahan = baru_atas + baru_bawah
+        print(f"✅ Partisi observasi_cuaca ditambahkan: {', '.join(nama_partisi(t) for t in tambahan)}")
+        return ada | set(tambahan)
+    finally:
+        kursor.execute("SELECT RELEASE_LOCK(%s)", (KUNCI_PARTISI,))
+        kursor.fetchall()
+
+def migrasi_3_partisi_tahun(kursor):
+    """
+    Partisi observasi_cuaca per tahun. MySQL mewajibkan setiap unique key
+    memuat kolom partisi, jadi uk_id_observasi diganti index biasa
+    (id_observasi tetap AUTO_INCREMENT dan tetap unik dalam praktik).
+    """
+    if partisi_tahun(kursor) is not None:
+        return
+    if index_ada(kursor, 'observasi_cuaca', 'uk_id_observasi'):
+        kursor.execute("ALTER TABLE observasi_cuaca "
+                       "ADD KEY idx_id_observasi (id_observasi), DROP INDEX uk_id_observasi")
+    
+    kursor.execute("SELECT YEAR(MIN(tanggal)), YEAR(MAX(tanggal)) FROM observasi_cuaca")
+    tahun_min, tahun_maks = kursor.fetchone()
+    tahun_ini = datetime.now().year
+    tahun_awal = tahun_min or tahun_ini
+    tahun_akhir = max(tahun_maks or tahun_ini, tahun_ini)
+    print(f"Mempartisi observasi_cuaca per tahun ({tahun_awal}-{tahun_akhir})...")
+    kursor.execute("ALTER TABLE observasi_cuaca " + definisi_partisi(tahun_awal, tahun_akhir))
+
+# ===== RINGKASAN (ROLLUP) BULANAN DAN TAHUNAN PER STASIUN =====
+# Setiap variabel disimpan sebagai n, jumlah, min, maks, dan jumlah kuadrat
+# sehingga rata-rata dan simpangan baku bisa digabung lintas bulan/stasiun.
+# Diperbarui import (segarkan_ringkasan) hanya untuk stasiun-bulan yang dimuat.
+
+VARIABEL_RINGKASAN = ['suhu_minimum', 'suhu_maksimum', 'suhu_rata_rata', 'kelembaban_rata_rata',
+                      'curah_hujan', 'kecepatan_angin_rata_rata']
+
+# Akhiran kolom ringkasan: (akhiran, tipe, agregat dari observasi, agregat antar-ringkasan)
+STATISTIK_RINGKASAN = [
+    ('n', 'INT NOT NULL DEFAULT 0', 'COUNT({k})', 'SUM({k})'),
+    ('jumlah', 'DOUBLE', 'SUM({k})', 'SUM({k})'),
+    ('min', 'DOUBLE', 'MIN({k})', 'MIN({k})'),
+    ('maks', 'DOUBLE', 'MAX({k})', 'MAX({k})'),
+    ('jumlah_kuadrat', 'DOUBLE', 'SUM({k} * {k})', 'SUM({k})'),
+]
+
+def kolom_ringkasan():
+    """Nama kolom statistik tabel ringkasan, mis. curah_hujan_jumlah"""
+    return [f"{v}_{akhiran}" for v in VARIABEL_RINGKASAN for akhiran, _, _, _ in STATISTIK_RINGKASAN]
+
+def _definisi_ringkasan(nama_tabel, kunci):
+    definisi = [f"{v}_{akhiran} {tipe}" for v in VARIABEL_RINGKASAN
+                for akhiran, tipe, _, _ in STATISTIK_RINGKASAN]
+    return f"""
+        CREATE TABLE IF NOT EXISTS {nama_tabel} (
+            id_stasiun INT NOT NULL,
+            tahun SMALLINT NOT NULL,
+            {'bulan TINYINT NOT NULL,' if 'bulan' in kunci else ''}
+            jumlah_observasi INT NOT NULL,
+            {(',' + chr(10) + '            ').join(definisi)},
+            diperbarui TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (id_stasiun, {', '.join(kunci)}),
+            KEY idx_periode ({', '.join(kunci)})
+        ) ENGINE=InnoDB
+    """
+
+TABEL_RINGKASAN = {
+    'ringkasan_bulanan_stasiun': _definisi_ringkasan('ringkasan_bulanan_stasiun', ['tahun', 'bulan']),
+    'ringkasan_tahunan_stasiun': _definisi_ringkasan('ringkasan_tahunan_stasiun', ['tahun']),
+}
+
+def _select_ringkasan(sumber):
+    """Daftar ekspresi SELECT statistik; sumber 'observasi' atau 'ringkasan'"""
+    daftar = []
+    for v in VARIABEL_RINGKASAN:
+        for akhiran, _, dari_observasi, dari_ringkasan in STATISTIK_RINGKASAN:
+            if sumber == 'observasi':
+                daftar.append(dari_observasi.format(k=v))
+            else:
+                daftar.append(dari_ringkasan.format(k=f"{v}_{akhiran}"))
+    return ", ".join(daftar)
+
+def _sql_simpan_ringkasan(nama_tabel, kunci):
+    kolom = ['id_stasiun'] + kunci + ['jumlah_observasi'] + kolom_ringkasan()
+    return f"REPLACE INTO {nama_tabel} ({', '.join(kolom)}) ", len(kolom)
+
+# REPLACE INTO ... (kolom); diikuti VALUES atau SELECT
+SQL_SIMPAN_BULANAN, JUMLAH_KOLOM_BULANAN = _sql_simpan_ringkasan('ringkasan_bulanan_stasiun', ['tahun', 'bulan'])
+SQL_SIMPAN_TAHUNAN, JUMLAH_KOLOM_TAHUNAN = _sql_simpan_ringkasan('ringkasan_tahunan_stasiun', ['tahun'])
+
+SQL_HITUNG_BULANAN = f"""
+    SELECT id_stasiun, YEAR(tanggal), MONTH(tanggal), COUNT(*), {_select_ringkasan('observasi')}
+    FROM observasi_cuaca
+    WHERE {{kondisi}}
+    GROUP BY id_stasiun, YEAR(tanggal), MONTH(tanggal)
+"""
+
+SQL_HITUNG_TAHUNAN = f"""
+    SELECT id_stasiun, tahun, SUM(jumlah_observasi), {_select_ringkasan('ringkasan')}
+    FROM ringkasan_bulanan_stasiun
+    WHERE {{kondisi}}
+    GROUP BY id_stasiun, tahun
+"""
+
+# Awalan nama GET_LOCK per stasiun: ringkasan satu stasiun hanya dihitung
+# ulang oleh satu transaksi pada satu waktu (lihat segarkan_ringkasan)
+KUNCI_RINGKASAN = 'iklim_ringkasan_'
+
+def kunci_ringkasan(kursor, daftar_stasiun, batas_tunggu=BATAS_TUNGGU_KUNCI):
+    """
+    Ambil GET_LOCK untuk setiap stasiun, urut id_stasiun supaya dua worker
+    tidak saling menunggu secara melingkar. Kunci milik sesi, jadi tetap
+    dipegang melewati commit sampai lepas_kunci_ringkasan (atau koneksi ditutup).
+    """
+    for stasiun in sorted(daftar_stasiun):
+        ambil_kunci(kursor, f"{KUNCI_RINGKASAN}{stasiun}", batas_tunggu)
+
+def lepas_kunci_ringkasan(kursor, daftar_stasiun):
+    """Lepas kunci kunci_ringkasan; dipanggil setelah commit"""
+    for stasiun in sorted(daftar_stasiun):
+        kursor.execute("SELECT RELEASE_LOCK(%s)", (f"{KUNCI_RINGKASAN}{stasiun}",))
+        kursor.fetchall()
+
+def segarkan_ringkasan(kursor, stasiun_bulan, ukuran_batch=500):
+    """
+    Hitung ulang ringkasan bulanan untuk pasangan (id_stasiun, 'YYYY-MM')
+    yang disentuh import, lalu ringkasan tahunan stasiun-tahun terkait
+    dari tabel bulanan. Setiap stasiun-bulan dibaca lewat rentang kunci
+    cluster (id_stasiun, tanggal), bukan scan observasi_cuaca.
+    
+    Worker import paralel bisa memuat stasiun-bulan atau stasiun-tahun yang
+    sama. Supaya REPLACE worker terakhir tidak menimpa data worker lain,
+    setiap stasiun dikunci (kunci_ringkasan) sebelum dihitung ulang, dan
+    kuncinya harus dipegang sampai transaksi di-commit: pemanggil melepasnya
+    dengan lepas_kunci_ringkasan setelah commit. Sesi harus memakai READ
+    COMMITTED (data/import.py buat_koneksi) agar hitungan ulang melihat
+    data yang sudah di-commit worker lain; pada REPEATABLE READ snapshot
+    transaksi bisa lebih tua dari commit itu. Tidak melakukan commit.
+
+    Returns:
+        int: Jumlah stasiun-bulan yang diperbarui.
+    """
+    daftar = sorted({(int(stasiun), str(bulan)[:7]) for stasiun, bulan in stasiun_bulan})
+    kunci_ringkasan(kursor, {stasiun for stasiun, _ in daftar})
+    nilai_bulanan = "VALUES (" + ", ".join(["%s"] * JUMLAH_KOLOM_BULANAN) + ")"
+    for i in range(0, len(daftar), ukuran_batch):
+        batch = daftar[i:i + ukuran_batch]
+        parameter = []
+        for stasiun, bulan in batch:
+            awal = datetime.strptime(bulan, '%Y-%m').date()
+            akhir = (awal.replace(day=28) + timedelta(days=4)).replace(day=1)
+            parameter += [stasiun, awal, akhir]
+        kondisi = " OR ".join(["(id_stasiun = %s AND tanggal >= %s AND tanggal < %s)"] * len(batch))
+        kursor.execute(SQL_HITUNG_BULANAN.format(kondisi=kondisi), parameter)
+        baris = kursor.fetchall()
+        if baris:
+            kursor.executemany(SQL_SIMPAN_BULANAN + nilai_bulanan, baris)
+    
+    stasiun_tahun = sorted({(stasiun, int(bulan[:4])) for stasiun, bulan in daftar})
+    nilai_tahunan = "VALUES (" + ", ".join(["%s"] * JUMLAH_KOLOM_TAHUNAN) + ")"
+    for i in range(0, len(stasiun_tahun), ukuran_batch):
+        batch = stasiun_tahun[i:i + ukuran_batch]
+        kondisi = " OR ".join(["(id_stasiun = %s AND tahun = %s)"] * len(batch))
+        kursor.execute(SQL_HITUNG_TAHUNAN.format(kondisi=kondisi),
+                       [nilai for pasangan in batch for nilai in pasangan])
+        baris = kursor.fetchall()
+        if baris:
+            kursor.executemany(SQL_SIMPAN_TAHUNAN + nilai_tahunan, baris)
+    return len(daftar)
+
+def migrasi_4_ringkasan(kursor):
+    """Buat tabel ringkasan bulanan/tahunan dan isi dari data yang sudah ada"""
+    for sql in TABEL_RINGKASAN.values():
+        kursor.execute(sql)
+    print("Mengisi ringkasan bulanan dan tahunan per stasiun...")
+    kursor.execute(SQL_SIMPAN_BULANAN + SQL_HITUNG_BULANAN.format(kondisi="1=1"))
+    kursor.execute(SQL_SIMPAN_TAHUNAN + SQL_HITUNG_TAHUNAN.format(kondisi="1=1"))
+
+# ===== KATALOG METADATA =====
+# Satu baris per fakta (jumlah baris tabel, batas tanggal, jumlah observasi
+# per tahun, versi import) sehingga halaman Info Database dan sidebar cukup
+# membaca satu tabel kecil, bukan COUNT(*) / DISTINCT YEAR atas observasi_cuaca.
+# Kunci: 'baris:<tabel>', 'tanggal_min', 'tanggal_maks', 'tahun:<tahun>', 'versi_import'
+
+SQL_BUAT_KATALOG = """
+    CREATE TABLE IF NOT EXISTS katalog_data (
+        kunci VARCHAR(64) NOT NULL,
+        nilai_angka BIGINT,
+        nilai_tanggal DATE,
+        diperbarui TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        PRIMARY KEY (kunci)
+    ) ENGINE=InnoDB
+"""
+
+SQL_SIMPAN_KATALOG = """
+    INSERT INTO katalog_data (kunci, nilai_angka, nilai_tanggal) VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE nilai_angka = VALUES(nilai_angka), nilai_tanggal = VALUES(nilai_tanggal)
+"""
+
+# Tabel dimensi kecil: COUNT(*) langsung
+TABEL_KATALOG = ['provinsi', 'wilayah', 'stasiun', 'arah_angin']
+
+def hitung_katalog(kursor):
+    """
+    Isi katalog_data selain versi_import. Jumlah observasi (total dan per
+    tahun) diambil dari ringkasan tahunan, batas tanggal dari MIN/MAX
+    lewat index tanggal.
+
+    Returns:
+        tuple: (list (kunci, nilai_angka, nilai_tanggal), set tahun yang ada datanya)
+    """
+    data = []
+    for tabel in TABEL_KATALOG:
+        kursor.execute(f"SELECT COUNT(*) FROM {tabel}")
+        data.append((f"baris:{tabel}", kursor.fetchone()[0], None))
+    
+    kursor.execute("SELECT tahun, SUM(jumlah_observasi) FROM ringkasan_tahunan_stasiun "
+                   "GROUP BY tahun ORDER BY tahun")
+    per_tahun = [(int(tahun), int(jumlah)) for tahun, jumlah in kursor.fetchall()]
+    data += [(f"tahun:{tahun}", jumlah, None) for tahun, jumlah in per_tahun]
+    data.append(("baris:observasi_cuaca", sum(jumlah for _, jumlah in per_tahun), None))
+    
+    kursor.execute("SELECT MIN(tanggal), MAX(tanggal) FROM observasi_cuaca")
+    tanggal_min, tanggal_maks = kursor.fetchone()
+    data += [("tanggal_min", None, tanggal_min), ("tanggal_maks", None, tanggal_maks)]
+    return data, {tahun for tahun, _ in per_tahun}
+
+def segarkan_katalog(kursor):
+    """
+    Hitung ulang isi katalog_data (hitung_katalog) dan naikkan versi_import.
+    Tidak melakukan commit.
+
+    Returns:
+        int: versi_import yang baru.
+    """
+    data, tahun_ada = hitung_katalog(kursor)
+    
+    # Tahun yang sudah tidak punya data dihapus dari katalog
+    kursor.execute("SELECT kunci FROM katalog_data WHERE kunci LIKE %s", ('tahun:%',))
+    usang = [(kunci,) for (kunci,) in kursor.fetchall()
+             if int(kunci.split(':')[1]) not in tahun_ada]
+    if usang:
+        kursor.executemany("DELETE FROM katalog_data WHERE kunci = %s", usang)
+    kursor.executemany(SQL_SIMPAN_KATALOG, data)
+    
+    kursor.execute("""
+        INSERT INTO katalog_data (kunci, nilai_angka) VALUES ('versi_import', 1)
+        ON DUPLICATE KEY UPDATE nilai_angka = nilai_angka + 1
+    """)
+    kursor.execute("SELECT nilai_angka FROM katalog_data WHERE kunci = 'versi_import'")
+    return kursor.fetchone()[0]
+
+def migrasi_5_katalog(kursor):
+    """Buat tabel katalog_data dan isi dari data yang sudah ada"""
+    kursor.execute(SQL_BUAT_KATALOG)
+    segarkan_katalog(kursor)
+
+def migrasi_6_index_keyset(kursor):
+    """
+    Ganti idx_tanggal dengan idx_tanggal_observasi (tanggal, id_observasi):
+    tetap melayani semua filter tanggal (prefiks sama) sekaligus menjadi
+    index urutan keyset pagination tanpa filesort.
+    """
+    perubahan = []
+    if not index_ada(kursor, 'observasi_cuaca', 'idx_tanggal_observasi'):
+        perubahan.append("ADD " + INDEX_KEYSET)
+    if index_ada(kursor, 'observasi_cuaca', 'idx_tanggal'):
+        perubahan.append("DROP INDEX idx_tanggal")
+    if perubahan:
+        print("Mengganti idx_tanggal dengan idx_tanggal_observasi...")
+        kursor.execute("ALTER TABLE observasi_cuaca " + ", ".join(perubahan))
+
+def kolom_float(kursor, tabel):
+    """Kolom bertipe FLOAT di tabel (database aktif)"""
+    kursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND DATA_TYPE = 'float'
+        ORDER BY ORDINAL_POSITION
+    """, (tabel,))
+    return [baris[0] for baris in kursor.fetchall()]
+
+def migrasi_7_double(kursor):
+    """
+    Ubah kolom FLOAT observasi_cuaca dan min/maks ringkasan menjadi DOUBLE.
+    Nilai lama diperlebar apa adanya (tetap membawa pembulatan 4 byte yang
+    selama ini sudah terbaca pandas); data yang diimport sesudahnya
+    tersimpan dengan presisi penuh. Membangun ulang tabel (ALGORITHM=COPY).
+    """
+    for tabel in ['observasi_cuaca', *TABEL_RINGKASAN]:
+        kolom = kolom_float(kursor, tabel)
+        if kolom:
+            print(f"Mengubah {len(kolom)} kolom FLOAT {tabel} menjadi DOUBLE...")
+            kursor.execute(f"ALTER TABLE {tabel} "
+                           + ", ".join(f"MODIFY {k} DOUBLE" for k in kolom))
+
+# Urutan migrasi; versi yang sudah tercatat di versi_skema dilewati
+MIGRASI = [
+    (1, "Buat tabel dimensi dan observasi_cuaca", migrasi_1_buat_tabel),
+    (2, "Kunci cluster (id_stasiun, tanggal) dan index tanggal", migrasi_2_index),
+    (3, "Partisi RANGE observasi_cuaca per tahun", migrasi_3_partisi_tahun),
+    (4, "Ringkasan bulanan dan tahunan per stasiun", migrasi_4_ringkasan),
+    (5, "Katalog metadata (jumlah baris, batas tanggal, tahun)", migrasi_5_katalog),
+    (6, "Index keyset (tanggal, id_observasi)", migrasi_6_index_keyset),
+    (7, "Kolom pengukuran FLOAT menjadi DOUBLE", migrasi_7_double),
+]
+
+def migrasi(koneksi):
+    """
+    Jalankan semua migrasi yang belum tercatat di tabel versi_skema.
+    Aman dipanggil berulang kali (mis. setiap kali import dimulai).
+
+    Returns:
+        list: Versi migrasi yang baru dijalankan.
+    """
+    kursor = koneksi.cursor()
+    kursor.execute(SQL_BUAT_VERSI_SKEMA)
+    kursor.execute("SELECT versi FROM versi_skema")
+    sudah = {baris[0] for baris in kursor.fetchall()}
+    
+    dijalankan = []
+    for versi, keterangan, fungsi in MIGRASI:
+        if versi in sudah:
+            continue
+        fungsi(kursor)
+        kursor.execute("INSERT INTO versi_skema (versi, keterangan) VALUES (%s, %s)",
+                       (versi, keterangan))
+        koneksi.commit()
+        dijalankan.append(versi)
+        print(f"✅ Migrasi {versi}: {keterangan}")
+    kursor.close()
+    return dijalankan
+
+# ===== SKEMA DUCKDB (backend tertanam, lihat backend.py) =====
+# Tabel diturunkan dari DDL MySQL di atas: index sekunder, ENGINE, dan
+# ON UPDATE dibuang (DuckDB memindai kolom dengan zone map per blok) dan
+# id_observasi diisi dari sequence. Tanpa partisi dan migrasi bertahap:
+# ringkasan dan katalog dihitung ulang penuh setelah setiap import.
+
+def ke_ddl_duckdb(sql):
+    """Ubah CREATE TABLE MySQL di modul ini menjadi DDL DuckDB"""
+    baris = []
+    sisa_kurung = 0
+    for b in sql.strip().splitlines():
+        # Definisi KEY (bisa lebih dari satu baris) dibuang sampai kurungnya tertutup
+        if sisa_kurung or re.match(r'\s*(UNIQUE\s+)?KEY\s', b):
+            sisa_kurung += b.count('(') - b.count(')')
+            continue
+        baris.append(b)
+    sql = "\n".join(baris)
+    sql = re.sub(r',\s*\)\s*ENGINE=InnoDB', '\n)', sql)
+    sql = re.sub(r'\)\s*ENGINE=InnoDB', ')', sql)
+    sql = sql.replace(' ON UPDATE CURRENT_TIMESTAMP', '')
+    return sql.replace('AUTO_INCREMENT', "DEFAULT nextval('urutan_observasi')")
+
+def buat_skema_duckdb(koneksi):
+    """Buat tabel, sequence id_observasi, data arah_angin, dan fungsi MySQL yang dipakai config.py"""
+    koneksi.execute("CREATE SEQUENCE IF NOT EXISTS urutan_observasi")
+    for sql in [*TABEL.values(), *TABEL_RINGKASAN.values(), SQL_BUAT_KATALOG]:
+        koneksi.execute(ke_ddl_duckdb(sql))
+    # File lama dibuat dengan kolom FLOAT (lihat migrasi_7_double)
+    tabel_angka = ['observasi_cuaca', *TABEL_RINGKASAN]
+    for tabel, kolom in koneksi.execute(
+            "SELECT table_name, column_name FROM information_schema.columns "
+            f"WHERE data_type = 'FLOAT' AND table_name IN ({', '.join('?' * len(tabel_angka))})",
+            tabel_angka).fetchall():
+        koneksi.execute(f"ALTER TABLE {tabel} ALTER {kolom} TYPE DOUBLE")
+    # WEEKDAY MySQL: 0 = Senin (isodow DuckDB: 1 = Senin)
+    koneksi.execute("CREATE OR REPLACE MACRO weekday(d) AS isodow(d) - 1")
+    koneksi.executemany("INSERT OR IGNORE INTO arah_angin (kode_arah, nama_arah, nama_arah_id) "
+                        "VALUES (?, ?, ?)", DATA_ARAH_ANGIN)
+
+def segarkan_duckdb(koneksi):
+    """
+    Hitung ulang ringkasan bulanan/tahunan dan katalog_data di file DuckDB
+    (GROUP BY penuh; cukup cepat untuk mesin kolumnar) lalu naikkan versi_import.
+
+    Returns:
+        int: versi_import yang baru.
+    """
+    for nama_tabel in TABEL_RINGKASAN:
+        koneksi.execute(f"DELETE FROM {nama_tabel}")
+    koneksi.execute(SQL_SIMPAN_BULANAN.replace('REPLACE INTO', 'INSERT INTO', 1)
+                    + SQL_HITUNG_BULANAN.format(kondisi="1=1"))
+    koneksi.execute(SQL_SIMPAN_TAHUNAN.replace('REPLACE INTO', 'INSERT INTO', 1)
+                    + SQL_HITUNG_TAHUNAN.format(kondisi="1=1"))
+    
+    # Koneksi DuckDB dipakai langsung sebagai kursor: cursor() DuckDB membuka
+    # koneksi terpisah yang tidak melihat transaksi import yang belum di-commit
+    data, _ = hitung_katalog(koneksi)
+    versi = koneksi.execute("SELECT nilai_angka FROM katalog_data WHERE kunci = 'versi_import'").fetchone()
+    versi = (versi[0] if versi else 0) + 1
+    koneksi.execute("DELETE FROM katalog_data")
+    koneksi.executemany("INSERT INTO katalog_data (kunci, nilai_angka, nilai_tanggal) VALUES (?, ?, ?)",
+                        data + [("versi_import", versi, None)])
+    return versi
+
+def jelaskan_query(kursor, query, parameter=()):
+    """
+    Jalankan EXPLAIN untuk satu query. MySQL 8 selalu menampilkan kolom
+    partitions (EXPLAIN PARTITIONS sudah dihapus); server lama yang tidak
+    menampilkannya diminta ulang dengan EXPLAIN PARTITIONS.
+
+    Returns:
+        list: Baris EXPLAIN sebagai dict (kolom table, partitions, type, key, rows, ...).
+    """
+    kursor.execute("EXPLAIN " + query, tuple(parameter))
+    kolom = [d[0] for d in kursor.description]
+    hasil = kursor.fetchall()
+    if 'partitions' not in kolom:
+        kursor.execute("EXPLAIN PARTITIONS " + query, tuple(parameter))
+        kolom = [d[0] for d in kursor.description]
+        hasil = kursor.fetchall()
+    return [dict(zip(kolom, baris)) for baris in hasil]
+
+def periksa_rencana(koneksi, daftar_query, tabel_fakta=('observasi_cuaca', 'oc')):
+    """
+    EXPLAIN setiap query dan cari akses full table scan (type = ALL)
+    pada tabel fakta. Tabel dimensi kecil boleh di-scan penuh.
+
+    Args:
+        koneksi: Koneksi mysql.connector.
+        daftar_query (list): Tuple (nama, query, parameter), mis. dari
+            config.daftar_query_periksa().
+        tabel_fakta (tuple): Nama dan alias tabel yang tidak boleh di-scan penuh.
+
+    Returns:
+        list: Tuple (nama, baris EXPLAIN) untuk setiap pelanggaran.
+    """
+    kursor = koneksi.cursor()
+    pelanggaran = []
+    for nama, query, parameter in daftar_query:
+        rencana = jelaskan_query(kursor, query, parameter)
+        for baris in rencana:
+            # Kolom table berisi alias jika query memakai alias (mis. 'oc')
+            menyentuh_fakta = baris.get('table') in tabel_fakta
+            status = '❌' if menyentuh_fakta and baris.get('type') == 'ALL' else '✅'
+            if menyentuh_fakta:
+                print(f"{status} {nama:40} type={baris.get('type')} key={baris.get('key')} "
+                      f"rows={baris.get('rows')}")
+            if status == '❌':
+                pelanggaran.append((nama, baris))
+    kursor.close()
+    return pelanggaran
+
+def periksa_pemangkasan_partisi(koneksi, daftar_query, tabel_fakta=('observasi_cuaca', 'oc')):
+    """
+    Pastikan filter tanggal hanya menyentuh partisi yang relevan.
+
+    Args:
+        koneksi: Koneksi mysql.connector.
+        daftar_query (list): Tuple (nama, query, parameter, tahun, maks_per_baris),
+            mis. dari config.daftar_query_partisi(). `tahun` = tahun yang boleh
+            disentuh (None = tidak dibatasi), `maks_per_baris` = jumlah partisi
+            maksimum per baris EXPLAIN (None = tidak dibatasi). pmaks selalu
+            boleh karena sengaja dibiarkan kosong.
+
+    Returns:
+        list: Tuple (nama, baris EXPLAIN) untuk setiap pelanggaran.
+    """
+    kursor = koneksi.cursor()
+    if partisi_tahun(kursor) is None:
+        print("⚠️ observasi_cuaca tidak berpartisi, pemeriksaan partisi dilewati")
+        kursor.close()
+        return []
+    
+    pelanggaran = []
+    for nama, query, parameter, tahun, maks_per_baris in daftar_query:
+        for baris in jelaskan_query(kursor, query, parameter):
+            if baris.get('table') not in tabel_fakta:
+                continue
+            disentuh = [p for p in str(baris.get('partitions') or '').split(',') if p]
+            boleh = None if tahun is None else {nama_partisi(t) for t in tahun} | {'pmaks'}
+            salah = ((boleh is not None and not set(disentuh) <= boleh)
+                     or (maks_per_baris is not None and len(disentuh) > maks_per_baris))
+            print(f"{'❌' if salah else '✅'} {nama:40} partisi={','.join(disentuh) or '-'}")
+            if salah:
+                pelanggaran.append((nama, baris))
+    kursor.close()
+    return pelanggaran
+
+def periksa_query_dashboard(koneksi):
+    """
+    Periksa semua query ambil_* di config.py (import lazy: config memuat streamlit).
+    Parameter contoh (stasiun, daftar stasiun per wilayah) diambil dari
+    database `koneksi`, bukan dari database default config.
+
+    Returns:
+        list: Pelanggaran full scan ditambah pelanggaran pemangkasan partisi.
+    """
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from config import daftar_query_periksa, daftar_query_partisi
+    pelanggaran = periksa_rencana(koneksi, daftar_query_periksa(koneksi))
+    return pelanggaran + periksa_pemangkasan_partisi(koneksi, daftar_query_partisi(koneksi))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Buat/migrasi skema database iklim_indonesia")
+    parser.add_argument('--database', default=NAMA_DATABASE, help="Nama database tujuan")
+    parser.add_argument('--periksa', action='store_true',
+                        help="Setelah migrasi, EXPLAIN semua query ambil_* dan gagal jika ada "
+                             "full scan atau partisi yang tidak terpangkas")
+    args = parser.parse_args()
+    
+    koneksi = buat_koneksi(args.database)
+    try:
+        if not migrasi(koneksi):
+            print("✅ Skema sudah versi terbaru")
+        if args.periksa:
+            pelanggaran = periksa_query_dashboard(koneksi)
+            if pelanggaran:
+                print(f"❌ {len(pelanggaran)} rencana query bermasalah (full scan / partisi tidak terpangkas)")
+                sys.exit(1)
+            print("✅ Semua query ambil_* memakai index dan partisi yang relevan saja")
+    finally:
+        koneksi.close()
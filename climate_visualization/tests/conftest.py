@@ -0,0 +1,20 @@
+"""
+Konfigurasi pytest: test berjalan tanpa server MySQL/DuckDB.
+climate_visualization/ dan data/ ditambahkan ke sys.path; data/import.py
+dimuat lewat importlib karena 'import' adalah kata kunci Python.
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+DIREKTORI_APLIKASI = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIREKTORI_APLIKASI)
+sys.path.insert(0, os.path.join(DIREKTORI_APLIKASI, 'data'))
+
+@pytest.fixture(scope='session')
+def importer():
+    """Modul data/import.py"""
+    return importlib.import_module('import')
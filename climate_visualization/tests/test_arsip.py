@@ -0,0 +1,50 @@
+"""Test arsip Parquet (arsip.py) tanpa database"""
+
+from datetime import date
+
+import pyarrow as pa
+
+import arsip
+
+SUMBER = arsip.sumber_mysql('iklim_indonesia')
+
+def buat_arsip(direktori, sumber=SUMBER, versi=7):
+    """Arsip kecil: dua stasiun di tahun 2020, manifest seperti hasil ekspor_arsip"""
+    tabel = pa.Table.from_pylist([
+        {'id_observasi': i, 'id_stasiun': 96001 + i % 2, 'tanggal': date(2020, 1, 1 + i),
+         'curah_hujan': float(i), 'tahun': 2020}
+        for i in range(4)
+    ], schema=arsip.skema_arsip())
+    arsip.ds.write_dataset(tabel, direktori, format='parquet', partitioning=arsip.partisi_arsip(),
+                           basename_template='bagian-{i}.parquet')
+    arsip.tulis_manifest({'sumber': sumber, 'database': sumber.rsplit('/', 1)[-1],
+                          'versi_import': versi, 'sampai_tahun': 2020,
+                          'tahun': {'2020': {'sidik': [4], 'baris': 4}}}, str(direktori))
+
+def test_arsip_dipakai_untuk_sumber_dan_versi_yang_sama(tmp_path):
+    buat_arsip(tmp_path)
+    data = arsip.ambil_arsip(7, SUMBER, str(tmp_path))
+    assert data is not None and data['tahun'] == [2020]
+
+    df = arsip.baca_arsip(data, None, None, ['id_stasiun', 'tanggal', 'curah_hujan'], batas=3)
+    assert df['curah_hujan'].tolist() == [3.0, 2.0, 1.0]
+
+def test_arsip_database_lain_ditolak(tmp_path):
+    buat_arsip(tmp_path)
+    # versi_import sama tetapi database/backend lain
+    assert arsip.ambil_arsip(7, arsip.sumber_mysql('iklim_uji'), str(tmp_path)) is None
+    assert arsip.ambil_arsip(7, None, str(tmp_path)) is None
+    assert arsip.ambil_arsip(8, SUMBER, str(tmp_path)) is None
+
+def test_manifest_tanpa_sumber_ditolak(tmp_path):
+    buat_arsip(tmp_path)
+    manifest = arsip.baca_manifest(str(tmp_path))
+    del manifest['sumber']
+    arsip.tulis_manifest(manifest, str(tmp_path))
+    assert arsip.ambil_arsip(7, SUMBER, str(tmp_path)) is None
+
+def test_bagi_rentang_arsip():
+    assert arsip.bagi_rentang_arsip(date(2019, 6, 1), date(2021, 3, 1), 2020) == (
+        (date(2021, 1, 1), date(2021, 3, 1)), (date(2019, 6, 1), date(2020, 12, 31)))
+    assert arsip.bagi_rentang_arsip(date(2021, 2, 1), None, 2020) == ((date(2021, 2, 1), None), None)
+    assert arsip.bagi_rentang_arsip(None, date(2020, 5, 1), 2020) == (None, (None, date(2020, 5, 1)))
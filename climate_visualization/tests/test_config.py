@@ -0,0 +1,290 @@
+"""Test penyusun query dan cache hasil di config.py yang tidak butuh database"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import config
+
+def test_bagi_periode_ringkasan_tahun_bulan_dan_hari():
+    potongan = config.bagi_periode_ringkasan('2020-01-15', '2022-03-10')
+    assert sorted(potongan, key=str) == sorted([
+        ('harian', date(2020, 1, 15), date(2020, 1, 31)),
+        ('harian', date(2022, 3, 1), date(2022, 3, 10)),
+        ('tahunan', 2021, 2021),
+        ('bulanan', (2020, 2), (2020, 12)),
+        ('bulanan', (2022, 1), (2022, 2)),
+    ], key=str)
+
+def test_bagi_periode_ringkasan_tanpa_tahunan():
+    potongan = config.bagi_periode_ringkasan('2020-01-01', '2021-12-31', pakai_tahunan=False)
+    assert potongan == [('bulanan', (2020, 1), (2021, 12))]
+
+def test_bagi_periode_ringkasan_dalam_satu_bulan():
+    assert config.bagi_periode_ringkasan(date(2020, 2, 3), date(2020, 2, 20)) == [
+        ('harian', date(2020, 2, 3), date(2020, 2, 20))]
+    # Bulan penuh termasuk 29 Februari
+    assert config.bagi_periode_ringkasan('2020-02-01', '2020-02-29') == [
+        ('bulanan', (2020, 2), (2020, 2))]
+    assert config.bagi_periode_ringkasan('2020-03-01', '2020-02-01') == []
+
+def test_query_halaman_pertama():
+    query, parameter, kolom, terbalik = config.query_halaman_cuaca(
+        tanggal_mulai='2020-01-01', tanggal_selesai='2020-12-31', kolom=['curah_hujan'],
+        ukuran_halaman=50)
+    assert kolom == ['tanggal', 'id_observasi', 'curah_hujan']
+    assert not terbalik
+    assert 'ORDER BY oc.tanggal DESC, oc.id_observasi DESC' in query
+    assert 'OFFSET' not in query
+    assert parameter == ['2020-01-01', '2020-12-31', 51]
+
+def test_query_halaman_keyset():
+    kunci = (date(2020, 5, 1), 1234)
+    query, parameter, _, terbalik = config.query_halaman_cuaca(
+        urutan='terlama', ukuran_halaman=50, setelah=kunci)
+    assert not terbalik
+    assert "oc.tanggal > %s OR (oc.tanggal = %s AND oc.id_observasi > %s)" in query
+    assert 'ORDER BY oc.tanggal ASC' in query
+    assert parameter == [kunci[0], kunci[0], kunci[1], 51]
+
+    # Halaman sebelumnya: urutan dibalik, hasil dibalik lagi oleh pemanggil
+    query, parameter, _, terbalik = config.query_halaman_cuaca(
+        urutan='terlama', ukuran_halaman=50, sebelum=kunci)
+    assert terbalik
+    assert "oc.tanggal < %s OR" in query
+    assert 'ORDER BY oc.tanggal DESC' in query
+
+def test_query_halaman_terakhir_tanpa_offset():
+    query, parameter, _, terbalik = config.query_halaman_cuaca(
+        ukuran_halaman=100, halaman=7, terakhir=37)
+    assert terbalik
+    assert 'OFFSET' not in query
+    assert 'ORDER BY oc.tanggal ASC, oc.id_observasi ASC' in query
+    assert parameter == [38]
+
+def test_query_halaman_lompat_memakai_offset():
+    query, parameter, _, _ = config.query_halaman_cuaca(ukuran_halaman=100, halaman=3)
+    assert 'LIMIT %s OFFSET %s' in query
+    assert parameter == [101, 200]
+
+def test_query_halaman_lompat_dari_batas_bulan():
+    # Batas dari ringkasan: 1000 baris sebelum 31 Maret, OFFSET hanya sisanya
+    query, parameter, _, _ = config.query_halaman_cuaca(ukuran_halaman=100, halaman=13,
+                                                        batas=(date(2020, 3, 31), 1000))
+    assert 'oc.tanggal <= %s' in query
+    assert parameter == [date(2020, 3, 31), 101, 200]
+
+    query, parameter, _, _ = config.query_halaman_cuaca(urutan='terlama', ukuran_halaman=100,
+                                                        halaman=11, batas=(date(2020, 3, 1), 1000))
+    assert 'oc.tanggal >= %s' in query
+    assert 'OFFSET' not in query
+    assert parameter == [date(2020, 3, 1), 101]
+
+def ringkasan_per_bulan(jumlah):
+    """Pengganti ambil_ringkasan_cuaca: {(tahun, bulan): jumlah_observasi}"""
+    def ambil(*args, **kwargs):
+        ambil.panggilan.append(kwargs)
+        return pd.DataFrame([{'tahun': t, 'bulan': b, 'jumlah_observasi': n}
+                             for (t, b), n in jumlah.items()])
+    ambil.panggilan = []
+    return ambil
+
+def test_batas_lompat_halaman(monkeypatch):
+    ambil = ringkasan_per_bulan({(2020, 1): 300, (2020, 2): 200, (2020, 3): 400})
+    monkeypatch.setattr(config, 'ambil_ringkasan_cuaca', ambil)
+
+    # Terlama: baris ke-350 ada di Februari, 300 baris Januari dilewati lewat batas
+    assert config.batas_lompat_halaman(None, None, None, None, ['curah_hujan'], 'terlama', 350) == (
+        date(2020, 2, 1), 300)
+    assert config.batas_lompat_halaman(None, None, None, None, ['curah_hujan'], 'terlama', 0) == (
+        date(2020, 1, 1), 0)
+    # Terbaru: urutan bulan dibalik, tepi = akhir bulan
+    assert config.batas_lompat_halaman(None, None, None, None, ['curah_hujan'], 'terbaru', 600) == (
+        date(2020, 1, 31), 600)
+    assert config.batas_lompat_halaman(None, None, None, None, ['curah_hujan'], 'terbaru', 900) is None
+    # Semi-join stasiun ikut dipakai jika kolom dimensi diminta
+    assert [k['stasiun_dikenal'] for k in ambil.panggilan] == [False] * 4
+    config.batas_lompat_halaman(None, None, None, None, ['nama_stasiun'], 'terbaru', 0)
+    assert ambil.panggilan[-1]['stasiun_dikenal']
+
+def test_query_ringkasan_stasiun_dikenal():
+    query, _, _ = config.query_ringkasan_cuaca('2020-01-15', '2020-03-31', dimensi=(),
+                                               variabel=['curah_hujan'], stasiun_dikenal=True)
+    assert 'WHERE s.id_stasiun = oc.id_stasiun' in query
+    assert 'WHERE s.id_stasiun = r.id_stasiun' in query
+    query, _, _ = config.query_ringkasan_cuaca('2020-01-15', '2020-03-31', dimensi=(),
+                                               variabel=['curah_hujan'])
+    assert 'EXISTS' not in query
+
+def test_hitung_baris_memakai_semi_join_yang_sama(monkeypatch):
+    monkeypatch.setattr(config, 'CACHE_HASIL_AKTIF', False)
+    ambil = ringkasan_per_bulan({(2020, 1): 300})
+    monkeypatch.setattr(config, 'ambil_ringkasan_cuaca', ambil)
+
+    assert config.hitung_baris_cuaca('2020-01-01', '2020-01-31', kolom=['curah_hujan']) == 300
+    config.hitung_baris_cuaca('2020-01-01', '2020-01-31', kolom=['curah_hujan', 'nama_stasiun'])
+    assert [k['stasiun_dikenal'] for k in ambil.panggilan] == [False, True]
+
+def test_query_halaman_semi_join_stasiun_hanya_untuk_kolom_dimensi():
+    query, _, _, _ = config.query_halaman_cuaca(kolom=['curah_hujan'])
+    assert 'stasiun' not in query
+    query, _, _, _ = config.query_halaman_cuaca(kolom=['nama_stasiun'])
+    assert 'EXISTS (SELECT 1 FROM stasiun s' in query
+
+def test_query_halaman_validasi_argumen():
+    with pytest.raises(ValueError):
+        config.query_halaman_cuaca(urutan='acak')
+    with pytest.raises(ValueError):
+        config.query_halaman_cuaca(filter_nilai={'kode_arah_angin': (1, None)})
+
+@pytest.fixture
+def fungsi_tercache(monkeypatch):
+    """Fungsi ber-cache_hasil yang menghitung berapa kali benar-benar dijalankan"""
+    monkeypatch.setattr(config, 'CACHE_HASIL_AKTIF', True)
+    monkeypatch.setattr(config, 'versi_data', lambda: 1)
+    panggilan = []
+
+    @config.cache_hasil
+    def ambil_contoh(x, y=2):
+        panggilan.append((x, y))
+        return [x, y]
+
+    return ambil_contoh, panggilan
+
+def test_cache_hasil_dipakai_ulang(fungsi_tercache, monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'DIREKTORI_CACHE', str(tmp_path))
+    ambil_contoh, panggilan = fungsi_tercache
+
+    assert ambil_contoh(1) == [1, 2]
+    assert ambil_contoh(1, y=2) == [1, 2]
+    assert ambil_contoh(3) == [3, 2]
+    assert panggilan == [(1, 2), (3, 2)]
+
+def test_cache_hasil_direktori_tidak_bisa_ditulis(fungsi_tercache, monkeypatch, tmp_path):
+    # Folder cache di bawah file biasa: os.makedirs gagal dengan OSError
+    berkas = tmp_path / 'bukan_folder'
+    berkas.write_text('')
+    monkeypatch.setattr(config, 'DIREKTORI_CACHE', str(berkas / 'cache'))
+    ambil_contoh, panggilan = fungsi_tercache
+    gagal_awal = config.ambil_statistik_cache()['gagal']
+
+    assert ambil_contoh(1) == [1, 2]
+    assert ambil_contoh(1) == [1, 2]
+    assert panggilan == [(1, 2), (1, 2)]
+    assert config.ambil_statistik_cache()['gagal'] == gagal_awal + 2
+
+class KonektorPalsu:
+    """Pengganti KonektorDatabase: mencatat apakah koneksi sedang dipinjam"""
+    dipinjam = 0
+
+    def buat_koneksi(self):
+        KonektorPalsu.dipinjam += 1
+        return KoneksiPalsu()
+
+    @staticmethod
+    def tutup_koneksi(koneksi):
+        KonektorPalsu.dipinjam -= 1
+
+class KoneksiPalsu:
+    def cursor(self, **kwargs):
+        return KursorPalsu()
+
+class KursorPalsu:
+    description = [('tanggal',), ('id_observasi',), ('id_stasiun',), ('curah_hujan',)]
+
+    def execute(self, query, parameter=None):
+        pass
+
+    def fetchall(self):
+        return [(date(2020, 1, 2), 2, 96001, 1.5), (date(2020, 1, 1), 1, 96002, 0.0)]
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def pool_palsu(monkeypatch):
+    """ambil_dimensi gagal jika dipanggil sambil memegang koneksi pool"""
+    monkeypatch.setattr(config, 'CACHE_HASIL_AKTIF', False)
+    monkeypatch.setattr(config, 'KonektorDatabase', KonektorPalsu)
+    dimensi = {'versi': 1, 'arah': pd.Series(dtype='category'),
+               'stasiun': pd.DataFrame({'nama_stasiun': ['A', 'B'], 'id_wilayah': [20, 21]},
+                                       index=pd.Index([96001, 96002], name='id_stasiun'))}
+
+    def ambil_dimensi(paksa=False):
+        assert KonektorPalsu.dipinjam == 0, "ambil_dimensi dipanggil sambil memegang koneksi"
+        return dimensi
+
+    monkeypatch.setattr(config, 'ambil_dimensi', ambil_dimensi)
+    monkeypatch.setattr(config, 'baca_sql', lambda query, koneksi, parameter=None: pd.DataFrame(
+        {'id_stasiun': [96001, 96002], 'curah_hujan': [1.5, 0.0]}))
+
+def test_dimensi_disiapkan_sebelum_meminjam_koneksi(pool_palsu):
+    df = config.ambil_data_cuaca(id_wilayah=20, kolom=['curah_hujan', 'nama_stasiun'])
+    assert df['nama_stasiun'].tolist() == ['A', 'B']
+
+    hasil = config.ambil_halaman_cuaca(id_wilayah=20, kolom=['curah_hujan', 'nama_stasiun'])
+    assert hasil['data']['nama_stasiun'].tolist() == ['A', 'B']
+    assert KonektorPalsu.dipinjam == 0
+
+def test_instrumentasi_mencatat_perkiraan_memori_hasil():
+    @config.instrumentasi
+    def ambil_contoh_memori():
+        return pd.DataFrame({'curah_hujan': [1.0] * 100})
+
+    ambil_contoh_memori()
+    rekaman = config.ambil_riwayat_query(batas=1)[0]
+    assert rekaman['fungsi'] == 'ambil_contoh_memori'
+    assert rekaman['baris'] == 100 and rekaman['memori_byte'] == 800
+
+    latensi = config.ringkasan_latensi().set_index('fungsi')
+    assert latensi.loc['ambil_contoh_memori', 'memori_mb'] == 800 / (1024 * 1024)
+
+class KursorDimensiTujuan:
+    """Kursor database tujuan skema.py --periksa: stasiun 97001-97003, wilayah 31"""
+    description = None
+
+    def execute(self, query, parameter=None):
+        if query == config.QUERY_DIMENSI_STASIUN:
+            self.description = [(k,) for k in ('id_stasiun', 'nama_stasiun', 'lintang', 'bujur', 'id_wilayah',
+                                               'nama_wilayah', 'id_provinsi', 'nama_provinsi')]
+            self._hasil = [(97003, 'C', 1.0, 2.0, 31, 'W', 3, 'P'), (97001, 'A', 1.0, 2.0, None, None, None, None),
+                           (97002, 'B', 1.0, 2.0, 31, 'W', 3, 'P')]
+        elif query == config.QUERY_VERSI_IMPORT:
+            self._hasil = [(5,)]
+        else:
+            self._hasil = []
+
+    def fetchone(self):
+        return self._hasil[0]
+
+    def fetchall(self):
+        return self._hasil
+
+    def close(self):
+        pass
+
+class KoneksiTujuan:
+    def cursor(self, **kwargs):
+        return KursorDimensiTujuan()
+
+def test_daftar_query_periksa_memakai_dimensi_database_tujuan(monkeypatch):
+    class PoolDefault:
+        def __init__(self):
+            raise AssertionError("pool database default dipakai")
+
+    monkeypatch.setattr(config, 'KonektorDatabase', PoolDefault)
+    monkeypatch.setattr(config, '_cache_dimensi_segar', lambda: False)
+
+    daftar = {nama: parameter for nama, _, parameter in config.daftar_query_periksa(KoneksiTujuan())}
+    # Stasiun contoh = id terkecil yang punya wilayah; filter wilayah dari stasiun database tujuan
+    assert daftar['ambil_statistik_cuaca_stasiun'] == [97002]
+    assert {97003, 97002} <= set(daftar['ambil_data_cuaca (wilayah)'])
+    assert 97001 not in daftar['ambil_data_cuaca (wilayah)']
+    assert 97002 in daftar['ambil_data_cuaca (stasiun)']
+
+    partisi = {nama: parameter for nama, _, parameter, _, _ in config.daftar_query_partisi(KoneksiTujuan())}
+    assert 97002 in partisi['ambil_data_cuaca (stasiun)']
+    # Dimensi pengganti hanya berlaku di dalam daftar_query_*
+    with pytest.raises(AssertionError, match='pool database default'):
+        config.ambil_dimensi()
@@ -0,0 +1,165 @@
+"""Test pipeline import (data/import.py) yang tidak butuh database"""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CSV_RUSAK = """date,Tn,Tx,Tavg,RH_avg,RR,ss,ff_x,ddd_x,ff_avg,ddd_car,station_id
+01/01/2020,21.4,-,26.1,80,0,5,3,90,2,E,96001
+02/01/2020,21.4,30.2,26.1,80,0,5,3,90,2,E,abc
+03/01/2020,21.4,30.2,26.1,80,0,5,3,90,2,E,96001.5
+04/01/2020,21.4,30.2,26.1,80,0,5,3,90,2,E,
+31/02/2020,21.4,30.2,26.1,80,0,5,3,90,2,E,96001
+05/01/2020,21.4,30.2,26.1,80,8888,5,3,90,2,E,96003
+06/01/2020,31.0,30.2,26.1,150,12,5,3,90,2,E,96003
+"""
+
+def baca_satu_chunk(importer, path):
+    daftar = list(importer.baca_csv_bertahap(str(path)))
+    assert len(daftar) == 1
+    return daftar[0][0]
+
+def test_normalisasi_tanggal(importer):
+    kolom = pd.Series(['1/2/21', '01/02/2021', '2021-02-01', '2021-2-1 00:00:00',
+                       '31/02/2021', 'kemarin', '', None])
+    tanggal, alasan = importer.normalisasi_tanggal(kolom)
+
+    assert tanggal[:4].tolist() == ['2021-02-01'] * 4
+    assert alasan[:4].isna().all()
+    assert alasan[4:].tolist() == ['tanggal_tidak_valid', 'format_tanggal',
+                                   'tanggal_kosong', 'tanggal_kosong']
+    assert tanggal[4:].isna().all()
+
+def test_normalisasi_tanggal_bertipe_datetime(importer):
+    kolom = pd.Series(pd.to_datetime(['2020-12-31', None]))
+    tanggal, alasan = importer.normalisasi_tanggal(kolom)
+    assert tanggal[0] == '2020-12-31'
+    assert pd.isna(alasan[0]) and alasan[1] == 'tanggal_kosong'
+
+def test_csv_rusak_ditolak_per_baris(importer, tmp_path):
+    path = tmp_path / 'cuaca.csv'
+    path.write_text(CSV_RUSAK)
+
+    df_bersih, df_ditolak = importer.transformasi_chunk(baca_satu_chunk(importer, path))
+
+    assert df_ditolak['alasan'].tolist() == ['bukan_angka:Tx', 'bukan_angka:station_id',
+                                             'bukan_angka:station_id', 'stasiun_kosong',
+                                             'tanggal_tidak_valid']
+    assert df_bersih['id_stasiun'].tolist() == [96003, 96003]
+    assert df_bersih['tanggal'].tolist() == ['2020-01-05', '2020-01-06']
+
+def test_validasi_mengosongkan_nilai_salah(importer, tmp_path):
+    path = tmp_path / 'cuaca.csv'
+    path.write_text(CSV_RUSAK)
+    df_bersih, _ = importer.transformasi_chunk(baca_satu_chunk(importer, path))
+
+    df_valid, pelanggaran = importer.validasi_chunk(df_bersih.reset_index(drop=True))
+
+    assert pelanggaran == {'sentinel:curah_hujan': 1, 'rentang:kelembaban_rata_rata': 1,
+                           'urutan_suhu': 1}
+    assert pd.isna(df_valid.loc[0, 'curah_hujan'])
+    assert pd.isna(df_valid.loc[1, 'kelembaban_rata_rata'])
+    assert df_valid.loc[1, ['suhu_minimum', 'suhu_rata_rata', 'suhu_maksimum']].isna().all()
+    assert df_valid.loc[1, 'curah_hujan'] == 12
+
+def tulis_parquet(path, jumlah_baris=30, ukuran_group=10):
+    tabel = pa.table({
+        'station_id': list(range(jumlah_baris)),
+        'date': [f'2020-01-{i % 28 + 1:02d}' for i in range(jumlah_baris)],
+        'Tavg': [float(i) for i in range(jumlah_baris)],
+    })
+    pq.write_table(tabel, path, row_group_size=ukuran_group)
+
+def id_terbaca(importer, path, offset_baris, ukuran_chunk=4):
+    chunk = importer.baca_kolumnar_bertahap(str(path), ukuran_chunk, offset_baris)
+    return [i for df, _, _ in chunk for i in df['station_id'].tolist()]
+
+def test_kolumnar_dilanjutkan_dari_offset(importer, tmp_path):
+    path = tmp_path / 'cuaca.parquet'
+    tulis_parquet(path)
+
+    assert id_terbaca(importer, path, 0) == list(range(30))
+    # Offset di tengah group: sisa group itu dan semua group sesudahnya
+    assert id_terbaca(importer, path, 15) == list(range(15, 30))
+    # Offset tepat di batas group
+    assert id_terbaca(importer, path, 10) == list(range(10, 30))
+    assert id_terbaca(importer, path, 29) == [29]
+    assert id_terbaca(importer, path, 30) == []
+
+def test_bagi_rentang_stasiun(importer, tmp_path):
+    path = tmp_path / 'station_detail.csv'
+    pd.DataFrame({'station_id': [5, 1, 3, 2, 4, 6]}).to_csv(path, index=False)
+
+    assert importer.bagi_rentang_stasiun(str(path), 1) == [(None, None)]
+    assert importer.bagi_rentang_stasiun(str(path), 3) == [(None, 2), (3, 4), (5, None)]
+
+def tulis_csv_cuaca(path, jumlah_baris):
+    baris = [f"{i % 28 + 1:02d}/01/2020,21.4,30.2,26.1,80,{i},5,3,90,2,E,{96001 + i % 7}"
+             for i in range(jumlah_baris)]
+    path.write_text(CSV_RUSAK.splitlines()[0] + "\n" + "\n".join(baris) + "\n")
+
+def test_bagi_rentang_baca_csv_tanpa_tumpang_tindih(importer, tmp_path):
+    path = tmp_path / 'cuaca.csv'
+    tulis_csv_cuaca(path, 1000)
+    isi = path.read_bytes()
+
+    rentang = importer.bagi_rentang_baca(str(path), 4)
+    assert len(rentang) == 4 and rentang[0][0] == 0 and rentang[-1][1] is None
+    # Setiap batas jatuh di awal baris
+    assert all(isi[awal - 1:awal] == b'\n' for awal, _ in rentang[1:])
+
+    hujan = []
+    for awal, akhir in rentang:
+        for df, posisi, _ in importer.baca_csv_bertahap(str(path), 64, awal, akhir):
+            hujan += df['RR'].astype(int).tolist()
+        assert akhir is None or posisi == akhir
+    assert hujan == list(range(1000))
+
+def test_bagi_rentang_baca_kolumnar_per_row_group(importer, tmp_path):
+    path = tmp_path / 'cuaca.parquet'
+    tulis_parquet(path, jumlah_baris=30, ukuran_group=10)
+
+    rentang = importer.bagi_rentang_baca(str(path), 3)
+    assert rentang == [(0, 10), (10, 20), (20, None)]
+    terbaca = []
+    for awal, akhir in rentang:
+        chunk = importer.baca_kolumnar_bertahap(str(path), 4, awal, akhir)
+        terbaca += [i for df, _, _ in chunk for i in df['station_id'].tolist()]
+    assert terbaca == list(range(30))
+    # Satu worker: file tidak dibagi
+    assert importer.bagi_rentang_baca(str(path), 1) == [(None, None)]
+
+def test_bagi_rentang_baca_csv_terkompresi(importer, tmp_path):
+    path = tmp_path / 'cuaca.csv.gz'
+    path.write_bytes(b'')
+    assert importer.bagi_rentang_baca(str(path), 4) is None
+
+def test_label_partisi(importer):
+    assert importer.label_partisi('cuaca.csv') == 'cuaca.csv'
+    assert importer.label_partisi('cuaca.csv', (None, 96100)) == 'cuaca.csv[-96100]'
+    assert importer.label_partisi('cuaca.csv', rentang_baca=(0, 4096)) == 'cuaca.csv@0-4096'
+    assert importer.label_partisi('cuaca.csv', rentang_baca=(4096, None)) == 'cuaca.csv@4096-'
+
+class KursorStaging:
+    """Kursor palsu untuk muat_cuaca_infile: mencatat SQL tanpa server"""
+
+    def __init__(self):
+        self.sql = []
+        self.rowcount = 0
+
+    def execute(self, sql, parameter=()):
+        self.sql.append(' '.join(sql.split()))
+        if self.sql[-1].startswith('INSERT IGNORE'):
+            self.rowcount = 1
+
+    def fetchone(self):
+        return (2,)
+
+def test_muat_infile_tanpa_commit_implisit(importer):
+    kursor = KursorStaging()
+    df = pd.DataFrame({'id_stasiun': [96001, 96001], 'tanggal': ['2020-01-01', '2020-01-02']})
+
+    assert importer.muat_cuaca_infile(kursor, df) == (2, 1)
+    # TRUNCATE adalah DDL (commit implisit); staging dikosongkan dengan DELETE
+    assert not any(sql.startswith(('TRUNCATE', 'ALTER', 'DROP')) for sql in kursor.sql)
+    assert kursor.sql.count('DELETE FROM staging_observasi_cuaca') == 2
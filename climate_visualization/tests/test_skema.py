@@ -0,0 +1,120 @@
+"""Test skema.py dengan kursor rekaman (tanpa server MySQL)"""
+
+import pytest
+
+import skema
+
+class KursorRekaman:
+    """Kursor palsu: mencatat SQL; GET_LOCK selalu berhasil, SELECT tanpa hasil"""
+
+    def __init__(self, kunci_gagal=()):
+        self.sql = []
+        self.kunci_gagal = set(kunci_gagal)
+        self._hasil = []
+
+    def execute(self, sql, parameter=()):
+        self.sql.append((' '.join(sql.split()), tuple(parameter)))
+        if sql.startswith('SELECT GET_LOCK'):
+            self._hasil = [(0 if parameter[0] in self.kunci_gagal else 1,)]
+        else:
+            self._hasil = []
+
+    def executemany(self, sql, daftar):
+        self.sql.append((' '.join(sql.split()), tuple(daftar)))
+
+    def fetchone(self):
+        return self._hasil[0] if self._hasil else None
+
+    def fetchall(self):
+        return self._hasil
+
+def test_segarkan_ringkasan_mengunci_stasiun_sebelum_menghitung():
+    kursor = KursorRekaman()
+    # Dua worker bisa memuat stasiun-bulan yang sama: pasangan ganda dan
+    # bulan berbeda dari stasiun yang sama dikunci sekali per stasiun
+    jumlah = skema.segarkan_ringkasan(kursor, {(96003, '2020-01'), (96001, '2020-02'),
+                                               (96001, '2020-01'), ('96001', '2020-01-15')})
+
+    assert jumlah == 3
+    kunci = [p[0] for sql, p in kursor.sql if sql.startswith('SELECT GET_LOCK')]
+    assert kunci == ['iklim_ringkasan_96001', 'iklim_ringkasan_96003']
+    pertama_hitung = next(i for i, (sql, _) in enumerate(kursor.sql) if 'FROM observasi_cuaca' in sql)
+    assert all(sql.startswith('SELECT GET_LOCK') for sql, _ in kursor.sql[:pertama_hitung])
+    # Kunci dipegang sampai pemanggil commit
+    assert not any('RELEASE_LOCK' in sql for sql, _ in kursor.sql)
+
+def test_lepas_kunci_ringkasan():
+    kursor = KursorRekaman()
+    skema.lepas_kunci_ringkasan(kursor, {96003, 96001})
+    assert kursor.sql == [('SELECT RELEASE_LOCK(%s)', ('iklim_ringkasan_96001',)),
+                          ('SELECT RELEASE_LOCK(%s)', ('iklim_ringkasan_96003',))]
+
+def test_kunci_ringkasan_gagal():
+    kursor = KursorRekaman(kunci_gagal={'iklim_ringkasan_96001'})
+    with pytest.raises(RuntimeError, match='96001'):
+        skema.kunci_ringkasan(kursor, {96001}, batas_tunggu=0)
+
+class KursorAntre(KursorRekaman):
+    """GET_LOCK baru berhasil pada percobaan ke-`berhasil_ke`"""
+
+    def __init__(self, berhasil_ke):
+        super().__init__()
+        self.berhasil_ke = berhasil_ke
+
+    def execute(self, sql, parameter=()):
+        super().execute(sql, parameter)
+        if sql.startswith('SELECT GET_LOCK'):
+            percobaan = sum(s.startswith('SELECT GET_LOCK') for s, _ in self.sql)
+            self._hasil = [(int(percobaan >= self.berhasil_ke),)]
+
+def test_ambil_kunci_backoff():
+    kursor = KursorAntre(berhasil_ke=3)
+    skema.ambil_kunci(kursor, 'kunci_uji', batas_tunggu=60, tunggu_awal=5)
+    # Tunggu di server digandakan: 5, 10, 20 detik
+    assert [p[1] for _, p in kursor.sql] == [5, 10, 20]
+
+def test_ambil_kunci_berhenti_di_batas_tunggu():
+    kursor = KursorAntre(berhasil_ke=99)
+    with pytest.raises(RuntimeError, match='kunci_uji dalam 30 detik'):
+        skema.ambil_kunci(kursor, 'kunci_uji', batas_tunggu=30, tunggu_awal=5)
+    # Percobaan terakhir dipotong ke sisa waktu
+    assert [p[1] for _, p in kursor.sql] == [5, 10, 15]
+
+class KursorInformasi(KursorRekaman):
+    """Kursor untuk migrasi: tabel lama tanpa index sekunder, kolom FLOAT per tabel"""
+
+    def __init__(self, kolom_float):
+        super().__init__()
+        self.kolom_float = kolom_float
+
+    def execute(self, sql, parameter=()):
+        super().execute(sql, parameter)
+        if 'information_schema.STATISTICS' in sql and 'PRIMARY' in sql:
+            self._hasil = [(k,) for k in skema.KUNCI_OBSERVASI]
+        elif 'information_schema.STATISTICS' in sql:
+            self._hasil = [(0,)]
+        elif 'information_schema.COLUMNS' in sql:
+            self._hasil = [(k,) for k in self.kolom_float.get(parameter[0], [])]
+
+def alter(kursor):
+    return [sql for sql, _ in kursor.sql if sql.startswith('ALTER TABLE')]
+
+def test_migrasi_2_tidak_menambah_index_keyset():
+    kursor = KursorInformasi({})
+    skema.migrasi_2_index(kursor)
+    assert not any('idx_tanggal_observasi' in sql for sql in alter(kursor))
+
+    skema.migrasi_6_index_keyset(kursor)
+    assert alter(kursor)[-1] == 'ALTER TABLE observasi_cuaca ADD ' + skema.INDEX_KEYSET
+
+def test_migrasi_7_float_menjadi_double():
+    kursor = KursorInformasi({'observasi_cuaca': ['suhu_minimum', 'curah_hujan'],
+                              'ringkasan_bulanan_stasiun': ['curah_hujan_min']})
+    skema.migrasi_7_double(kursor)
+    assert alter(kursor) == [
+        'ALTER TABLE observasi_cuaca MODIFY suhu_minimum DOUBLE, MODIFY curah_hujan DOUBLE',
+        'ALTER TABLE ringkasan_bulanan_stasiun MODIFY curah_hujan_min DOUBLE',
+    ]
+    # Tabel baru sudah DOUBLE: tidak ada lagi FLOAT di definisi
+    assert 'FLOAT' not in skema.TABEL['observasi_cuaca']
+    assert all('FLOAT' not in sql for sql in skema.TABEL_RINGKASAN.values())